@@ -27,6 +27,7 @@ setup(
         'console_scripts': [
             'trepan2  = trepan.cli:main',
             'trepan2-client = trepan.client:main',
+            'trepan2-trace  = trepan.traceview:main',
         ]},
        install_requires   = install_requires,
        license            = license,
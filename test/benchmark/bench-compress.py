@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+"""Benchmark compression of remote debugger output over a link with
+little bandwidth. A debugged program waits for a client on one port,
+and a local proxy between it and our client passes on no more than a
+given number of bytes a second each way. We time commands with a lot
+of output, once with compression turned off and once with it on, and
+count the bytes that crossed the link."""
+import socket, sys, time
+
+import remotehelper as Mhelper
+
+# The debugged program. It stops post mortem with a large structure in
+# a local variable.
+DEBUGGED = '''
+import sys
+sys.path.insert(0, %(top_dir)r)
+from trepan import api, post_mortem
+from trepan.interfaces import server
+def crash(records):
+    total = 0
+    for record in records:
+        total += record['size']
+    1/0
+records = [{'name': 'record%%d' %% i, 'size': i * 10, 'tags': ['a', 'b']}
+           for i in range(2000)]
+try:
+    crash(records)
+except ZeroDivisionError:
+    intf = server.ServerInterface(connection_opts={
+        'IO': 'TCP', 'PORT': %(port)d})
+    api.load()
+    dbg = api.Mdebugger.Debugger({'interface': intf})
+    post_mortem.post_mortem(sys.exc_info(), dbg=dbg)
+'''
+
+COMMANDS = ('info locals', 'pp records', 'disassemble')
+
+class Counter:
+    """Bytes that have crossed the link"""
+    def __init__(self):
+        self.count = 0
+        return
+    pass
+
+def throttle_pipe(src, dst, rate, counter):
+    """Copy from socket *src* to socket *dst* at no more than *rate*
+    bytes a second."""
+    while True:
+        try:
+            data = src.recv(4096)
+        except socket.error:
+            data = ''
+            pass
+        if not data: break
+        counter.count += len(data)
+        time.sleep(float(len(data)) / rate)
+        try:
+            dst.sendall(data)
+        except socket.error:
+            break
+        pass
+    return
+
+def time_commands(compress, rate):
+    """Return a list of (command, output bytes, bytes sent, seconds)
+    for each command, run with compression on if *compress*."""
+    counter = Counter()
+    def session(intf):
+        results = []
+        for command in COMMANDS:
+            sent = counter.count
+            msgs, seconds = Mhelper.run_command(intf, command)
+            results.append((command, sum([len(msg) for msg in msgs]),
+                            counter.count - sent, seconds))
+            pass
+        return results
+    return Mhelper.run_debugged(DEBUGGED, {}, throttle_pipe,
+                                (rate, counter), {'compress': compress},
+                                session)
+
+def bench(rate=256 * 1024):
+    print('link limited to %d KB/s' % (rate / 1024))
+    for compress, label in ((False, 'plain'), (True, 'compressed')):
+        for command, size, sent, seconds in time_commands(compress, rate):
+            print('%-10s %-12s %8d bytes output %8d sent %8.1f ms' %
+                  (label, command, size, sent, seconds * 1000))
+            pass
+        pass
+    return
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        bench(int(sys.argv[1]) * 1024)
+    else:
+        bench()
+        pass
+    pass
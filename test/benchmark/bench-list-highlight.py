@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+"""Benchmark "list" latency with syntax highlighting on a 20,000-line
+module. We compare the first listing of a file, which has to
+highlight something, with repeated listings which should come from the
+highlight cache."""
+import inspect, os, sys, tempfile, time
+from import_relative import import_relative
+
+Mdebugger = import_relative('debugger', '...trepan')
+Mlist     = import_relative('processor.command.list', '...trepan')
+Mhighlight = import_relative('lib.highlight', '...trepan')
+
+def make_module(nlines):
+    """Write a Python module with about *nlines* lines and return its
+    name."""
+    fd, filename = tempfile.mkstemp(suffix='.py')
+    f = os.fdopen(fd, 'w')
+    i = 0
+    n = 0
+    while n < nlines:
+        f.write('''
+def fn%d(a, b=%d):
+    """Function number %d"""
+    if a > b:
+        return "%%s" %% a  # a comment
+    return [x * b for x in range(a)]
+''' % (i, i, i))
+        i += 1
+        n += 6
+        pass
+    f.close()
+    return filename
+
+def time_it(fn, *args):
+    start = time.time()
+    fn(*args)
+    return time.time() - start
+
+def bench(nlines=20000, repeat=5):
+    filename = make_module(nlines)
+    d  = Mdebugger.Debugger()
+    cp = d.core.processor
+    cp.curframe = inspect.currentframe()
+    cmd = Mlist.ListCommand(cp)
+    cmd.msg = lambda msg: None
+    cmd.errmsg = lambda msg: sys.stderr.write(msg + "\n")
+    d.settings['highlight'] = 'light'
+    try:
+        for lineno in (10000, 19990):
+            where = '%s:%d' % (filename, lineno)
+            first = time_it(cmd.run, ['list', where])
+            times = [time_it(cmd.run, ['list', where])
+                     for i in range(repeat)]
+            print('list at line %5d: first %8.2f ms, repeated %8.2f ms' %
+                  (lineno, first * 1000, min(times) * 1000))
+            pass
+        # Full-file highlighting, which is what we'd do without segments
+        Mhighlight.clear_cache()
+        whole = time_it(Mhighlight.getlines, filename, {'output': 'light'})
+        print('highlight all %d lines: %8.2f ms' % (nlines, whole * 1000))
+    finally:
+        os.unlink(filename)
+        pass
+    return
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        bench(int(sys.argv[1]))
+    else:
+        bench()
+        pass
+    pass
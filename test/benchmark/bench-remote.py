@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+"""Benchmark remote debugging over a slow link. A debugged program
+waits for a client on one port, and a local proxy between it and our
+client delays everything sent each way. We time commands that print a
+lot of lines, once with the server's output buffer turned off, which
+sends each line by itself, and once with the default buffer size."""
+import socket, sys, threading, time, Queue
+
+import remotehelper as Mhelper
+
+# The debugged program. It stops post mortem with a deep stack and a
+# few locals.
+DEBUGGED = '''
+import sys
+sys.path.insert(0, %(top_dir)r)
+from trepan import api, post_mortem
+from trepan.interfaces import server
+def recurse(n, a=1, b='two', c=[3]):
+    if n == 0: 1/0
+    recurse(n-1)
+try:
+    recurse(40)
+except ZeroDivisionError:
+    intf = server.ServerInterface(connection_opts={
+        'IO': 'TCP', 'PORT': %(port)d, 'buffer_size': %(buffer_size)d})
+    api.load()
+    dbg = api.Mdebugger.Debugger({'interface': intf})
+    post_mortem.post_mortem(sys.exc_info(), dbg=dbg)
+'''
+
+COMMANDS = ('backtrace', 'list 1', 'info locals')
+
+def delay_pipe(src, dst, delay):
+    """Copy from socket *src* to socket *dst*, delivering each piece
+    *delay* seconds after it was received, and no sooner than *delay*
+    after the piece before it. That is roughly what Nagle's algorithm
+    does on a slow link: a small write waits until the one before it
+    has been acknowledged."""
+    pending = Queue.Queue()
+    def deliver():
+        last = 0
+        while True:
+            due, data = pending.get()
+            if data is None: break
+            due = max(due, last + delay)
+            wait = due - time.time()
+            if wait > 0: time.sleep(wait)
+            try:
+                dst.sendall(data)
+            except socket.error:
+                break
+            last = time.time()
+            pass
+        return
+    sender = threading.Thread(target=deliver)
+    sender.setDaemon(True)
+    sender.start()
+    while True:
+        try:
+            data = src.recv(65536)
+        except socket.error:
+            data = ''
+            pass
+        if not data: break
+        pending.put((time.time() + delay, data))
+        pass
+    pending.put((0, None))
+    return
+
+def time_commands(buffer_size, delay, repeat):
+    """Return a list of (command, messages, seconds) for each command
+    run against a server with *buffer_size*."""
+    def session(intf):
+        results = []
+        for command in COMMANDS:
+            times = []
+            for i in range(repeat):
+                msgs, seconds = Mhelper.run_command(intf, command)
+                times.append(seconds)
+                pass
+            results.append((command, len(msgs), min(times)))
+            pass
+        return results
+    return Mhelper.run_debugged(DEBUGGED, {'buffer_size': buffer_size},
+                                delay_pipe, (delay,), session=session)
+
+def bench(delay=0.025, repeat=3):
+    print('one-way delay %d ms' % (delay * 1000))
+    for buffer_size, label in ((0, 'unbuffered'), (16384, 'buffered')):
+        for command, count, seconds in time_commands(buffer_size, delay,
+                                                     repeat):
+            print('%-10s %-12s %4d messages %8.1f ms' %
+                  (label, command, count, seconds * 1000))
+            pass
+        pass
+    return
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        bench(float(sys.argv[1]) / 1000)
+    else:
+        bench()
+        pass
+    pass
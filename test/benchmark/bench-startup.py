@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+"""Benchmark debugger startup: the time from running "trepan2
+script.py" until the first prompt is printed. The debugger is run as
+a subprocess with its input and output connected to pipes."""
+import os, subprocess, sys, tempfile, time
+
+trepan_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                          os.path.pardir, os.path.pardir, 'trepan')
+cli = os.path.normpath(os.path.join(trepan_dir, 'cli.py'))
+
+def time_to_prompt(script):
+    """Start the debugger on *script*, and return the number of seconds
+    until it shows its prompt."""
+    devnull = open(os.devnull, 'w')
+    start = time.time()
+    proc = subprocess.Popen([sys.executable, cli, '--highlight=plain',
+                             script],
+                            stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                            stderr=devnull)
+    output = ''
+    while '(trepan2) ' not in output:
+        data = os.read(proc.stdout.fileno(), 4096)
+        if not data:
+            raise RuntimeError('debugger exited before prompting:\n' +
+                               output)
+        output += data
+        pass
+    elapsed = time.time() - start
+    # End of input makes the debugger leave.
+    proc.stdin.close()
+    proc.wait()
+    devnull.close()
+    return elapsed
+
+def bench(repeat=10):
+    fd, script = tempfile.mkstemp(suffix='.py')
+    os.write(fd, 'x = 1\n')
+    os.close(fd)
+    try:
+        times = sorted([time_to_prompt(script) for i in range(repeat)])
+    finally:
+        os.unlink(script)
+        pass
+    print('time to first prompt: min %8.2f ms, median %8.2f ms' %
+          (times[0] * 1000, times[len(times) // 2] * 1000))
+    return
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        bench(int(sys.argv[1]))
+    else:
+        bench()
+        pass
+    pass
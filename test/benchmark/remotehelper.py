@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""Helpers for benchmarks of remote debugging. A debugged program
+waits for a client on one port, and a local proxy between it and our
+client passes on what is sent each way, as a slow link would."""
+import os, socket, subprocess, sys, tempfile, threading, time
+
+top_dir = os.path.normpath(os.path.join(os.path.dirname(
+    os.path.abspath(__file__)), os.path.pardir, os.path.pardir))
+sys.path.insert(0, top_dir)
+from trepan.interfaces import client as Mclient
+Mcomcodes = Mclient.Mcomcodes
+
+def free_port():
+    sock = socket.socket()
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+def connect(port, timeout=10):
+    """Return a socket connected to *port*, waiting for the server to
+    start listening if need be."""
+    end = time.time() + timeout
+    while True:
+        try:
+            return socket.create_connection(('127.0.0.1', port))
+        except socket.error:
+            if time.time() > end: raise
+            time.sleep(0.05)
+            pass
+        pass
+    return
+
+def start_proxy(listen_port, server_port, pipe, pipe_args=()):
+    """Accept one connection on *listen_port* and relay it to
+    *server_port*. Each way, pipe(src, dst, *pipe_args) copies from
+    socket *src* to socket *dst* until *src* is closed."""
+    listener = socket.socket()
+    listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    listener.bind(('127.0.0.1', listen_port))
+    listener.listen(1)
+    def run():
+        client, addr = listener.accept()
+        listener.close()
+        server = connect(server_port)
+        for src, dst in ((client, server), (server, client)):
+            thread = threading.Thread(target=pipe,
+                                      args=(src, dst) + tuple(pipe_args))
+            thread.setDaemon(True)
+            thread.start()
+            pass
+        return
+    thread = threading.Thread(target=run)
+    thread.setDaemon(True)
+    thread.start()
+    return
+
+def read_to_prompt(intf):
+    """Read messages up to the next prompt and return them."""
+    msgs = []
+    while True:
+        control, msg = intf.read_remote()
+        if Mcomcodes.PROMPT == control: return msgs
+        msgs.append(msg)
+        pass
+    return
+
+def run_command(intf, command):
+    """Run *command* and return its messages and the seconds it
+    took."""
+    start = time.time()
+    intf.write_remote(Mcomcodes.CONFIRM_REPLY, command)
+    msgs = read_to_prompt(intf)
+    return msgs, time.time() - start
+
+def run_debugged(program, params, pipe, pipe_args=(), client_opts={},
+                 session=None):
+    """Run *program*, the text of a debugged program, behind a proxy
+    that uses *pipe*; see start_proxy(). *program* is filled in from
+    *params*, *top_dir* and the *port* its server listens on. Once the
+    server first prompts a client connected with *client_opts*,
+    session(intf) is run and what it returns is returned."""
+    server_port, proxy_port = free_port(), free_port()
+    params = dict(params, top_dir=top_dir, port=server_port)
+    # A file rather than "python -c" so that "list" has something to
+    # show.
+    fd, script = tempfile.mkstemp(suffix='.py')
+    os.write(fd, program % params)
+    os.close(fd)
+    devnull = open(os.devnull, 'w')
+    proc = subprocess.Popen([sys.executable, script],
+                            stdout=devnull, stderr=devnull)
+    # The proxy connects to the server, once it is listening, when
+    # we connect to the proxy.
+    start_proxy(proxy_port, server_port, pipe, pipe_args)
+    opts = dict(client_opts, open=True, IO='TCP', PORT=proxy_port)
+    intf = Mclient.ClientInterface(connection_opts=opts)
+    try:
+        read_to_prompt(intf)
+        return session(intf)
+    finally:
+        intf.inout.close()
+        proc.kill()
+        proc.wait()
+        devnull.close()
+        os.unlink(script)
+        pass
+    return
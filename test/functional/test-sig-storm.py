@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+'Stress test signal handling with 10,000 signals a second'
+import re, signal, time, unittest
+from fn_helper import strarray_setup
+
+class TestSigStorm(unittest.TestCase):
+
+    def storm(self, coalesce, seconds=0.2, interval=0.0001):
+        """Send ourselves SIGALRM every *interval* seconds for *seconds*
+        while being traced. Return the number of signals the program's
+        handler saw and the debugger's messages about them."""
+        d = strarray_setup(['continue'])
+        d.settings['sigcoalesce'] = coalesce
+        received = [0]
+        def handler(num, f):
+            received[0] += 1
+            return
+        save_signal = signal.signal
+        save_alrm   = signal.getsignal(signal.SIGALRM)
+        try:
+            signal.signal(signal.SIGALRM, handler)
+            d.sigmgr.action('SIGALRM nostop print pass')
+            d.core.start()
+            ##############################
+            signal.setitimer(signal.ITIMER_REAL, interval, interval)
+            end = time.time() + seconds
+            while time.time() < end:
+                pass
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            x = 1
+            ##############################
+            d.core.stop()
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal = save_signal
+            signal.signal(signal.SIGALRM, save_alrm)
+            pass
+        msgs = [s for s in d.intf[-1].output.output
+                if 'Program received signal SIGALRM' in s]
+        return received[0], msgs
+
+    def test_coalesce(self):
+        received, msgs = self.storm(True)
+        self.assertTrue(received > 100, 'got only %d signals' % received)
+        # Each message covers a run of signals, and all of them are
+        # accounted for.
+        self.assertTrue(len(msgs) < received)
+        total = 0
+        for msg in msgs:
+            m = re.search(r'SIGALRM (\d+) times', msg)
+            if m: total += int(m.group(1))
+            else: total += 1
+            pass
+        self.assertEqual(received, total)
+        return
+
+    def test_no_coalesce(self):
+        received, msgs = self.storm(False, seconds=0.05)
+        self.assertEqual(received, len(msgs))
+        return
+    pass
+
+if __name__ == '__main__':
+    unittest.main()
+    pass
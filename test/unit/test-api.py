@@ -0,0 +1,178 @@
+#!/usr/bin/env python
+'Unit test for trepan.api'
+import glob, os, shutil, signal, socket, subprocess, sys, tempfile, time
+import unittest
+from import_relative import import_relative
+
+Mapi = import_relative('api', '...trepan')
+
+trepan_dir = os.path.normpath(os.path.join(os.path.dirname(
+    os.path.abspath(__file__)), os.pardir, os.pardir))
+
+class TestAPI(unittest.TestCase):
+
+    def test_enable(self):
+        save_enabled = Mapi.enabled
+        Mapi.enable(False)
+        self.assertFalse(Mapi.enabled)
+        self.assertEqual(None, Mapi.breakpoint())
+        self.assertEqual(None, Mapi.breakpoint_if(True))
+        Mapi.enable()
+        self.assertTrue(Mapi.enabled)
+        # A false condition doesn't stop even when enabled
+        self.assertEqual(None, Mapi.breakpoint_if(False))
+        Mapi.enabled = save_enabled
+        return
+
+    def test_lazy_import(self):
+        """Importing trepan.api, or calling breakpoint_if() when not
+        enabled, shouldn't load the debugger"""
+        prog = """import sys
+sys.path.insert(0, %r)
+import trepan.api
+trepan.api.breakpoint()
+trepan.api.breakpoint_if(True)
+print('trepan.debugger' in sys.modules)
+""" % trepan_dir
+        env = dict(os.environ)
+        env.pop('TREPAN2_DEBUG', None)
+        proc = subprocess.Popen([sys.executable, '-c', prog],
+                                stdout=subprocess.PIPE,
+                                stderr=open(os.devnull, 'w'), env=env)
+        self.assertEqual('False', proc.communicate()[0].strip())
+        return
+
+    def test_post_mortem_policy(self):
+        save_policy = os.environ.get('TREPAN2_POST_MORTEM')
+        os.environ['TREPAN2_POST_MORTEM'] = 'remote'
+        try:
+            self.assertEqual('remote', Mapi.post_mortem_policy())
+        finally:
+            if save_policy is None:
+                del os.environ['TREPAN2_POST_MORTEM']
+            else:
+                os.environ['TREPAN2_POST_MORTEM'] = save_policy
+                pass
+            pass
+        return
+
+    def test_excepthook_core(self):
+        """The 'core' policy writes a core file without loading the
+        debugger"""
+        prog = """import atexit, sys
+sys.path.insert(0, %r)
+import trepan.api
+def policy(exc_type, exc_value, exc_tb):
+    print(exc_type.__name__)
+    return 'core'
+trepan.api.install_excepthook(policy)
+atexit.register(lambda: sys.stdout.write('%%s\\n' %%
+                                         ('trepan.debugger' in sys.modules)))
+1/0
+""" % trepan_dir
+        tmpdir = tempfile.mkdtemp()
+        try:
+            proc = subprocess.Popen([sys.executable, '-c', prog],
+                                    cwd=tmpdir, stdout=subprocess.PIPE,
+                                    stderr=open(os.devnull, 'w'))
+            output = proc.communicate()[0].split()
+            cores = glob.glob(os.path.join(tmpdir, 'trepan2.core.*'))
+        finally:
+            shutil.rmtree(tmpdir)
+            pass
+        self.assertEqual(['ZeroDivisionError', 'False'], output)
+        self.assertEqual(1, len(cores))
+        return
+
+    def test_attach_handler(self):
+        """A signal attaches a debugger server; detaching leaves no
+        tracing behind"""
+        sock = socket.socket()
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+        sock.close()
+        tmpdir = tempfile.mkdtemp()
+        done = os.path.join(tmpdir, 'done')
+        prog = """import os, sys, time
+sys.path.insert(0, %r)
+import trepan.api
+trepan.api.install_attach_handler(port=%d)
+print('trepan.debugger' in sys.modules)
+sys.stdout.flush()
+for n in range(200):
+    if os.path.exists(%r): break
+    time.sleep(0.05)
+    pass
+print('%%s %%s' %% (trepan.api.attached, sys.gettrace()))
+""" % (trepan_dir, port, done)
+        try:
+            proc = subprocess.Popen([sys.executable, '-c', prog],
+                                    stdout=subprocess.PIPE,
+                                    stderr=open(os.devnull, 'w'))
+            self.assertEqual('False', proc.stdout.readline().strip())
+            os.kill(proc.pid, signal.SIGUSR1)
+            for i in range(50):
+                try:
+                    client = socket.create_connection(('127.0.0.1', port))
+                    break
+                except socket.error:
+                    time.sleep(0.1)
+                    pass
+                pass
+
+            # Messages are in the first wire format: a four-digit
+            # length, then a control code and the text.
+            data = ''
+            for command in ('next', 'detach', None):
+                while True:
+                    while len(data) < 4 or len(data) < 4 + int(data[:4]):
+                        data += client.recv(4096)
+                        pass
+                    code, data = data[4], data[4+int(data[:4]):]
+                    if code in 'pq': break
+                    pass
+                if command:
+                    self.assertEqual('p', code)
+                    msg = '?' + command + '\n'
+                    client.sendall('%04d%s' % (len(msg), msg))
+                    pass
+                pass
+            self.assertEqual('q', code)
+            client.close()
+            open(done, 'w').close()
+            output = proc.communicate()[0].split('\n')
+        finally:
+            shutil.rmtree(tmpdir)
+            pass
+        self.assertEqual(['None None', ''], output)
+        return
+
+    def test_attach_failure(self):
+        """A debugger server that can't start leaves the program
+        alone"""
+        sock = socket.socket()
+        sock.bind(('127.0.0.1', 0))
+        sock.listen(1)
+        prog = """import os, signal, sys
+sys.path.insert(0, %r)
+import trepan.api
+trepan.api.install_attach_handler(port=%d)
+os.kill(os.getpid(), signal.SIGUSR1)
+print('%%s %%s' %% (trepan.api.attached, sys.gettrace()))
+""" % (trepan_dir, sock.getsockname()[1])
+        try:
+            proc = subprocess.Popen([sys.executable, '-c', prog],
+                                    stdout=subprocess.PIPE,
+                                    stderr=subprocess.PIPE)
+            output, errors = proc.communicate()
+        finally:
+            sock.close()
+            pass
+        self.assertEqual(0, proc.returncode)
+        self.assertEqual('None None\n', output)
+        self.assertTrue("can't attach a debugger" in errors)
+        return
+    pass
+
+if __name__ == '__main__':
+    unittest.main()
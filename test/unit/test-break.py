@@ -67,6 +67,13 @@ class TestBreakCommand(unittest.TestCase):
         self.assertEqual((os.path.join, True, True),
                          (fn, isinstance(fi, types.StringType), li > 1))
 
+        # pydoc isn't imported here, so getdoc is found through the
+        # symbol index. We get a line breakpoint in its body.
+        fn, fi, li, cond = Mcmdbreak.parse_break_cmd(self.cmd,
+                                                     ['pydoc.getdoc'])
+        self.assertEqual((None, True, True),
+                         (fn, fi.endswith('pydoc.py'), li > 1))
+
         fn, fi, li, cond = Mcmdbreak.parse_break_cmd(self.cmd, ['if', 'True'])
         self.assertEqual((None, True, True),
                          (fn, fi.endswith('test-break.py'), li > 1))
@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+'Unit test for the bullwinkle interface and its socket protocol'
+import json, os, shutil, socket, subprocess, sys, tempfile, time, unittest
+
+from import_relative import import_relative
+Mbullwinkle = import_relative('trepan.interfaces.bullwinkle', '...')
+Mlineserver = import_relative('trepan.inout.lineserver', '...')
+
+trepan_dir = os.path.normpath(os.path.join(os.path.dirname(
+    os.path.abspath(__file__)), os.pardir, os.pardir))
+
+class StringInput:
+    """Reads from a list of lines"""
+    def __init__(self, lines):
+        self.lines = list(lines)
+        return
+
+    def close(self):
+        return
+
+    def readline(self, prompt=''):
+        return self.lines.pop(0)
+    pass
+
+class TestBullwinkle(unittest.TestCase):
+
+    def test_read_command(self):
+        inp = StringInput(['{"command": "step", "id": 7}',
+                           "{'command': 'quit'}",
+                           "__import__('os').getpid()"])
+        intf = Mbullwinkle.BWInterface(inp=inp)
+        self.assertEqual({'command': 'step', 'id': 7}, intf.read_command())
+        self.assertEqual({'command': 'quit'}, intf.read_command())
+        # Python literals are accepted, but nothing is evaluated.
+        self.assertEqual('eval error', intf.read_command())
+        return
+
+    def test_read_bad_command(self):
+        """Input that can't be parsed is an error, not an exception"""
+        inp = StringInput(['{[1]: 2}', '[' * 100000 + ']' * 100000,
+                           '{"command": "quit"}'])
+        intf = Mbullwinkle.BWInterface(inp=inp)
+        self.assertEqual('eval error', intf.read_command())
+        self.assertEqual('eval error', intf.read_command())
+        self.assertEqual({'command': 'quit'}, intf.read_command())
+        return
+
+    def test_line_server(self):
+        server = Mlineserver.LineServer(opts={'PORT': 0})
+        # Only local clients can connect unless asked otherwise.
+        self.assertEqual('127.0.0.1', server.inout.getsockname()[0])
+        client = socket.create_connection(('127.0.0.1', server.PORT))
+        try:
+            # Several requests arrive before any is read.
+            client.sendall('one\ntwo\r\nth')
+            self.assertEqual('one', server.readline())
+            client.sendall('ree\n')
+            self.assertEqual('two', server.readline())
+            self.assertEqual('three', server.readline())
+            server.writeline('four')
+            self.assertEqual('four\n', client.recv(100))
+            client.close()
+            self.assertRaises(EOFError, server.readline)
+        finally:
+            server.close()
+            pass
+        return
+
+    def test_line_server_host(self):
+        server = Mlineserver.LineServer(opts={'PORT': 0, 'HOST': None})
+        try:
+            self.assertEqual('0.0.0.0', server.inout.getsockname()[0])
+        finally:
+            server.close()
+            pass
+        return
+
+    def test_pipelined_requests(self):
+        """Requests sent together each get a response with their id,
+        and stopping sends a status event"""
+        tmpdir = tempfile.mkdtemp()
+        path = os.path.join(tmpdir, 'bw.sock')
+        script = os.path.join(tmpdir, 'prog.py')
+        open(script, 'w').write("x = 1\ny = 2\n")
+        prog = """import sys
+sys.path.insert(0, %r)
+from trepan import bwcli
+bwcli.main(sys_argv=['bwcli', '--server', '--socket', %r, %r])
+""" % (trepan_dir, path, script)
+        proc = subprocess.Popen([sys.executable, '-c', prog],
+                                stdout=open(os.devnull, 'w'),
+                                stderr=open(os.devnull, 'w'))
+        try:
+            for i in range(50):
+                try:
+                    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                    client.connect(path)
+                    break
+                except socket.error:
+                    client.close()
+                    time.sleep(0.1)
+                    pass
+                pass
+            requests = [{'command': 'stack', 'id': 1},
+                        {'command': 'source', 'id': 2, 'end': 1},
+                        {'command': 'nosuchcommand', 'id': 3},
+                        {'command': 'batch', 'id': 4, 'requests': [
+                            {'command': 'locals'},
+                            {'command': 'step'},
+                            {'command': 'stack', 'count': 1}]},
+                        {'command': 'step', 'id': 5},
+                        {'command': 'quit', 'id': 6}]
+            client.sendall(''.join([json.dumps(request) + '\n'
+                                    for request in requests]))
+            responses = [json.loads(line) for line in client.makefile()]
+            client.close()
+            proc.wait()
+        finally:
+            shutil.rmtree(tmpdir)
+            pass
+        self.assertEqual([None, 1, 2, 3, 4, 5, None, 6],
+                         [response.get('id') for response in responses])
+        self.assertEqual('status', responses[0]['name'])
+        self.assertEqual(1, responses[1]['frames'][0]['lineno'])
+        self.assertEqual(['x = 1'], responses[2]['lines'])
+        self.assertEqual(1, len(responses[3]['errs']))
+        # A batch runs everything but the step against the same frame.
+        results = responses[4]['results']
+        self.assertEqual(['locals', 'step', 'stack'],
+                         [result['name'] for result in results])
+        self.assertTrue('__name__' in results[0]['locals'])
+        self.assertEqual(1, results[2]['frames'][0]['lineno'])
+        self.assertEqual(["request 1: Command 'step' cannot be batched."],
+                         responses[4]['errs'])
+        self.assertEqual('line', responses[6]['event'])
+        self.assertEqual('terminated', responses[7]['event'])
+        return
+    pass
+
+if __name__ == '__main__':
+    unittest.main()
@@ -47,7 +47,7 @@ class TestCompletion(unittest.TestCase):
 
                 # Completion when word is complete with space.
                 ['info ',
-                 ['args', 'break', 'display', 'files', 'globals', 'line',
+                 ['args', 'break', 'checkpoints', 'display', 'files', 'globals', 'line',
                   'locals', 'macro', 'program', 'return', 'signals', 'source',
                   'threads']],
 
@@ -77,6 +77,10 @@ class TestCompletion(unittest.TestCase):
         got = self.run_complete('unalias ')
         self.assertTrue(len(got) > 0,
                         'unalias should return lots of aliases')
+
+        # Macros added later are completed along with commands
+        self.dbgr.core.processor.macros['fin'] = [lambda: [], "lambda: []"]
+        self.assertEqual(['fin', 'finish'], self.run_complete('fi'))
         return
     pass
 
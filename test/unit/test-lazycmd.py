@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+'Unit test for trepan.processor.lazycmd'
+import sys, unittest
+from import_relative import import_relative
+
+Mdebugger = import_relative('debugger', '...trepan')
+Mlazycmd  = import_relative('processor.lazycmd', '...trepan')
+Mcmdtable = import_relative('processor.cmdtable', '...trepan')
+
+class TestLazyCommand(unittest.TestCase):
+
+    def test_registry_current(self):
+        """The generated registry should match the command modules.
+        If this fails, run trepan/processor/lazycmd.py."""
+        commands, subcommands = Mlazycmd.registry_entries()
+        self.assertEqual(commands, Mcmdtable.COMMANDS)
+        self.assertEqual(subcommands, Mcmdtable.SUBCOMMANDS)
+        return
+
+    def test_lazy_load(self):
+        d = Mdebugger.Debugger()
+        cp = d.core.processor
+        cmd = cp.commands['alias']
+        self.assertEqual('LazyCommand', cmd.__class__.__name__)
+        self.assertEqual('support', cmd.category)
+        self.assertEqual(None, cmd.lazy_loaded)
+
+        msgs = []
+        cmd.msg = msgs.append
+        real_cmd = cmd.lazy_loaded
+        self.assertFalse(real_cmd is None)
+        self.assertTrue(real_cmd is cp.commands['alias'])
+        self.assertTrue(cmd.__doc__.startswith('**alias**'))
+        cmd.run(['alias', 'yy', 'kill'])
+        self.assertEqual(["New alias 'yy' for command 'kill' created."], msgs)
+        return
+
+    def test_subcommands(self):
+        d = Mdebugger.Debugger()
+        cp = d.core.processor
+        info = cp.commands['info']
+        sub = info.cmds.lookup('line')
+        self.assertEqual('line', sub.name)
+        self.assertEqual(2, sub.min_abbrev)
+        self.assertTrue(sub is info.cmds.lookup('li'))
+        self.assertEqual(None, info.cmds.lookup('l'))
+        return
+    pass
+
+if __name__ == '__main__':
+    unittest.main()
@@ -30,6 +30,36 @@ class TestLibComplete(unittest.TestCase):
             pass
         return
 
+    def test_trie(self):
+        trie = Mcomplete.PrefixTrie(['ab', 'aac', 'aa', 'a', 'b'])
+        self.assertEqual(5, len(trie))
+        self.assertEqual(['a', 'aa', 'aac', 'ab'], trie.starting_with('a'))
+        self.assertEqual(['aa', 'aac'], trie.starting_with('aa'))
+        self.assertEqual([], trie.starting_with('c'))
+        self.assertTrue('aa' in trie)
+        self.assertFalse('aab' in trie)
+        trie.remove('aa')
+        trie.remove('aab')
+        self.assertEqual(['aac'], trie.starting_with('aa'))
+        trie.remove('aac')
+        self.assertEqual(None, trie.find('aa'))
+        self.assertEqual(['a', 'ab', 'b'], trie.starting_with(''))
+        return
+
+    def test_completion_dict(self):
+        hash = Mcomplete.CompletionDict({'ab': 1, 'aa': 3})
+        hash['aac'] = 2
+        hash['aa'] = 4
+        self.assertEqual([['aa', 4], ['aac', 2]],
+                         Mcomplete.complete_token_with_next(hash, 'aa'))
+        del hash['aa']
+        self.assertEqual(2, hash.pop('aac'))
+        hash.update({'b': 5})
+        self.assertEqual(['ab', 'b'], hash.trie.starting_with(''))
+        hash.clear()
+        self.assertEqual([], hash.trie.starting_with(''))
+        return
+
     def test_next_token(self):
         x = '  now is  the  time'
         for pos, expect in [
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+'Unit test for trepan.lib.coredump'
+import inspect, os, sys, tempfile, threading, unittest
+from import_relative import import_relative
+
+import_relative('lib', '...trepan')
+Mcoredump = import_relative('lib.coredump', '...trepan')
+
+class Account:
+    pass
+
+def withdraw(acct, amount, *rest, **opts):
+    limit = {'max': 10}
+    obj = Account()
+    return amount / acct
+
+def main():
+    name = 'x' * 1000
+    return withdraw(0, 5, 6, k=1)
+
+class TestLibCoreDump(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.filename = tempfile.mkstemp()
+        os.close(fd)
+        return
+
+    def tearDown(self):
+        os.unlink(self.filename)
+        return
+
+    def write_core(self):
+        try:
+            main()
+        except ZeroDivisionError:
+            Mcoredump.write(sys.exc_info(), self.filename)
+            pass
+        return Mcoredump.read(self.filename)
+
+    def test_round_trip(self):
+        core = self.write_core()
+        self.assertEqual(os.getpid(), core['pid'])
+        self.assertEqual(['write_core', 'main', 'withdraw'],
+                         [f['name'] for f in core['frames']])
+        exc_type, exc_value, tb = Mcoredump.rebuild(core)
+        self.assertEqual('ZeroDivisionError', exc_type.__name__)
+        self.assertTrue('by zero' in str(exc_value))
+
+        # The innermost frame is at the same place, with the same
+        # arguments and variables.
+        frame = tb.tb_frame
+        self.assertEqual('withdraw', frame.f_code.co_name)
+        self.assertEqual(withdraw.func_code.co_filename,
+                         frame.f_code.co_filename)
+        self.assertEqual(withdraw.func_code.co_firstlineno + 3,
+                         frame.f_lineno)
+        args, varargs, varkw, f_locals = inspect.getargvalues(frame)
+        self.assertEqual((['acct', 'amount'], 'rest', 'opts'),
+                         (args, varargs, varkw))
+        self.assertEqual((0, 5, (6,), {'k': 1}, {'max': 10}),
+                         tuple([f_locals[name] for name in
+                                ('acct', 'amount', 'rest', 'opts', 'limit')]))
+        # Values that can't be rebuilt show their repr.
+        self.assertTrue(repr(f_locals['obj']).startswith('<'))
+        self.assertTrue(isinstance(f_locals['obj'], Mcoredump.SavedValue))
+
+        # Callers follow, with reprs cut short.
+        frame = frame.f_back
+        self.assertEqual('main', frame.f_code.co_name)
+        self.assertEqual(Mcoredump.MAX_REPR,
+                         len(repr(frame.f_locals['name'])))
+        self.assertTrue(Account is not frame.f_globals['Account'])
+        self.assertFalse([name for name in frame.f_globals
+                          if name.startswith(Mcoredump.HIDDEN)])
+        return
+
+    def test_threads(self):
+        done = threading.Event()
+        thread = threading.Thread(target=done.wait, name='waiter')
+        thread.start()
+        try:
+            core = self.write_core()
+        finally:
+            done.set()
+            thread.join()
+            pass
+        threads = [t for t in core['threads'] if 'waiter' == t['name']]
+        self.assertEqual(1, len(threads))
+        self.assertTrue('__bootstrap_inner' in
+                        [name for filename, lineno, name
+                         in threads[0]['stack']])
+        return
+
+    def test_no_traceback(self):
+        # Stand-ins that return rather than raise give no traceback,
+        # and leave nothing behind in the rebuilt scopes.
+        core = self.write_core()
+        stand_in = Mcoredump.stand_in
+        Mcoredump.stand_in = lambda record, i, last: stand_in(record, i,
+                                                              False)
+        try:
+            exc_type, exc_value, tb = Mcoredump.rebuild(core)
+        finally:
+            Mcoredump.stand_in = stand_in
+            pass
+        self.assertEqual('ZeroDivisionError', exc_type.__name__)
+        self.assertEqual(None, tb)
+        return
+
+    def test_bad_file(self):
+        fp = open(self.filename, 'w')
+        fp.write('not a core file')
+        fp.close()
+        self.assertRaises(ValueError, Mcoredump.read, self.filename)
+        fp = open(self.filename, 'w')
+        fp.write(Mcoredump.MAGIC + 'damaged')
+        fp.close()
+        self.assertRaises(ValueError, Mcoredump.read, self.filename)
+        return
+    pass
+
+if __name__ == '__main__':
+    unittest.main()
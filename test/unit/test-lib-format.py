@@ -1,97 +1,39 @@
 #!/usr/bin/env python
-'Unit test for trepan.lib.file'
-import unittest
-from pygments.lexers import RstLexer
+'Unit test for trepan.lib.format'
+import os, subprocess, sys, unittest
 from import_relative import import_relative
 
 import_relative('lib', '...trepan')
 Mformat = import_relative('lib.format', '...trepan')
 
-class TestLibFile(unittest.TestCase):
-
-    def test_mono(self):
-
-        # Could be in setup()
-        rst_lex  = RstLexer()
-        rst_filt = Mformat.RstFilter()
-        rst_lex.add_filter(rst_filt)
-        rst_tf = Mformat.MonoRSTTerminalFormatter()
-        text = '`A` very *emphasis* **strong** `code`'
-        got = Mformat.highlight(text, rst_lex, rst_tf)
-        self.assertEqual('"A" very *emphasis* STRONG "code" ', got)
-
-        quit_text = """**quit** - gently terminate the debugged program.
-
-The program being debugged is aborted via a *DebuggerQuit*
-exception.
-
-When the debugger from the outside (e.g. via a `trepan` command), the
-debugged program is contained inside a try block which handles the
-*DebuggerQuit* exception.  However if you called the debugger was
-started in the middle of a program, there might not be such an
-exception handler; the debugged program still terminates but generally
-with a traceback showing that exception.
-
-If the debugged program is threaded or worse threaded and deadlocked,
-raising an exception in one thread isn't going to quit the
-program. For this see `exit` or `kill` for more forceful termination
-commands.
-
-Also, see `run` and `restart` for other ways to restart the debugged
-program.
-"""
-        rst_tf.reset(80)
-        got = Mformat.highlight(quit_text, rst_lex, rst_tf)
-        self.assertEqual("""QUIT - gently terminate the debugged program. 
-
-The program being debugged is aborted via a *DebuggerQuit* exception. 
-
-When the debugger from the outside (e.g. via a "trepan" command), the debugged 
-program is contained inside a try block which handles the *DebuggerQuit* 
-exception. However if you called the debugger was started in the middle of a 
-program, there might not be such an exception handler; the debugged program 
-still terminates but generally with a traceback showing that exception. 
-
-If the debugged program is threaded or worse threaded and deadlocked, raising 
-an exception in one thread isn't going to quit the program. For this see "exit"
-or "kill" for more forceful termination commands. 
-
-Also, see "run" and "restart" for other ways to restart the debugged program. """,
-                         got)
-
-        text ='''
-This is an example to show off *reformatting.*
-We have several lines
-here which should be reflowed.
-
-But paragraphs should be respected.
-
-    And verbatim
-    text should not be
-    touched
-
-End of test.
-'''
-        rst_tf.reset(30)
-        got = Mformat.highlight(text, rst_lex, rst_tf)
-        self.assertEqual(
-        """This is an example to show 
-off *reformatting.* We have 
-several lines here which 
-should be reflowed. 
-
-But paragraphs should be 
-respected. 
-
-    And verbatim
-    text should not be
-    touched
-
-
-End of test. """,
-            got)
-
+class TestLibFormat(unittest.TestCase):
+
+    def test_format_token(self):
+        self.assertEqual('foo', Mformat.format_token(Mformat.Function, 'foo',
+                                                     highlight='plain'))
+        self.assertEqual('foo', Mformat.colorize('bold', 'foo', 'plain'))
+        got = Mformat.format_token(Mformat.Function, 'foo',
+                                   highlight='light')
+        self.assertTrue(got != 'foo' and 'foo' in got)
+        self.assertEqual('"A" STRONG ',
+                         Mformat.rst_text('`A` **strong**', True))
+        return
 
+    def test_plain_no_pygments(self):
+        """Plain formatting shouldn't import Pygments"""
+        trepan_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                  os.pardir, os.pardir)
+        prog = """import sys
+sys.path.insert(0, %r)
+from trepan.lib import format
+format.format_token(format.Function, 'foo', highlight='plain')
+format.colorize('bold', 'foo', 'plain')
+print([m for m in sys.modules if m.startswith('pygments')])
+""" % os.path.normpath(trepan_dir)
+        proc = subprocess.Popen([sys.executable, '-c', prog],
+                                stdout=subprocess.PIPE,
+                                stderr=open(os.devnull, 'w'))
+        self.assertEqual('[]', proc.communicate()[0].strip())
         return
     pass
 
@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+'Unit test for trepan.lib.highlight'
+import os, tempfile, unittest
+from import_relative import import_relative
+
+import_relative('lib', '...trepan')
+Mhighlight = import_relative('lib.highlight', '...trepan')
+import pyficache
+
+SOURCE = '''import os
+
+def foo(a):
+    """A docstring
+    with two lines"""
+    return a + 1
+
+x = """not
+code"""
+
+class Bar:
+    def baz(self):
+        return 5
+    pass
+'''
+
+class TestLibHighlight(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.filename = tempfile.mkstemp(suffix='.py')
+        os.close(fd)
+        self.write(SOURCE)
+        Mhighlight.clear_cache()
+        return
+
+    def tearDown(self):
+        os.unlink(self.filename)
+        pyficache.clear_file_cache(self.filename)
+        Mhighlight.clear_cache()
+        return
+
+    def write(self, text):
+        f = open(self.filename, 'w')
+        f.write(text)
+        f.close()
+        # Make sure pyficache rereads the file.
+        pyficache.clear_file_cache(self.filename)
+        return
+
+    def whole(self, text, style='light'):
+        """Highlight text in one go, the way we'd like segments to come
+        out."""
+        fmt = Mhighlight.highlight_string(text, style).split('\n')
+        return [line + '\n' for line in fmt][:len(text.split('\n'))-1]
+
+    def test_segment_starts(self):
+        lines = SOURCE.split('\n')
+        lines = [line + '\n' for line in lines]
+        # The multi-line string assignment starts on line 8, the
+        # class on line 11
+        self.assertEqual([0, 2, 7, 10], Mhighlight.segment_starts(lines))
+        self.assertEqual([0], Mhighlight.segment_starts(['if\n', 'x\n']))
+        return
+
+    def test_getline(self):
+        opts = {'output': 'light', 'strip_nl': False}
+        expect = self.whole(SOURCE)
+        self.assertEqual(expect[5], Mhighlight.getline(self.filename, 6, opts))
+        info = Mhighlight.file_cache[self.filename]
+        hilite = Mhighlight.highlight_cache[(info.sha1, 'light')]
+        # Only the segment for "def foo" should have been highlighted
+        self.assertEqual([None, None] + expect[2:7] + [None] * 7, hilite)
+
+        self.assertEqual(expect, Mhighlight.getlines(self.filename, opts))
+        self.assertEqual(None, Mhighlight.getline(self.filename, 100, opts))
+
+        # Change the file so that later unchanged lines are no longer
+        # part of a string.
+        new_source = SOURCE.replace('x = """not\ncode"""',
+                                    'x = """not"""\ny = 5')
+        self.write(new_source)
+        self.assertEqual(Mhighlight.getline(self.filename, 1, opts),
+                         self.whole(new_source)[0])
+        info = Mhighlight.file_cache[self.filename]
+        hilite = Mhighlight.highlight_cache[(info.sha1, 'light')]
+        # The first two segments were unchanged and kept...
+        self.assertEqual(expect[0:7], hilite[0:7])
+        # ... but not the changed one
+        self.assertEqual([None, None], hilite[7:9])
+        self.assertEqual(self.whole(new_source),
+                         Mhighlight.getlines(self.filename, opts))
+        return
+
+    def test_remapped_lines(self):
+        # Lines 1 and 2 are shown from line 6 on, as pyficache.getline()
+        # would.
+        pyficache.remap_file_lines(self.filename, self.filename,
+                                   range(1, 3), 6)
+        try:
+            self.assertEqual(pyficache.getline(self.filename, 1),
+                             Mhighlight.getline(self.filename, 1))
+            self.assertEqual(self.whole(SOURCE)[5],
+                             Mhighlight.getline(self.filename, 1,
+                                                {'output': 'light',
+                                                 'strip_nl': False}))
+        finally:
+            del pyficache.file2file_remap_lines[self.filename]
+            pass
+        return
+
+    def test_plain(self):
+        opts = {'output': 'plain'}
+        self.assertEqual('import os',
+                         Mhighlight.getline(self.filename, 1, opts))
+        self.assertEqual({}, Mhighlight.highlight_cache)
+        return
+    pass
+
+if __name__ == '__main__':
+    unittest.main()
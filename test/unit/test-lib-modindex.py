@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+'Unit test for trepan.lib.modindex'
+import os, sys, tempfile, unittest
+from import_relative import import_relative
+
+import_relative('lib', '...trepan')
+Mmodindex = import_relative('lib.modindex', '...trepan')
+import pyficache
+
+class TestLibModIndex(unittest.TestCase):
+
+    def test_sorted_names(self):
+        names = Mmodindex.SortedNames()
+        for name in ('/b/foo.py', '/a/foo.py', '/a/bar.py', '/a/foo.py'):
+            names.add(name)
+            pass
+        self.assertEqual(3, len(names))
+        self.assertEqual(['/a/bar.py', '/a/foo.py'], names.starting_with('/a'))
+        self.assertEqual([], names.starting_with('/c'))
+        self.assertEqual(['/a/foo.py', '/b/foo.py'],
+                         names.ending_with('foo.py'))
+        names.remove('/a/foo.py')
+        self.assertFalse('/a/foo.py' in names)
+        self.assertEqual(['/b/foo.py'], names.ending_with('foo.py'))
+        self.assertEqual(['/a/bar.py'], names.starting_with('/a'))
+        return
+
+    def test_modules_for_file(self):
+        self.assertTrue('os' in Mmodindex.modules_for_file(os.__file__))
+
+        # A module imported after the index was built is picked up.
+        dirname = tempfile.mkdtemp()
+        filename = os.path.join(dirname, 'trepan_modindex_test.py')
+        f = open(filename, 'w')
+        f.write('x = 1\n')
+        f.close()
+        sys.path.insert(0, dirname)
+        try:
+            import trepan_modindex_test
+            self.assertEqual(['trepan_modindex_test'],
+                             Mmodindex.modules_for_file(filename))
+            del sys.modules['trepan_modindex_test']
+            self.assertEqual([], Mmodindex.modules_for_file(filename))
+        finally:
+            sys.path.remove(dirname)
+            for name in os.listdir(dirname):
+                os.unlink(os.path.join(dirname, name))
+                pass
+            os.rmdir(dirname)
+            pass
+        return
+
+    def test_complete(self):
+        filename = Mmodindex.canonic(__file__)
+        pyficache.cache_file(filename)
+        self.assertTrue(filename in Mmodindex.complete(filename[:-3]))
+        self.assertTrue(filename in
+                        Mmodindex.files_ending_with('test-lib-modindex.py'))
+        self.assertEqual([], Mmodindex.complete(filename + 'x'))
+        return
+    pass
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+'Unit test for trepan.lib.ringbuf and trepan.traceview'
+import os, shutil, StringIO, sys, tempfile, threading, unittest
+from import_relative import import_relative
+
+import_relative('lib', '...trepan')
+Mringbuf   = import_relative('lib.ringbuf', '...trepan')
+Mtraceview = import_relative('traceview', '...trepan')
+
+class TestLibRingbuf(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'trace')
+        return
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+        return
+
+    def test_write_read(self):
+        writer = Mringbuf.RingWriter(self.path, 4)
+        reader = Mringbuf.RingReader(self.path)
+        try:
+            self.assertTrue(writer.write('call', 'foo.py', 10, 'foo'))
+            self.assertTrue(writer.write('return', 'x' * 200 + '/foo.py',
+                                         12, 'foo', '5'))
+            events = reader.read()
+            self.assertEqual(['call', 'return'],
+                             [event.event for event in events])
+            self.assertEqual('call - foo.py:10', str(events[0]))
+            # Long file names keep their end.
+            self.assertTrue(events[1].filename.endswith('/foo.py'))
+            self.assertEqual('5', events[1].arg)
+            self.assertEqual([], reader.read())
+        finally:
+            reader.close()
+            writer.close()
+            pass
+        return
+
+    def test_drop(self):
+        writer = Mringbuf.RingWriter(self.path, 2)
+        reader = Mringbuf.RingReader(self.path)
+        try:
+            # The writer never waits for the reader.
+            results = [writer.write('line', 'foo.py', lineno)
+                       for lineno in range(1, 6)]
+            self.assertEqual([True, True, False, False, False], results)
+            self.assertEqual(3, reader.dropped())
+            self.assertEqual([1, 2], [event.lineno for event in reader.read()])
+            # Reading makes room again; slots are reused.
+            self.assertTrue(writer.write('line', 'foo.py', 6))
+            self.assertEqual([6], [event.lineno for event in reader.read()])
+        finally:
+            reader.close()
+            writer.close()
+            pass
+        return
+
+    def test_threads(self):
+        writer = Mringbuf.RingWriter(self.path, 4000)
+        reader = Mringbuf.RingReader(self.path)
+        def write(thread):
+            for lineno in range(1000):
+                writer.write('line', 'foo.py', lineno, thread=thread)
+                pass
+            return
+        threads = [threading.Thread(target=write, args=(i,))
+                   for i in range(4)]
+        # Switch threads as often as we can.
+        interval = sys.getcheckinterval()
+        sys.setcheckinterval(1)
+        try:
+            for t in threads: t.start()
+            for t in threads: t.join()
+        finally:
+            sys.setcheckinterval(interval)
+            pass
+        try:
+            # Nothing is lost or written over.
+            events = reader.read()
+            self.assertEqual(4000, len(events))
+            self.assertEqual(set([(thread, lineno) for thread in range(4)
+                                  for lineno in range(1000)]),
+                             set([(event.thread, event.lineno)
+                                  for event in events]))
+        finally:
+            reader.close()
+            writer.close()
+            pass
+        return
+
+    def test_replace(self):
+        # A new buffer at the same path is a new file. A reader of the
+        # old one goes on reading that.
+        writer = Mringbuf.RingWriter(self.path, 2)
+        reader = Mringbuf.RingReader(self.path)
+        inode  = os.stat(self.path).st_ino
+        writer.write('line', 'foo.py', 1)
+        writer.close()
+        writer = Mringbuf.RingWriter(self.path, 16)
+        try:
+            self.assertNotEqual(inode, os.stat(self.path).st_ino)
+            for lineno in range(2, 42):
+                writer.write('line', 'foo.py', lineno)
+                pass
+            self.assertEqual([1], [event.lineno for event in reader.read()])
+            self.assertEqual([], reader.read())
+            reader.close()
+            reader = Mringbuf.RingReader(self.path)
+            self.assertEqual(16, reader.slots)
+            self.assertEqual(range(2, 18),
+                             [event.lineno for event in reader.read()])
+            self.assertEqual(24, reader.dropped())
+        finally:
+            reader.close()
+            writer.close()
+            pass
+        self.assertEqual(['trace'], os.listdir(self.tmpdir))
+        return
+
+    def test_not_ringbuf(self):
+        open(self.path, 'w').write('not a ring buffer' * 10)
+        self.assertRaises(IOError, Mringbuf.RingReader, self.path)
+        return
+
+    def test_traceview(self):
+        writer = Mringbuf.RingWriter(self.path, 2)
+        for event, lineno in (('call', 1), ('line', 2), ('line', 3)):
+            writer.write(event, 'foo.py', lineno, 'foo')
+            pass
+        out = StringIO.StringIO()
+        opts, args = Mtraceview.process_options(
+            '1.0', ['trepan2-trace', '--no-follow', '--events', 'line',
+                    self.path])
+        self.assertEqual([self.path], args)
+        Mtraceview.view(self.path, opts, out)
+        writer.close()
+        self.assertEqual('** 1 events dropped\nline - foo.py:2\n',
+                         out.getvalue())
+        return
+    pass
+
+if __name__ == '__main__':
+    unittest.main()
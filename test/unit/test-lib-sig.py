@@ -4,6 +4,8 @@ import signal, unittest
 
 from import_relative import import_relative
 Msig = import_relative('lib.sighandler', '...trepan')
+Mdebugger    = import_relative('debugger', '...trepan')
+Mstringarray = import_relative('inout.stringarray', '...trepan')
 
 class TestLibSigHandle(unittest.TestCase):
 
@@ -51,6 +53,44 @@ class TestLibSigHandle(unittest.TestCase):
             pass
         return
 
+    def test_tables(self):
+        self.assertEqual(sorted(Msig.signame2num.keys()), Msig.signames)
+        for signum, signame in Msig.signum2name.items():
+            self.assertEqual(signum, Msig.signame2num[signame])
+            pass
+        self.assertEqual(None, Msig.lookup_signum('SIG_IGN'))
+        return
+
+    def test_lazy_handlers(self):
+        save_signal = signal.signal
+        save_int    = signal.getsignal(signal.SIGINT)
+        save_usr1   = signal.getsignal(signal.SIGUSR1)
+        out = Mstringarray.StringArrayOutput()
+        d = Mdebugger.Debugger({'output': out})
+        def last_line():
+            return [line for line in out.output if line][-1]
+        try:
+            sigmgr = d.sigmgr
+            # Only SIGINT's handler is set up to start with...
+            self.assertEqual(['SIGINT'], list(sigmgr.sigs.keys()))
+            # but the others show their default actions.
+            sigmgr.info_signal(['signal', 'USR1'])
+            self.assertEqual(['SIGUSR1', 'Yes', 'Yes', 'No', 'No'],
+                             last_line().split()[:5])
+            sigmgr.info_signal(['signal', 'ALRM'])
+            self.assertEqual(['SIGALRM', 'No', 'No', 'No', 'Yes'],
+                             last_line().split()[:5])
+            sigmgr.action('USR1 nostop noprint')
+            self.assertTrue('SIGUSR1' in sigmgr.sigs)
+            self.assertEqual(sigmgr.sigs['SIGUSR1'].handle,
+                             signal.getsignal(signal.SIGUSR1))
+        finally:
+            signal.signal = save_signal
+            signal.signal(signal.SIGINT,  save_int)
+            signal.signal(signal.SIGUSR1, save_usr1)
+            pass
+        return
+
     pass
 
 if __name__ == '__main__':
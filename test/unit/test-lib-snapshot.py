@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+'Unit test for trepan.lib.snapshot'
+import os, re, subprocess, sys, tempfile, threading, unittest
+from import_relative import import_relative
+
+import_relative('lib', '...trepan')
+Msnapshot = import_relative('lib.snapshot', '...trepan')
+
+trepan_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                          os.pardir, os.pardir, 'trepan')
+
+class TestLibSnapshot(unittest.TestCase):
+
+    def test_unavailable(self):
+        if not sys.platform.startswith('linux'):
+            self.assertTrue(Msnapshot.unavailable())
+            return
+        self.assertEqual(None, Msnapshot.unavailable())
+        done = threading.Event()
+        thread = threading.Thread(target=done.wait)
+        thread.start()
+        try:
+            self.assertTrue('thread' in Msnapshot.unavailable())
+        finally:
+            done.set()
+            thread.join()
+            pass
+        return
+
+    def run_debugger(self, cmds):
+        """Run the debugger with --snapshot on a small program, giving
+        it commands *cmds*. Return the output."""
+        fd, script = tempfile.mkstemp(suffix='.py')
+        os.write(fd, "import os\nprint('pid %d' % os.getpid())\n" +
+                 "x = 1\ny = 2\n")
+        os.close(fd)
+        try:
+            proc = subprocess.Popen([sys.executable, '-u',
+                                     os.path.join(trepan_dir, 'cli.py'),
+                                     '--highlight=plain', '--snapshot',
+                                     script],
+                                    stdin=subprocess.PIPE,
+                                    stdout=subprocess.PIPE,
+                                    stderr=open(os.devnull, 'w'))
+            output = proc.communicate('\n'.join(cmds) + '\n')[0]
+        finally:
+            os.unlink(script)
+            pass
+        self.assertEqual(0, proc.returncode)
+        return output
+
+    def test_restart(self):
+        """Restart from a checkpoint keeps breakpoints and settings but
+        not the program's progress"""
+        if Msnapshot.unavailable(): return
+        output = self.run_debugger(['step', 'step', 'break 4',
+                                    'set listsize 5', 'restart', 'y',
+                                    'show listsize', 'continue', 'quit'])
+        self.assertTrue('Took checkpoint 1 at ' in output)
+        self.assertTrue('Restarted from checkpoint 1 at ' in output)
+        self.assertTrue('by default is 5.' in output)
+        # The program ran twice, in different processes, and the
+        # breakpoint was kept.
+        pids = re.findall(r'pid (\d+)', output)
+        self.assertEqual(2, len(pids))
+        self.assertNotEqual(pids[0], pids[1])
+        self.assertTrue(re.search(r'xx 4 y = 2', output))
+        return
+
+    def test_checkpoints(self):
+        """Restart from a given checkpoint after deleting another"""
+        if Msnapshot.unavailable(): return
+        output = self.run_debugger(['step', 'step', 'checkpoint',
+                                    'delete checkpoint 1',
+                                    'restart 1', 'step', 'restart 2', 'y',
+                                    'info checkpoints', 'continue', 'quit'])
+        self.assertTrue('Took checkpoint 2 at ' in output)
+        self.assertTrue('Deleted checkpoint 1' in output)
+        self.assertTrue('No checkpoint number 1.' in output)
+        self.assertTrue('Restarted from checkpoint 2 at ' in output)
+        # The program was restarted after its print, so that was done
+        # only once.
+        self.assertEqual(1, len(re.findall(r'pid (\d+)', output)))
+        # Checkpoint 1 is gone, and checkpoint 2 has been used once.
+        self.assertTrue(re.search(r'\n2 +\d+ +1 +\S+:3\n', output))
+        self.assertFalse(re.search(r'\n1 +\d+ +\d+ +\S+:1\n', output))
+        return
+    pass
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+'Unit test for trepan.lib.symbols'
+import os, tempfile, unittest
+from import_relative import import_relative
+
+import_relative('lib', '...trepan')
+Msymbols = import_relative('lib.symbols', '...trepan')
+
+SOURCE = '''import os
+
+def foo(a):
+    """A docstring"""
+    return a + 1
+
+class Bar:
+    def baz(self):
+        def inner():
+            return lambda x: x
+        return inner
+
+@staticmethod
+def decorated():
+    pass
+'''
+
+class TestLibSymbols(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.filename = tempfile.mkstemp(suffix='.py')
+        os.close(fd)
+        self.write(SOURCE)
+        Msymbols.clear_cache()
+        return
+
+    def tearDown(self):
+        os.unlink(self.filename)
+        Msymbols.clear_cache()
+        return
+
+    def write(self, text):
+        f = open(self.filename, 'w')
+        f.write(text)
+        f.close()
+        return
+
+    def test_index(self):
+        index = Msymbols.get_index(self.filename)
+        self.assertEqual([('foo', 'function', 3, 5),
+                          ('Bar', 'class', 7, 7),
+                          ('Bar.baz', 'function', 8, 9),
+                          ('Bar.baz.inner', 'function', 9, 10),
+                          ('decorated', 'function', 13, 15)],
+                         [(sym.name, sym.kind, sym.lineno, sym.body_lineno)
+                          for sym in index.symbols])
+        # A second request is served from the cache
+        self.assertTrue(index is Msymbols.get_index(self.filename))
+        self.assertEqual(None, Msymbols.get_index('/no/such/file.py'))
+        return
+
+    def test_lookup(self):
+        self.assertEqual(8, Msymbols.lookup(self.filename, 'Bar.baz').lineno)
+        self.assertEqual(8, Msymbols.lookup(self.filename, 'baz').lineno)
+        self.assertEqual(None, Msymbols.lookup(self.filename, 'nothere'))
+
+        # Change the file; the index should notice.
+        self.write('\n' + SOURCE + 'class Quux:\n    def baz(self): pass\n')
+        self.assertEqual(4, Msymbols.lookup(self.filename, 'foo').lineno)
+        # baz is no longer unique
+        self.assertEqual(None, Msymbols.lookup(self.filename, 'baz'))
+        return
+
+    def test_complete(self):
+        self.assertEqual(['Bar', 'Bar.baz', 'Bar.baz.inner'],
+                         Msymbols.complete(self.filename, 'B'))
+        self.assertEqual([], Msymbols.complete(self.filename, 'x'))
+        return
+
+    def test_find(self):
+        sym = Msymbols.find('os.path.join')
+        self.assertEqual('join', sym.name)
+        self.assertEqual(None, Msymbols.find('os.path.nothere'))
+        self.assertEqual('Bar.baz',
+                         Msymbols.find('Bar.baz', self.filename).name)
+        return
+    pass
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+'Unit test for trepan.lib.tracelines'
+import os, shutil, tempfile, unittest
+from import_relative import import_relative
+
+import_relative('lib', '...trepan')
+Mtracelines = import_relative('lib.tracelines', '...trepan')
+
+class TestLibTraceLines(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.old_cache_home = os.environ.get('XDG_CACHE_HOME')
+        os.environ['XDG_CACHE_HOME'] = os.path.join(self.tmpdir, 'cache')
+        self.filename = os.path.join(self.tmpdir, 'prog.py')
+        f = open(self.filename, 'w')
+        f.write("x = 1\n\ndef foo():\n    return 2\n")
+        f.close()
+        Mtracelines.lines_cache.clear()
+        return
+
+    def tearDown(self):
+        if self.old_cache_home is None:
+            del os.environ['XDG_CACHE_HOME']
+        else:
+            os.environ['XDG_CACHE_HOME'] = self.old_cache_home
+            pass
+        shutil.rmtree(self.tmpdir)
+        Mtracelines.lines_cache.clear()
+        return
+
+    def test_trace_line_numbers(self):
+        linenos = Mtracelines.trace_line_numbers(self.filename)
+        self.assertTrue(1 in linenos)
+        self.assertTrue(4 in linenos)
+        self.assertFalse(2 in linenos)
+
+        # The result should have been saved on disk...
+        sha1 = Mtracelines.file_sha1(self.filename)
+        key  = '%s-%s' % (sha1, Mtracelines.PYVER)
+        self.assertEqual(linenos, Mtracelines.read_entry(key))
+
+        # ... and is used from there, even when not in memory.
+        Mtracelines.lines_cache.clear()
+        Mtracelines.write_entry(key, [1, 2, 3])
+        self.assertEqual([1, 2, 3],
+                         Mtracelines.trace_line_numbers(self.filename))
+
+        self.assertEqual(None, Mtracelines.file_sha1('/no/such/file'))
+        return
+
+    def test_changed_file(self):
+        # pyficache has the old text, but the lines cached under the
+        # new SHA1 must be those of the new text.
+        import pyficache
+        # pyficache runs coverage, which leaves a data file in the
+        # current directory.
+        cwd = os.getcwd()
+        os.chdir(self.tmpdir)
+        try:
+            pyficache.trace_line_numbers(self.filename)
+        finally:
+            os.chdir(cwd)
+            pass
+        try:
+            f = open(self.filename, 'w')
+            f.write("x = 1\n\n\ndef foo():\n    return 2\n")
+            f.close()
+            linenos = Mtracelines.trace_line_numbers(self.filename)
+        finally:
+            pyficache.clear_file_cache(self.filename)
+            pass
+        self.assertTrue(5 in linenos)
+        self.assertFalse(3 in linenos)
+        return
+
+    def test_prune(self):
+        for key in ('a', 'b', 'c', 'd'):
+            Mtracelines.write_entry(key, [1])
+            pass
+        os.utime(Mtracelines.cache_path('a'), (0, 0))
+        os.utime(Mtracelines.cache_path('b'), (1, 1))
+        Mtracelines.prune(max_entries=2, max_age=1000)
+        self.assertEqual(['c', 'd'],
+                         sorted(os.listdir(Mtracelines.cache_dir())))
+        Mtracelines.prune(max_entries=2, max_age=-1)
+        self.assertEqual([], os.listdir(Mtracelines.cache_dir()))
+        return
+
+    def test_prefill(self):
+        self.assertEqual(1, Mtracelines.prefill(self.tmpdir))
+        self.assertEqual(0, Mtracelines.prefill(self.tmpdir, max_files=0))
+        self.assertEqual(1, len(os.listdir(Mtracelines.cache_dir())))
+        return
+    pass
+
+if __name__ == '__main__':
+    unittest.main()
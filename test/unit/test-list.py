@@ -24,6 +24,10 @@ class TestListCommand(unittest.TestCase):
         self.msgs.append(msg)
         return
 
+    def msg_source(self, prefix, filename, lineno, line, style='plain'):
+        self.msgs.append(prefix + line)
+        return
+
     def print_lines(self):
         for msg in self.msgs: print(msg)
         for msg in self.errors: print(msg)
@@ -66,6 +70,7 @@ class TestListCommand(unittest.TestCase):
         cp.list_filename = cp.curframe.f_code.co_filename
         self.cmd        = Mlist.ListCommand(cp)
         self.cmd.msg    = self.msg
+        self.cmd.msg_source = self.msg_source
         self.cmd.errmsg = self.errmsg
         d.settings['listsize']  = self.listsize
         d.settings['highlight'] = 'plain'
@@ -1,10 +1,12 @@
 #!/usr/bin/env python
 'Unit test for trepan.processor.command.quit'
-import unittest
+import threading, unittest
 
 from import_relative import import_relative
 
-Mquit = import_relative('processor.command.quit', '...trepan')
+Mquit       = import_relative('processor.command.quit', '...trepan')
+Mexcept     = import_relative('exception', '...trepan')
+Mtracelines = import_relative('lib.tracelines', '...trepan')
 
 from cmdhelper import dbg_setup
 
@@ -23,5 +25,22 @@ class TestQuit(unittest.TestCase):
             self.assertTrue(False)
         return
 
+    def test_quit_prefilling(self):
+        """Test quitting while the line-number cache is being filled"""
+        d, cp = dbg_setup()
+        command = Mquit.QuitCommand(cp)
+        done = threading.Event()
+        thread = threading.Thread(target=done.wait,
+                                  name=Mtracelines.PREFILL_THREAD_NAME)
+        thread.setDaemon(True)
+        thread.start()
+        try:
+            self.assertRaises(Mexcept.DebuggerQuit, command.run, ['quit'])
+        finally:
+            done.set()
+            thread.join()
+            pass
+        return
+
 if __name__ == '__main__':
     unittest.main()
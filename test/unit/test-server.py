@@ -0,0 +1,299 @@
+#!/usr/bin/env python
+'Unit test for trepan.interfaces.server'
+import os, unittest
+import pyficache
+
+from import_relative import import_relative
+import_relative('interfaces', '...trepan', 'trepan')
+Mserver   = import_relative('interfaces.server', '...trepan', 'trepan')
+Mclient   = import_relative('interfaces.client', '...trepan', 'trepan')
+Mcomcodes = import_relative('interfaces.comcodes', '...trepan', 'trepan')
+Mtcpfns   = import_relative('inout.tcpfns', '...trepan', 'trepan')
+
+class RecordingInOut:
+    """Records what is written and reads from a list of replies"""
+    def __init__(self, replies=[]):
+        self.state   = 'connected'
+        self.replies = list(replies)
+        self.written = []
+        self.wire_version  = 1
+        self.wire_features = set()
+        return
+
+    def close(self):
+        self.state = 'disconnected'
+        return
+
+    def read_msg(self):
+        return self.replies.pop(0)
+
+    def write(self, msg):
+        self.written.append(msg)
+        return
+
+    def writeline(self, msg):
+        return self.write(msg + "\n")
+    pass
+
+class DroppingInOut(RecordingInOut):
+    """Like RecordingInOut, but EOFError in the replies is raised,
+    as when the client goes away"""
+    def read_msg(self):
+        reply = self.replies.pop(0)
+        if reply is EOFError:
+            self.state = 'disconnected'
+            raise EOFError
+        self.state = 'connected'
+        return reply
+
+    def disconnect(self):
+        self.state = 'disconnected'
+        return
+
+    def wait_for_connect(self):
+        self.state = 'connected'
+        return
+    pass
+
+class TestInterfaceServer(unittest.TestCase):
+    """Tests ServerInterface class"""
+
+    def test_buffering(self):
+        inout = RecordingInOut([Mcomcodes.CONFIRM_REPLY + 'next'])
+        intf = Mserver.ServerInterface(inout=inout)
+        intf.msg('one')
+        intf.msg_nocr('two')
+        intf.msg(' three')
+        self.assertEqual([], inout.written)
+        self.assertEqual('next', intf.read_command('(trepan2) '))
+        self.assertEqual([Mcomcodes.PRINT + "one\ntwo three\n",
+                          Mcomcodes.PROMPT + "(trepan2) \n"], inout.written)
+
+        # Confirming sends output first, too.
+        inout.written = []
+        inout.replies = [Mcomcodes.CONFIRM_REPLY + 'y']
+        intf.msg('four')
+        self.assertTrue(intf.confirm('Really?', False))
+        self.assertEqual([Mcomcodes.PRINT + "four\n",
+                          Mcomcodes.CONFIRM_FALSE + "Really?\n"],
+                         inout.written)
+
+        # Output is sent when the buffer is full, or when asked.
+        inout.written = []
+        intf.buffer_size = 10
+        intf.msg('five')
+        self.assertEqual([], inout.written)
+        intf.msg('six six')
+        self.assertEqual([Mcomcodes.PRINT + "five\nsix six\n"], inout.written)
+        intf.msg('seven')
+        intf.flush()
+        self.assertEqual(Mcomcodes.PRINT + "seven\n", inout.written[-1])
+        intf.inout.state = 'disconnected'
+        return
+
+    def test_handshake(self):
+        hello = Mcomcodes.SYNC + Mtcpfns.WIRE_HELLO + '7\n'
+        inout = RecordingInOut([hello, Mcomcodes.CONFIRM_REPLY + 'step'])
+        intf = Mserver.ServerInterface(inout=inout)
+        self.assertEqual('step', intf.read_command(''))
+        self.assertEqual(Mtcpfns.WIRE_VERSION, inout.wire_version)
+        self.assertEqual([Mcomcodes.SYNC + Mtcpfns.WIRE_HELLO +
+                          str(Mtcpfns.WIRE_VERSION) + "\n"], inout.written)
+        intf.inout.state = 'disconnected'
+
+        # A client can turn compression off but keep source references.
+        hello = Mcomcodes.SYNC + Mtcpfns.hello(Mtcpfns.WIRE_VERSION,
+                                               ['source'])
+        inout = RecordingInOut([hello, Mcomcodes.CONFIRM_REPLY + 'step'])
+        intf = Mserver.ServerInterface(inout=inout)
+        self.assertEqual('step', intf.read_command(''))
+        self.assertEqual(set(['source']), inout.wire_features)
+        self.assertEqual([hello + "\n"], inout.written)
+        intf.inout.state = 'disconnected'
+        return
+
+    def test_source_refs(self):
+        filename = os.path.abspath(__file__).rstrip('c')
+        sha1 = pyficache.sha1(filename)
+        inout = RecordingInOut([Mcomcodes.FETCH + sha1 + '\n',
+                                Mcomcodes.CONFIRM_REPLY + 'next'])
+        inout.wire_version  = 4
+        inout.wire_features = set(['compress', 'source'])
+        intf = Mserver.ServerInterface(inout=inout)
+        intf.msg('one')
+        intf.msg_source('  1\t', filename, 1, 'not sent', 'plain')
+        intf.msg_source('  2\t', filename, 2, 'not sent', 'plain')
+        intf.msg('two')
+        # The text of the file is sent when the client asks for it,
+        # while we read a command.
+        self.assertEqual('next', intf.read_command('(trepan2) '))
+        text = ''.join(pyficache.getlines(filename, {'output': 'plain'}))
+        self.assertEqual([Mcomcodes.PRINT + "one\n",
+                          Mcomcodes.SOURCE + sha1 + " plain\n1   1\t\n2   2\t",
+                          Mcomcodes.PRINT + "two\n",
+                          Mcomcodes.PROMPT + "(trepan2) \n",
+                          Mcomcodes.FETCH + sha1 + " 1\n" + text],
+                         inout.written)
+        intf.inout.state = 'disconnected'
+
+        # The client asks for the text once, and holds back what
+        # follows until it has it.
+        client_inout = RecordingInOut(inout.written + inout.written[1:4])
+        client = Mclient.ClientInterface(inout=client_inout)
+        lines = ["  1\t#!/usr/bin/env python\n",
+                 "  2\t'Unit test for trepan.interfaces.server'\n"]
+        self.assertEqual([(Mcomcodes.PRINT, "one\n"),
+                          (Mcomcodes.PRINT, ''.join(lines)),
+                          (Mcomcodes.PRINT, "two\n"),
+                          (Mcomcodes.PROMPT, "(trepan2) \n"),
+                          (Mcomcodes.PRINT, ''.join(lines)),
+                          (Mcomcodes.PRINT, "two\n")],
+                         [client.read_remote() for i in range(6)])
+        self.assertEqual([Mcomcodes.FETCH + sha1 + "\n"],
+                         client_inout.written)
+
+        # Clients that don't speak version 4 get the lines.
+        inout = RecordingInOut()
+        intf = Mserver.ServerInterface(inout=inout)
+        intf.msg_source('  1\t', filename, 1, 'sent\n', 'plain')
+        intf.flush()
+        self.assertEqual([Mcomcodes.PRINT + "  1\tsent\n"], inout.written)
+        intf.inout.state = 'disconnected'
+        return
+
+    def test_resume(self):
+        session = Mcomcodes.SYNC + Mtcpfns.SESSION_HELLO
+        prompt  = Mcomcodes.PROMPT + "(trepan2) \n"
+        inout = DroppingInOut([session + '\n',
+                               Mcomcodes.CONFIRM_REPLY + 'list'])
+        intf = Mserver.ServerInterface(inout=inout)
+        token = intf.token
+        intf.msg('one')
+        self.assertEqual('list', intf.read_command('(trepan2) '))
+        self.assertEqual([Mcomcodes.PRINT + "one\n", prompt,
+                          session + " %s 2\n" % token], inout.written)
+
+        # The client goes away before it gets the output of "list".
+        # Whoever connects next is prompted. A client that resumes
+        # the session ignores that, and gets the output and the prompt
+        # again.
+        inout.written = []
+        inout.replies = [EOFError, session + ' %s 2\n' % token,
+                         Mcomcodes.CONFIRM_REPLY + 'step']
+        intf.msg('two')
+        self.assertEqual('step', intf.read_command('(trepan2) '))
+        self.assertEqual([Mcomcodes.PRINT + "two\n", prompt, prompt,
+                          session + " %s 2\n" % token,
+                          Mcomcodes.PRINT + "two\n", prompt], inout.written)
+
+        # If it missed nothing, it is prompted again in the session.
+        inout.written = []
+        inout.replies = [EOFError, session + ' %s 4\n' % token,
+                         Mcomcodes.CONFIRM_REPLY + 'next']
+        self.assertEqual('next', intf.read_command(''))
+        self.assertEqual([prompt, session + " %s 4\n" % token, prompt],
+                         inout.written)
+
+        # A new client starts from where we are. It has its prompt.
+        for hello in (' othertoken 4', ''):
+            inout.written = []
+            inout.replies = [EOFError, session + hello + '\n',
+                             Mcomcodes.CONFIRM_REPLY + 'next']
+            self.assertEqual('next', intf.read_command(''))
+            self.assertEqual([prompt, session + " %s 5\n" % token],
+                             inout.written)
+            pass
+
+        # Only the last backlog_size bytes are kept.
+        intf.backlog_size = 30
+        intf.msg('x' * 10)
+        intf.flush()
+        intf.msg('y' * 10)
+        intf.flush()
+        inout.written = []
+        inout.replies = [EOFError, session + ' %s 6\n' % token,
+                         Mcomcodes.CONFIRM_REPLY + 'next']
+        self.assertEqual('next', intf.read_command('(trepan2) '))
+        self.assertEqual([prompt, prompt, session + " %s 6\n" % token,
+                          Mcomcodes.PRINT + 'y' * 10 + "\n", prompt],
+                         inout.written)
+
+        # A client that knows nothing of sessions just goes on.
+        inout.written = []
+        inout.replies = [EOFError, Mcomcodes.CONFIRM_REPLY + 'next',
+                         Mcomcodes.CONFIRM_REPLY + 'step']
+        self.assertEqual('next', intf.read_command(''))
+        intf.msg('three')
+        self.assertEqual('step', intf.read_command('(trepan2) '))
+        self.assertEqual([prompt, Mcomcodes.PRINT + "three\n", prompt],
+                         inout.written)
+        intf.inout.state = 'disconnected'
+
+        # A client that can't resume gets EOFError as before.
+        intf.resume = False
+        inout.replies = [EOFError]
+        self.assertRaises(EOFError, intf.read_command, '')
+        return
+
+    def test_client_session(self):
+        session = Mcomcodes.SYNC + Mtcpfns.SESSION_HELLO
+        inout = RecordingInOut([Mcomcodes.PRINT + 'a', session + ' tok 1\n',
+                                Mcomcodes.PRINT + 'b', session + ' tok 5\n',
+                                Mcomcodes.PRINT + 'c'])
+        client = Mclient.ClientInterface(inout=inout)
+        self.assertEqual((Mcomcodes.PRINT, 'a'), client.read_remote())
+        self.assertEqual((Mcomcodes.PRINT, 'b'), client.read_remote())
+        self.assertEqual(('tok', 2), (client.session, client.received))
+        self.assertEqual((Mcomcodes.PRINT,
+                          "** 3 messages of output were lost.\n"),
+                         client.read_remote())
+        self.assertEqual((Mcomcodes.PRINT, 'c'), client.read_remote())
+        self.assertEqual(6, client.received)
+
+        # When resuming, what comes before the server's reply is
+        # sent again after it.
+        client.resuming = True
+        inout.replies = [Mcomcodes.PROMPT + '(trepan2) ',
+                         session + ' tok 6\n',
+                         Mcomcodes.PROMPT + '(trepan2) ']
+        self.assertEqual((Mcomcodes.PROMPT, '(trepan2) '),
+                         client.read_remote())
+        self.assertEqual((False, 7), (client.resuming, client.received))
+        return
+
+    def test_client_greeting(self):
+        prompt = (Mcomcodes.PROMPT, '(trepan2) ')
+        hello  = Mcomcodes.SYNC + Mtcpfns.hello(Mtcpfns.WIRE_VERSION,
+                                                ['compress', 'source'])
+        session = Mcomcodes.SYNC + Mtcpfns.SESSION_HELLO
+
+        # We say hello when first prompted, and the prompt is returned
+        # once the server has replied.
+        inout = RecordingInOut([Mcomcodes.PRINT + 'a', ''.join(prompt),
+                                hello, session + ' tok 2\n',
+                                Mcomcodes.PRINT + 'b'])
+        inout.inout = True
+        client = Mclient.ClientInterface(inout=inout)
+        client.handshake()
+        self.assertEqual((Mcomcodes.PRINT, 'a'), client.read_remote())
+        self.assertEqual(prompt, client.read_remote())
+        self.assertEqual([hello + "\n", session + "\n"], inout.written)
+        self.assertEqual((Mtcpfns.WIRE_VERSION, 'tok'),
+                         (inout.wire_version, client.session))
+        self.assertEqual((Mcomcodes.PRINT, 'b'), client.read_remote())
+
+        # A server that takes the hello for a comment prompts again. We
+        # show one prompt, and don't ask about sessions.
+        inout = RecordingInOut([''.join(prompt), ''.join(prompt),
+                                Mcomcodes.PRINT + 'c'])
+        inout.inout = True
+        client = Mclient.ClientInterface(inout=inout)
+        client.handshake()
+        self.assertEqual(prompt, client.read_remote())
+        self.assertEqual((Mcomcodes.PRINT, 'c'), client.read_remote())
+        self.assertEqual([hello + "\n"], inout.written)
+        self.assertEqual(1, inout.wire_version)
+        return
+
+if __name__ == '__main__':
+    unittest.main()
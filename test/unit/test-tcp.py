@@ -1,11 +1,13 @@
 #!/usr/bin/env python
 'Unit test for trepan.inout.tcp*'
-import unittest
+import os, socket, unittest
 
 from import_relative import import_relative
 import_relative('inout', '...trepan', 'trepan')
 Mserver   = import_relative('inout.tcpserver', '...trepan', 'trepan')
 Mclient   = import_relative('inout.tcpclient', '...trepan', 'trepan')
+Mtcpfns   = import_relative('inout.tcpfns', '...trepan', 'trepan')
+Mmulti    = import_relative('inout.tcpmultiserver', '...trepan', 'trepan')
 import_relative('interfaces', '...trepan', 'trepan')
 Mcomcodes = import_relative('interfaces.comcodes', '...trepan', 'trepan')
 
@@ -35,5 +37,137 @@ class TestTCP(unittest.TestCase):
         server.close()
         return
 
+    def test_reopen(self):
+        # Opening again goes to the same port, not the default one.
+        server = Mserver.TCPServer(opts={'open': True, 'PORT': 0})
+        port = server.inout.getsockname()[1]
+        try:
+            client = Mclient.TCPClient(opts={'open': True, 'PORT': port,
+                                             'HOST': '127.0.0.1'})
+            client.close()
+            server.wait_for_connect()
+            server.disconnect()
+            client.open()
+            server.wait_for_connect()
+            client.writeline('again')
+            self.assertEqual('again\n', server.read_msg())
+            client.close()
+        finally:
+            server.close()
+            pass
+        return
+
+    def test_frames(self):
+        big = Mcomcodes.PRINT + 'x' * 100000
+        for version in (1, 2):
+            buf = Mtcpfns.pack_msg('one', version) + Mtcpfns.pack_msg(big, 2)
+            buf, data = Mtcpfns.unpack_msg(buf)
+            self.assertEqual('one', data)
+            # Only part of the second frame has arrived.
+            self.assertEqual((buf[:-1], None), Mtcpfns.unpack_msg(buf[:-1]))
+            self.assertEqual(('', big), Mtcpfns.unpack_msg(buf))
+            pass
+        # Too big for one version 1 frame
+        buf = Mtcpfns.pack_msg(big, 1)
+        chunks = []
+        while buf:
+            buf, data = Mtcpfns.unpack_msg(buf)
+            self.assertEqual(Mcomcodes.PRINT, data[0])
+            chunks.append(data[1:])
+            pass
+        self.assertEqual(big[1:], ''.join(chunks))
+        return
+
+    def test_compress(self):
+        big = Mcomcodes.PRINT + 'z' * 50000
+        small = Mcomcodes.PRINT + 'z' * (Mtcpfns.COMPRESS_MIN - 2)
+        frame = Mtcpfns.pack_msg(big, 3)
+        self.assertTrue(len(frame) < 1000)
+        self.assertEqual(('', big), Mtcpfns.unpack_msg(frame))
+        self.assertEqual((frame[:-1], None), Mtcpfns.unpack_msg(frame[:-1]))
+        # Small messages, and ones that don't get smaller, are sent as
+        # they are.
+        self.assertEqual(Mtcpfns.pack_msg(small, 2),
+                         Mtcpfns.pack_msg(small, 3))
+        noise = Mcomcodes.PRINT + os.urandom(2000)
+        self.assertEqual(Mtcpfns.pack_msg(noise, 2),
+                         Mtcpfns.pack_msg(noise, 3))
+        self.assertEqual(Mtcpfns.pack_msg(big, 2),
+                         Mtcpfns.pack_msg(big, 3, compress=False))
+        return
+
+    def test_read_partial(self):
+        # Frames are put back together however they are split up.
+        big = Mcomcodes.PRINT + 'y' * 50000
+        wire = Mtcpfns.pack_msg(big, 2) + Mtcpfns.pack_msg('two', 1)
+        reader, writer = socket.socketpair()
+        try:
+            for i in range(0, len(wire), 3001):
+                writer.sendall(wire[i:i+3001])
+                pass
+            writer.close()
+            buf, data = Mtcpfns.read_msg(reader, '')
+            self.assertEqual(big, data)
+            buf, data = Mtcpfns.read_msg(reader, buf)
+            self.assertEqual('two', data)
+            self.assertRaises(EOFError, Mtcpfns.read_msg, reader, buf)
+        finally:
+            reader.close()
+            pass
+        return
+
+    def test_hello(self):
+        self.assertEqual(2, Mtcpfns.hello_version(Mtcpfns.WIRE_HELLO + '2\n'))
+        self.assertEqual(None, Mtcpfns.hello_version('step'))
+        self.assertEqual(None, Mtcpfns.hello_version(Mtcpfns.WIRE_HELLO))
+        # Features are listed only when some of the version's aren't
+        # wanted.
+        self.assertEqual(Mtcpfns.WIRE_HELLO + '4',
+                         Mtcpfns.hello(4, ['compress', 'source']))
+        self.assertEqual(Mtcpfns.WIRE_HELLO + '2', Mtcpfns.hello(4, []))
+        hello = Mtcpfns.hello(4, ['source'])
+        self.assertEqual(Mtcpfns.WIRE_HELLO + '4 source', hello)
+        self.assertEqual((4, set(['source'])), Mtcpfns.hello_args(hello))
+        self.assertEqual((3, set(['compress'])),
+                         Mtcpfns.hello_args(Mtcpfns.WIRE_HELLO + '3'))
+        self.assertEqual((3, set()),
+                         Mtcpfns.hello_args(Mtcpfns.WIRE_HELLO + '3 source'))
+        return
+
+    def test_multi_server(self):
+        server = Mmulti.TCPMultiServer(opts={'open': True, 'PORT': 0})
+        server.broadcast_codes = (Mcomcodes.PRINT,)
+        opts = {'open': True, 'PORT': server.PORT}
+        try:
+            # Nothing waits for a client.
+            server.writeline(Mcomcodes.PRINT + 'nobody')
+            self.assertEqual('listening', server.state)
+            controller = Mclient.TCPClient(opts=opts)
+            observer   = Mclient.TCPClient(opts=opts)
+            observer.writeline(Mcomcodes.CONFIRM_REPLY + 'ignored')
+            controller.writeline(Mcomcodes.CONFIRM_REPLY + 'step')
+            self.assertEqual(Mcomcodes.CONFIRM_REPLY + 'step\n',
+                             server.read_msg())
+            self.assertEqual('connected', server.state)
+            server.writeline(Mcomcodes.PROMPT + '(trepan2) ')
+            server.writeline(Mcomcodes.PRINT + 'everybody')
+            server.observe(Mcomcodes.PRINT + 'observers')
+            self.assertEqual(Mcomcodes.PROMPT + '(trepan2) \n',
+                             controller.read_msg())
+            self.assertEqual(Mcomcodes.PRINT + 'everybody\n',
+                             controller.read_msg())
+            self.assertEqual(Mcomcodes.PRINT + 'everybody\n',
+                             observer.read_msg())
+            self.assertEqual(Mcomcodes.PRINT + 'observers',
+                             observer.read_msg())
+            # When the controlling client leaves, the debugger sees EOF.
+            controller.close()
+            self.assertRaises(EOFError, server.read_msg)
+            observer.close()
+        finally:
+            server.close()
+            pass
+        return
+
 if __name__ == '__main__':
     unittest.main()
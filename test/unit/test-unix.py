@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+'Unit test for trepan.inout.unix*'
+import os, shutil, socket, stat, tempfile, unittest
+
+from import_relative import import_relative
+import_relative('inout', '...trepan', 'trepan')
+Mserver   = import_relative('inout.unixserver', '...trepan', 'trepan')
+Mclient   = import_relative('inout.unixclient', '...trepan', 'trepan')
+Mmulti    = import_relative('inout.tcpmultiserver', '...trepan', 'trepan')
+import_relative('interfaces', '...trepan', 'trepan')
+Mcomcodes = import_relative('interfaces.comcodes', '...trepan', 'trepan')
+
+class TestUnix(unittest.TestCase):
+    """Tests UnixServer and UnixClient"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'trepan.sock')
+        return
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+        return
+
+    def test_client_server(self):
+        server = Mserver.UnixServer(opts={'open': True, 'SOCKET': self.path})
+        # Only we may connect.
+        self.assertEqual(0, os.stat(self.path).st_mode & 077)
+        client = Mclient.UnixClient(opts={'open': True, 'SOCKET': self.path})
+        try:
+            for line in ['one', 'two', 'three']:
+                server.writeline(line)
+                self.assertEqual(line, client.read_msg().rstrip('\n'))
+                pass
+            for line in ['four', 'five', 'six']:
+                client.writeline(line)
+                self.assertEqual(line, server.read_msg().rstrip('\n'))
+                pass
+            # Reopening uses the same path.
+            client.close()
+            self.assertRaises(EOFError, server.read_msg)
+            client.open()
+            client.writeline('seven')
+            self.assertEqual('seven\n', server.read_msg())
+        finally:
+            client.close()
+            server.close()
+            pass
+        self.assertFalse(os.path.exists(self.path))
+        return
+
+    def test_stale_socket(self):
+        # A socket left behind by a debugger that went away is replaced,
+        # but one that is still listening is not.
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(self.path)
+        stale.close()
+        server = Mserver.UnixServer(opts={'open': True, 'SOCKET': self.path})
+        try:
+            self.assertTrue(stat.S_ISSOCK(os.stat(self.path).st_mode))
+            self.assertRaises(IOError, Mserver.UnixServer,
+                              opts={'open': True, 'SOCKET': self.path})
+        finally:
+            server.close()
+            pass
+        open(self.path, 'w').close()
+        self.assertRaises(IOError, Mserver.UnixServer,
+                          opts={'open': True, 'SOCKET': self.path})
+        return
+
+    def test_multi_server(self):
+        server = Mmulti.TCPMultiServer(opts={'open': True,
+                                             'SOCKET': self.path})
+        opts = {'open': True, 'SOCKET': self.path}
+        try:
+            controller = Mclient.UnixClient(opts=opts)
+            controller.writeline(Mcomcodes.CONFIRM_REPLY + 'step')
+            self.assertEqual(Mcomcodes.CONFIRM_REPLY + 'step\n',
+                             server.read_msg())
+            server.writeline(Mcomcodes.PROMPT + '(trepan2) ')
+            self.assertEqual(Mcomcodes.PROMPT + '(trepan2) \n',
+                             controller.read_msg())
+            controller.close()
+            self.assertRaises(EOFError, server.read_msg)
+        finally:
+            server.close()
+            pass
+        self.assertFalse(os.path.exists(self.path))
+        return
+
+if __name__ == '__main__':
+    unittest.main()
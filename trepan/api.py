@@ -16,6 +16,13 @@
 '''Some singleton debugger methods that can be called without first
 creating a debugger object -- these methods will create a debugger object,
 if necessary, first.
+
+Importing this module doesn't import the debugger; that happens when
+one of these methods is first called. So calls to breakpoint() or
+breakpoint_if() can be left in a program: unless debugging has been
+enabled, either by setting environment variable TREPAN2_DEBUG to
+something other than "" or "0" or by calling enable(), they return
+right away and the debugger is never loaded.
 '''
 
 # The following routines could be done via something like the following
@@ -32,17 +39,181 @@ if necessary, first.
 # functions below.  (It also doesn't work once we add the exception handling
 # we see below. So for now, we'll live with the code duplication.
 
-import sys
+import os, sys
 from import_relative import import_relative
 
-Mdebugger    = import_relative('debugger', '.')
-Mpost_mortem = import_relative('post_mortem', '.')
+# Set by load(), which is called before either is used.
+Mdebugger    = None
+Mpost_mortem = None
+
+# Whether breakpoint() and breakpoint_if() stop.
+enabled = os.environ.get('TREPAN2_DEBUG', '') not in ('', '0')
+
+def enable(on=True):
+    '''Turn on, or with on=False off, stopping in breakpoint() and
+    breakpoint_if()'''
+    global enabled
+    enabled = on
+    return
+
+def load():
+    '''Import the debugger modules if that hasn't been done yet'''
+    global Mdebugger, Mpost_mortem
+    if Mpost_mortem is None:
+        Mdebugger    = import_relative('debugger', '.')
+        Mpost_mortem = import_relative('post_mortem', '.')
+        pass
+    return
 
 def debugger_on_post_mortem():
     '''Call debugger on an exeception that terminates a program'''
+    load()
     sys.excepthook = Mpost_mortem.post_mortem_excepthook
     return
 
+def post_mortem_policy(exc_type=None, exc_value=None, exc_tb=None):
+    """Return what to do on an exception that terminates the program:
+    'interactive' if there is a terminal to talk to and 'core'
+    otherwise. Environment variable TREPAN2_POST_MORTEM can be set to
+    'interactive', 'core' or 'remote' to choose."""
+    policy = os.environ.get('TREPAN2_POST_MORTEM', '')
+    if policy: return policy
+    if sys.stdin.isatty() and sys.stderr.isatty(): return 'interactive'
+    return 'core'
+
+def install_excepthook(policy=post_mortem_policy, port=1027):
+    """Install an except hook that, on an exception that terminates a
+    program, does one of the following as given by *policy*:
+
+    - 'interactive': enter the debugger, as debugger_on_post_mortem()
+      would.
+    - 'core': write a core file, trepan2.core.<pid>, to debug later
+      with "trepan2 --core FILE".
+    - 'remote': start a debugger server on TCP *port* and wait for a
+      client to connect; see "trepan2 --client".
+
+    *policy* may also be a function, called with the exception type,
+    value and traceback when one happens, that returns one of these.
+    By default it is post_mortem_policy().
+
+    Nothing is imported until an exception happens, and then the
+    debugger is imported only if it is needed."""
+    def excepthook(exc_type, exc_value, exc_tb):
+        # Errors while exiting come here too. Don't act on those.
+        sys.excepthook = sys.__excepthook__
+        if callable(policy):
+            action = policy(exc_type, exc_value, exc_tb)
+        else:
+            action = policy
+            pass
+        if 'core' == action:
+            import_relative('coredump', '.lib', 'trepan').excepthook(
+                exc_type, exc_value, exc_tb)
+        elif 'remote' == action:
+            remote_post_mortem((exc_type, exc_value, exc_tb), port)
+        else:
+            load()
+            Mpost_mortem.post_mortem_excepthook(exc_type, exc_value, exc_tb)
+            pass
+        return
+    sys.excepthook = excepthook
+    return
+
+def remote_post_mortem(exc, port=1027):
+    """Report exception *exc*, a triple like sys.exc_info() returns,
+    and debug it post-mortem from a client connecting to TCP *port*."""
+    import traceback
+    traceback.print_exception(*exc)
+    load()
+    Mserver = import_relative('server', '.interfaces', 'trepan')
+    intf = Mserver.ServerInterface(connection_opts={'IO': 'TCP',
+                                                    'PORT': port})
+    sys.stderr.write('Uncaught exception. Waiting for a debugger client ' +
+                     'on port %s...\n' % intf.inout.PORT)
+    dbg = Mdebugger.Debugger({'interface': intf})
+    Mpost_mortem.post_mortem(exc, dbg=dbg)
+    return
+
+# The debugger started by attach(), while it is attached.
+attached = None
+
+# The attach() arguments for each signal given to
+# install_attach_handler()
+attach_args = {}
+
+def install_attach_handler(signum=None, port=1027, path=None,
+                           host='127.0.0.1'):
+    """Arrange for signal *signum*, SIGUSR1 by default, to attach a
+    debugger to this process. Until the signal comes nothing is
+    loaded or traced, so this can be left in production programs.
+
+    When the signal arrives, attach() starts a debugger server on TCP
+    *port*, or on the UNIX-domain socket *path* if that is given.
+    Connect to it with "trepan2 --client --port *port*" or "trepan2
+    --client --socket *path*". Anyone who can connect can run code in
+    the program, so the TCP server only listens on *host*, by default
+    the loopback interface; None listens on all interfaces. If the
+    server can't be started, the error is reported on stderr and the
+    program carries on. The program runs on until a client
+    connects, and then stops. Leaving with "detach", or just
+    disconnecting, turns the debugger off again, and another signal
+    starts it over.
+
+    Only the thread that gets the signal, the main thread, and threads
+    started after that are traced."""
+    import signal
+    if signum is None: signum = signal.SIGUSR1
+    attach_args[signum] = (port, path, host)
+    signal.signal(signum, attach_handler)
+    return
+
+def attach_handler(signum, frame):
+    # Whatever goes wrong, the interrupted program shouldn't see it.
+    try:
+        attach(*attach_args[signum])
+    except Exception:
+        sys.stderr.write("trepan2: can't attach a debugger: %s\n" %
+                         sys.exc_info()[1])
+        pass
+    return
+
+def attach(port=1027, path=None, host='127.0.0.1'):
+    """Start a debugger server on TCP *port* of interface *host*, or
+    on the UNIX-domain socket *path*, and trace this process, stopping
+    once a client connects. Clients after the first can watch. If we
+    are already attached, stop at the next event. IOError is raised
+    if the server can't be started."""
+    global attached
+    if attached is not None:
+        attached.core.stop_soon()
+        return
+    load()
+    Mserver = import_relative('server', '.interfaces', 'trepan')
+    connection_opts = {'IO': 'TCP', 'HOST': host, 'PORT': port,
+                       'multi': True}
+    if path:
+        connection_opts['IO'] = 'UNIX'
+        connection_opts['SOCKET'] = path
+        pass
+    intf = Mserver.ServerInterface(connection_opts=connection_opts)
+    intf.eof_command = 'detach'
+    dbg = Mdebugger.Debugger({'interface': intf})
+    dbg.core.add_ignore(attach, attach_handler)
+    dbg.detach_hooks.append(detached)
+    attached = dbg
+    dbg.core.stop_soon()
+    dbg.core.start({'include_threads': True})
+    return
+
+def detached(dbg):
+    """Run when the debugger started by attach() detaches."""
+    global attached
+    if dbg is attached:
+        attached = None
+        dbg.intf[-1].finalize()
+        pass
+    return
+
 def run_eval(expression, debug_opts=None, start_opts=None, globals_=None,
              locals_=None):
 
@@ -55,7 +226,7 @@ def run_eval(expression, debug_opts=None, start_opts=None, globals_=None,
     When run_eval() returns, it returns the value of the expression.
     Otherwise this function is similar to run()."""
 
-
+    load()
     dbg = Mdebugger.Debugger(opts=debug_opts)
     try:
         return dbg.run_eval(expression, start_opts=start_opts,
@@ -75,6 +246,7 @@ def run_call(func, debug_opts=None, start_opts=None, *args, **kwds):
     returned.  The debugger prompt appears as soon as the function is
     entered."""
 
+    load()
     dbg = Mdebugger.Debugger(opts=debug_opts)
     try:
         return dbg.run_call(func, start_opts, *args, **kwds)
@@ -100,6 +272,7 @@ def run_exec(statement, debug_opts=None, start_opts=None, globals_=None,
     in which the code is executed; by default the dictionary of the
     module __main__ is used."""
 
+    load()
     dbg = Mdebugger.Debugger(opts=debug_opts)
     try:
         return dbg.run_exec(statement, start_opts=start_opts,
@@ -171,10 +344,15 @@ dictionary that gets fed to trepan.Debugger.core.start().
 
 Parameter "step_ignore" specifies how many line events to ignore after the
 debug() call. 0 means don't even wait for the debug() call to finish.
+
+To leave a call in a program that only stops when debugging has been
+enabled, use breakpoint() or breakpoint_if() instead.
 """
+    load()
     if Mdebugger.Debugger != type(Mdebugger.debugger_obj):
         Mdebugger.debugger_obj = Mdebugger.Debugger(dbg_opts)
-        Mdebugger.debugger_obj.core.add_ignore(debug, stop)
+        Mdebugger.debugger_obj.core.add_ignore(debug, stop, breakpoint,
+                                               breakpoint_if)
         pass
     core = Mdebugger.debugger_obj.core
     frame = sys._getframe(0)
@@ -197,7 +375,23 @@ debug() call. 0 means don't even wait for the debug() call to finish.
         pass
     return
 
+def breakpoint(dbg_opts=None, start_opts=None):
+    """Like debug(), but only if debugging has been enabled; see
+    enable(). Otherwise nothing is done and the debugger isn't loaded."""
+    if enabled: debug(dbg_opts, start_opts)
+    return
+
+def breakpoint_if(cond, dbg_opts=None, start_opts=None):
+    """Like breakpoint() but only stop if *cond* is true as well. For
+    example:
+
+        trepan.api.breakpoint_if(len(queue) > 1000)
+    """
+    if enabled and cond: debug(dbg_opts, start_opts)
+    return
+
 def stop(opts=None):
+    if Mpost_mortem is None: return None
     if Mdebugger.Debugger == type(Mdebugger.debugger_obj):
         return Mdebugger.debugger_obj.stop(opts)
     return None
@@ -211,6 +405,7 @@ if __name__=='__main__':
             print(i)
             pass
         return y
+    load()
     Mdefault = import_relative('default', 'lib', 'trepan')
     settings = dict(Mdefault.DEBUGGER_SETTINGS)
     settings.update({'trace': True, 'printset': tracer.ALL_EVENTS})
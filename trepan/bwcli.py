@@ -33,7 +33,7 @@ Mapi        = import_relative('api', top_name=package)
 Mclifns     = import_relative('clifns', top_name=package)
 Mdebugger   = import_relative('debugger', top_name=package)
 Mexcept     = import_relative('exception', top_name=package)
-Moutput     = import_relative('output', '.io', package)
+Moutput     = import_relative('output', '.inout', package)
 Mserver     = import_relative('server', '.interfaces', package)
 Mfile       = import_relative('file', '.lib', package)
 Mmisc       = import_relative('misc', '.', package)
@@ -73,6 +73,21 @@ def process_options(debugger_name, pkg_version, sys_argv, option_list=None):
     optparser.add_option("--different", dest="different",
                          action="store_true", default=True,
                          help="Consecutive stops should have different positions")
+    optparser.add_option("--server", dest="server",
+                         action='store_true', default=False,
+                         help="Take JSON requests, one a line, from a " +
+                         "front end on a socket rather than from stdin")
+    optparser.add_option("-H", "--host", dest="host", default='127.0.0.1',
+                         action="store", type='string', metavar='IP-OR-HOST',
+                         help="With --server, the interface to listen on. " +
+                         "Use '' for all of them")
+    optparser.add_option("-P", "--port", dest="port", default=1027,
+                         action="store", type='int',
+                         help="With --server, the TCP port to listen on")
+    optparser.add_option("--socket", dest="socket", default=None,
+                         action="store", type='string', metavar='PATH',
+                         help="With --server, listen on the UNIX-domain " +
+                         "socket PATH rather than a TCP port")
     optparser.disable_interspersed_args()
 
     sys.argv = list(sys_argv)
@@ -109,7 +124,18 @@ def main(dbg=None, sys_argv=list(sys.argv)):
     opts, dbg_opts, sys_argv  = process_options(__title__, __version__,
                                                 sys_argv)
     dbg_opts['orig_sys_argv'] = sys_argv
-    dbg_opts['interface']     = Mbullwinkle.BWInterface()
+    if opts.server:
+        if opts.socket:
+            connection_opts = {'IO': 'UNIX', 'SOCKET': opts.socket}
+        else:
+            connection_opts = {'IO': 'TCP', 'HOST': opts.host,
+                               'PORT': opts.port}
+            pass
+        dbg_opts['interface'] = \
+            Mbullwinkle.BWInterface(connection_opts=connection_opts)
+    else:
+        dbg_opts['interface'] = Mbullwinkle.BWInterface()
+        pass
     dbg_opts['processor']     = 'bullwinkle'
 
     if dbg is None:
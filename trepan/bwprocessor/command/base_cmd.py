@@ -32,6 +32,10 @@ class DebuggerCommand:
 
     category = 'misc'
 
+    # True if the command lets the program run or ends it, so that
+    # there is no longer a stopped frame to run further commands on.
+    runs_program = False
+
     def __init__(self, proc):
         """proc contains the command processor object that this
         command is invoked through.  A debugger field gives access to
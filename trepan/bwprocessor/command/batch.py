@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+#  Copyright (C) 2014 Rocky Bernstein
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import os
+from import_relative import import_relative
+
+# Our local modules
+Mbase_cmd  = import_relative('base_cmd', top_name='trepan')
+
+class BatchCommand(Mbase_cmd.DebuggerCommand):
+    """
+run several requests against the same stopped frame
+
+**Input Fields:**
+
+   { command  => 'batch',
+     requests => [<request>, ...],
+   }
+
+Each *request* is a hash like any other request, e.g.
+{command => 'stack'}. They are run in order, and a front end gets
+the results of all of them in a single response. Commands that let
+the program run, like *step*, cannot be batched.
+
+**Output Fields:**
+
+   { name     => 'batch',
+     results  => [<response>, ...],
+     [errmsg  => <error-message-array>]
+     [msg     => <message-text array>]
+   }
+
+There is one *response* for each request, in the same order. If a
+request fails, its response has the reason and *errs* gives the
+position of the request and the first reason.
+"""
+
+    name          = os.path.basename(__file__).split('.')[0]
+    need_stack    = False
+
+    def run(self, cmd_hash):
+        requests = cmd_hash.get('requests')
+        if not isinstance(requests, list):
+            self.proc.response['errs'].append(
+                "expecting a 'requests' list: %s" % requests)
+            return False
+        response = self.proc.response
+        results  = []
+        try:
+            for i, request in enumerate(requests):
+                self.proc.response = {'errs': [], 'msg': []}
+                self.run_one(request)
+                result = self.proc.response
+                results.append(result)
+                if result['errs']:
+                    response['errs'].append('request %d: %s' %
+                                            (i, result['errs'][0]))
+                    pass
+                pass
+        finally:
+            self.proc.response = response
+            pass
+        response['results'] = results
+        return False
+
+    def run_one(self, request):
+        """Run *request*, leaving its result in self.proc.response."""
+        if not isinstance(request, dict) or 'command' not in request:
+            self.proc.response['errs'].append(
+                "invalid request, expecting a 'command' key: %s" %
+                (request,))
+            return
+        if 'id' in request:
+            self.proc.response['id'] = request['id']
+            pass
+        cmd_obj = self.proc.commands.get(request['command'])
+        if cmd_obj and (cmd_obj.runs_program or cmd_obj is self):
+            self.proc.response['name'] = request['command']
+            self.proc.response['errs'].append(
+                "Command '%s' cannot be batched." % request['command'])
+            return
+        self.proc.run_request(request)
+        return
+    pass
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+#  Copyright (C) 2014 Rocky Bernstein
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import os
+from import_relative import import_relative
+
+# Our local modules
+Mbase_cmd  = import_relative('base_cmd', top_name='trepan')
+
+class LocalsCommand(Mbase_cmd.DebuggerCommand):
+    """
+local variables of the current frame
+
+**Input Fields:**
+
+   { command  => 'locals',
+   }
+
+**Output Fields:**
+
+   { name     => 'locals',
+     locals   => {<variable name> => <value repr>, ...},
+     [errmsg  => <error-message-array>]
+     [msg     => <message-text array>]
+   }
+"""
+
+    name          = os.path.basename(__file__).split('.')[0]
+    need_stack    = True
+
+    def run(self, cmd_hash):
+        if not self.proc.curframe:
+            self.proc.response['errs'].append('No frame selected.')
+            return False
+        f_locals = self.proc.curframe.f_locals
+        self.proc.response['locals'] = dict(
+            [(name, self.proc._saferepr(value))
+             for name, value in f_locals.items()])
+        return False
+    pass
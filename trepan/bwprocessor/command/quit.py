@@ -17,6 +17,7 @@ from import_relative import import_relative
 # Our local modules
 Mbase_cmd  = import_relative('base_cmd', top_name='trepan')
 Mexcept    = import_relative('exception', '...', 'trepan')
+Mthread    = import_relative('thred', '...lib', 'trepan')
 
 class QuitCommand(Mbase_cmd.DebuggerCommand):
     """Gently exit the debugger and debugged program.
@@ -39,6 +40,7 @@ The program being debugged is exited raising a *DebuggerQuit* exception.
 
     name          = os.path.basename(__file__).split('.')[0]
     need_stack    = False
+    runs_program  = True
 
     def nothread_quit(self, arg):
         """ quit command when there's just one thread. """
@@ -56,7 +58,7 @@ The program being debugged is exited raising a *DebuggerQuit* exception.
         return False
 
     def run(self, cmd_hash):
-        threading_list = threading.enumerate()
+        threading_list = Mthread.debugged_threads()
         if (len(threading_list) == 1 and
             threading_list[0].getName() == 'MainThread'):
             # We just have a main thread so that's safe to quit
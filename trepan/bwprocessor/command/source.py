@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+#  Copyright (C) 2014 Rocky Bernstein
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import os, pyficache
+from import_relative import import_relative
+
+# Our local modules
+Mbase_cmd  = import_relative('base_cmd', top_name='trepan')
+Mstack     = import_relative('stack', '...lib', 'trepan')
+
+class SourceCommand(Mbase_cmd.DebuggerCommand):
+    """
+lines of a source file
+
+**Input Fields:**
+
+   { command  => 'source',
+     [filename => <file name>],
+     [start    => <line number>],
+     [end      => <line number>],
+   }
+
+The file defaults to that of the current frame. Without *start*, the
+lines around the current line are given; without *end*, 10 lines are
+given.
+
+**Output Fields:**
+
+   { name     => 'source',
+     filename => <file name>,
+     start    => <line number of the first line>,
+     lines    => [<line text without newline>, ...],
+     [errmsg  => <error-message-array>]
+     [msg     => <message-text array>]
+   }
+"""
+
+    name          = os.path.basename(__file__).split('.')[0]
+    need_stack    = False
+
+    def run(self, cmd_hash):
+        response = self.proc.response
+        filename = cmd_hash.get('filename')
+        start    = cmd_hash.get('start')
+        if filename is None or start is None:
+            if not self.proc.curframe:
+                response['errs'].append('No current frame; give a '
+                                        'filename and start.')
+                return False
+            if filename is None:
+                filename = Mstack.frame2file(self.core, self.proc.curframe)
+                pass
+            if start is None:
+                start = max(1, self.proc.curframe.f_lineno - 5)
+                pass
+            pass
+        end = cmd_hash.get('end', start + 9)
+        lines = pyficache.getlines(filename, {'output': 'plain'})
+        if lines is None:
+            response['errs'].append("Can't read source of %s." % filename)
+            return False
+        response['filename'] = filename
+        response['start']    = start
+        response['lines']    = [line.rstrip('\n')
+                                for line in lines[start-1:end]]
+        return False
+    pass
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+#  Copyright (C) 2014 Rocky Bernstein
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import os
+from import_relative import import_relative
+
+# Our local modules
+Mbase_cmd  = import_relative('base_cmd', top_name='trepan')
+Mstack     = import_relative('stack', '...lib', 'trepan')
+
+class StackCommand(Mbase_cmd.DebuggerCommand):
+    """
+call stack, newest frame first
+
+**Input Fields:**
+
+   { command  => 'stack',
+     [count   => <integer>],
+   }
+
+If *count* is given, only that many of the newest frames are given.
+
+**Output Fields:**
+
+   { name     => 'stack',
+     frames   => [{fn_name => <function name>,
+                   filename => <file name>,
+                   lineno => <line number>}, ...],
+     current  => <index in frames of the selected frame>,
+     [errmsg  => <error-message-array>]
+     [msg     => <message-text array>]
+   }
+"""
+
+    name          = os.path.basename(__file__).split('.')[0]
+    need_stack    = True
+
+    def run(self, cmd_hash):
+        frames = []
+        for frame, lineno in reversed(self.proc.stack):
+            frames.append({'fn_name':  frame.f_code.co_name,
+                           'filename': Mstack.frame2file(self.core, frame),
+                           'lineno':   lineno})
+            pass
+        count = cmd_hash.get('count')
+        if count is not None: frames = frames[:count]
+        self.proc.response['frames']  = frames
+        self.proc.response['current'] = \
+            len(self.proc.stack) - 1 - self.proc.curindex
+        return False
+    pass
@@ -44,6 +44,7 @@ is not given, 1 is used, i.e. stop at the next statement.
 
     name          = os.path.basename(__file__).split('.')[0]
     need_stack    = True
+    runs_program  = True
 
     def run(self, cmd_hash):
         
@@ -66,14 +66,14 @@ def format_location(proc_obj):
     return location
 
 def print_location(proc_obj, event=None):
-    response = proc_obj.response
-    response['name'] = 'status'
-    response['location'] = format_location(proc_obj)
+    """Send a 'status' event saying where we have stopped. Events
+    aren't responses to a request, so they have no *id*."""
+    response = {'name': 'status', 'location': format_location(proc_obj)}
     if event:
         response['event'] = event
         if event in ['return', 'exception']:
             val = proc_obj._saferepr(proc_obj.event_arg)
-            event['arg'] = val
+            response['arg'] = val
             pass
         pass
     proc_obj.intf[-1].msg(response)
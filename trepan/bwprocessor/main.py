@@ -149,7 +149,7 @@ class BWProcessor(Mprocessor.Processor):
 
         A negative number indexes from the other end."""
         if not self.curframe:
-            Mmsgs.errmsg(self, "No stack.")
+            Mmsg.errmsg(self, "No stack.")
             return
 
         # Below we remove any negativity. At the end, pos will be
@@ -163,10 +163,10 @@ class BWProcessor(Mprocessor.Processor):
             pos += self.curindex
 
         if pos < 0:
-            Mmsgs.errmsg(self, "Adjusting would put us beyond the oldest frame.")
+            Mmsg.errmsg(self, "Adjusting would put us beyond the oldest frame.")
             return
         elif pos >= len(self.stack):
-            Mmsgs.errmsg(self, "Adjusting would put us beyond the newest frame.")
+            Mmsg.errmsg(self, "Adjusting would put us beyond the newest frame.")
             return
 
         self.curindex = pos
@@ -232,7 +232,7 @@ class BWProcessor(Mprocessor.Processor):
                 exc_type_name = t
                 pass
             else: exc_type_name = t.__name__
-            Mmsgs.errmsg(self, str("%s: %s" % (exc_type_name, arg)))
+            Mmsg.errmsg(self, str("%s: %s" % (exc_type_name, arg)))
             raise
         return None # Not reached
 
@@ -255,7 +255,7 @@ class BWProcessor(Mprocessor.Processor):
             if type(t) == types.StringType:
                 exc_type_name = t
             else: exc_type_name = t.__name__
-            Mmsgs.errmsg(self, '%s: %s' % (str(exc_type_name), str(v)))
+            Mmsg.errmsg(self, '%s: %s' % (str(exc_type_name), str(v)))
             pass
         return
 
@@ -268,13 +268,12 @@ class BWProcessor(Mprocessor.Processor):
             if not (self.core.execution_status in cmd_obj.execution_set):
                 part1 = ("Command '%s' is not available for execution status:"
                          % name)
-                Mmsgs.errmsg(self, Mmisc.wrapped_lines(part1, self.core.execution_status,
+                Mmsg.errmsg(self, Mmisc.wrapped_lines(part1, self.core.execution_status,
                                                 self.debugger.settings['width']))
                 return False
             pass
         if self.frame is None and cmd_obj.need_stack:
-            self.intf[-1].errmsg("Command '%s' needs an execution stack."
-                                 % name)
+            Mmsg.errmsg(self, "Command '%s' needs an execution stack." % name)
             return False
         return True
 
@@ -316,7 +315,9 @@ class BWProcessor(Mprocessor.Processor):
         return run_hooks(self, self.postcmd_hooks)
 
     def process_command(self):
-        # process command
+        """Read a request and send the response. A request's *id*, if
+        it has one, is copied into its response, so a front end can
+        send several requests before reading any responses."""
         self.response = {'errs':[], 'msg':[]}
         cmd_hash = self.intf[-1].read_command()
 
@@ -326,6 +327,9 @@ class BWProcessor(Mprocessor.Processor):
                         {'set_name': True})
             self.intf[-1].msg(self.response)
             return False
+        if 'id' in cmd_hash:
+            self.response['id'] = cmd_hash['id']
+            pass
         if 'command' not in cmd_hash:
             Mmsg.errmsg(self,
                         "invalid input, expecting a 'command' key: %s" %
@@ -334,16 +338,22 @@ class BWProcessor(Mprocessor.Processor):
             self.intf[-1].msg(self.response)
             return False
 
+        result = self.run_request(cmd_hash)
+        self.intf[-1].msg(self.response)
+        return result
+
+    def run_request(self, cmd_hash):
+        """Run the command named in *cmd_hash*, filling in
+        self.response but not sending it. The command's result is
+        returned: True means leave the command loop."""
         self.cmd_name = cmd_hash['command']
         cmd_name = resolve_name(self, self.cmd_name)
         if cmd_name:
             cmd_obj = self.commands[cmd_name]
+            self.response['name'] = cmd_name
             if self.ok_for_running(cmd_obj, cmd_name, cmd_hash):
                 try:
-                    self.response['name'] = cmd_name
-                    result = cmd_obj.run(cmd_hash)
-                    self.intf[-1].msg(self.response)
-                    if result: return result
+                    return cmd_obj.run(cmd_hash)
                 except (Mexcept.DebuggerQuit,
                         Mexcept.DebuggerRestart, SystemExit):
                     # Let these exceptions propagate through
@@ -353,9 +363,8 @@ class BWProcessor(Mprocessor.Processor):
                                 traceback.format_exc())
                     pass
                 pass
-            else:
-                self.undefined_cmd(args)
-                pass
+        else:
+            self.undefined_cmd(self.cmd_name)
             pass
         return False
 
@@ -404,7 +413,8 @@ class BWProcessor(Mprocessor.Processor):
 
     def undefined_cmd(self, cmd):
         """Error message when a command doesn't exist"""
-        Mmsg.errmsg(self, 'Undefined command: "%s". Try "help".' % cmd)
+        Mmsg.errmsg(self, 'Undefined command: "%s".' % cmd,
+                    {'set_name': True})
         return
 
     def _populate_commands(self):
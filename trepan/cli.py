@@ -32,8 +32,10 @@ Mclifns    = import_relative('clifns',    '.',   package)
 Mdebugger  = import_relative('debugger',  '.',   package)
 Mexcept    = import_relative('exception', '..trepan')
 Moptions   = import_relative('options',   '.',   package)
+Mpost_mortem = import_relative('post_mortem', '.', package)
 Mserver    = import_relative('server', '.interfaces', package)
 Mfile      = import_relative('file',   '.lib',   package)
+Mtracelines = import_relative('tracelines', '.lib', package)
 Mmisc      = import_relative('misc',   '.',      package)
 
 # The name of the debugger we are currently going by.
@@ -54,13 +56,20 @@ def main(dbg=None, sys_argv=list(sys.argv)):
                                                          sys_argv)
 
     if opts.server:
-        connection_opts={'IO': 'TCP', 'PORT': opts.port}
+        connection_opts={'IO': 'TCP', 'PORT': opts.port,
+                         'multi': opts.multi_client}
+        if opts.socket:
+            connection_opts['IO'] = 'UNIX'
+            connection_opts['SOCKET'] = opts.socket
+            pass
         intf = Mserver.ServerInterface(connection_opts=connection_opts)
         dbg_opts['interface'] = intf
         if 'FIFO' == intf.server_type:
             print('Starting FIFO server for process %s.' % os.getpid())
         elif 'TCP' == intf.server_type:
             print('Starting TCP server listening on port %s.' % intf.inout.PORT)
+        elif 'UNIX' == intf.server_type:
+            print('Starting server listening on socket %s.' % intf.inout.path)
             pass
     elif opts.client:
         Mclient.main(opts, sys_argv)
@@ -74,6 +83,10 @@ def main(dbg=None, sys_argv=list(sys.argv)):
         pass
     Moptions._postprocess_options(dbg, opts)
 
+    if opts.core:
+        Mpost_mortem.post_mortem_core(opts.core, dbg)
+        return
+
     # process_options has munged sys.argv to remove any options that
     # options that belong to this debugger. The original options to
     # invoke the debugger and script are in global sys_argv
@@ -112,6 +125,11 @@ def main(dbg=None, sys_argv=list(sys.argv)):
         # module search path.
         sys.path[0] = dbg.main_dirname = os.path.dirname(mainpyfile)
 
+        # Work out breakpoint line numbers for the program's files
+        # while it starts up. This has to happen before debugging
+        # starts so we don't trace the thread doing this.
+        Mtracelines.start_prefill(dbg.main_dirname)
+
     # XXX If a signal has been received we continue in the loop, otherwise
     # the loop exits for some reason.
     dbg.sig_received = False
@@ -17,7 +17,7 @@
 #    Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
 #    02110-1301 USA.
 
-import os, sys, time
+import os, socket, sys, time
 # Our local modules
 from import_relative import import_relative
 Mmisc = import_relative('misc', '.', 'trepan')
@@ -58,6 +58,10 @@ def process_options(pkg_version, sys_argv, option_list=None):
     optparser.add_option("--pid", dest="pid", default=0,
                          action="store", type='int', metavar='NUMBER',
                          help="Use PID to get FIFO names for out-of-process connections.")
+    optparser.add_option("--socket", dest="socket", default=None,
+                         action="store", type='string', metavar='PATH',
+                         help="Connect to the UNIX-domain socket PATH "
+                         "rather than to a TCP port.")
 
     optparser.disable_interspersed_args()
 
@@ -74,13 +78,49 @@ def process_options(pkg_version, sys_argv, option_list=None):
 #DEFAULT_CLIENT_CONNECTION_OPTS = {'open': True, 'IO': 'FIFO'}
 DEFAULT_CLIENT_CONNECTION_OPTS = {'open': True, 'IO': 'TCP',
                                   'HOST': '127.0.0.1', 'PORT': 1027}
+
+# How often, and how many seconds apart, we try to get back a lost
+# connection.
+RECONNECT_TRIES = 30
+RECONNECT_DELAY = 1
+
+def reconnect(intf, connection_opts):
+    """Try to resume our session after the connection to the server
+    was lost. Return True if we did."""
+    if not intf.session or connection_opts['IO'] not in ('TCP', 'UNIX'):
+        return False
+    print('Connection lost. Reconnecting...')
+    for i in range(RECONNECT_TRIES):
+        time.sleep(RECONNECT_DELAY)
+        try:
+            intf.reconnect()
+            return True
+        except IOError:
+            pass
+        pass
+    print('Gave up.')
+    return False
+
+def reply(intf, msg):
+    """Send *msg* in reply to a prompt. If the connection has been
+    lost, we find that out at the next read."""
+    try:
+        intf.write_remote(Mcomcodes.CONFIRM_REPLY, msg)
+    except socket.error:
+        pass
+    return
+
 def start_client(connection_opts):
       intf = Mclient.ClientInterface(connection_opts=connection_opts)
       # debugger.interface.append(intf)
       intf.msg("Connected.")
       done=False
       while not done:
-            control, remote_msg = intf.read_remote()
+            try:
+                control, remote_msg = intf.read_remote()
+            except EOFError:
+                if reconnect(intf, connection_opts): continue
+                break
             # print 'c, r', control, remote_msg
             if Mcomcodes.PRINT == control:
                 print remote_msg,
@@ -92,23 +132,24 @@ def start_client(connection_opts):
                 else:
                     msg='N'
                     pass
-                intf.write_remote(Mcomcodes.CONFIRM_REPLY, msg)
+                reply(intf, msg)
                 pass
             elif Mcomcodes.PROMPT == control:
                 msg = intf.read_command('(trepan2*) ').strip()
-                intf.write_remote(Mcomcodes.CONFIRM_REPLY, msg)
+                reply(intf, msg)
             elif Mcomcodes.QUIT == control:
                 print('Quitting...')
                 done = True
                 break
             elif Mcomcodes.RESTART == control:
-                # FIXME need to save stuff like port # and
-                # and for FIFO we need new pid.
-                if 'TCP' == connection_opts['IO']:
+                # FIXME: for FIFO we need new pid. Sockets are opened
+                # again where they were before.
+                if connection_opts['IO'] in ('TCP', 'UNIX'):
                     print('Restarting...')
                     intf.inout.close()
                     time.sleep(1)
                     intf.inout.open()
+                    intf.handshake()
                 else:
                     print("Don't know how to hard-restart FIFO...")
                     done=True
@@ -124,8 +165,11 @@ def start_client(connection_opts):
 
 def main(opts, sys_argv):
     # print(opts)
-    if opts.pid > 0:
+    # trepan2 --client has no --pid option.
+    if getattr(opts, 'pid', 0) > 0:
         remote_opts = {'open': opts.pid, 'IO': 'FIFO'}
+    elif getattr(opts, 'socket', None):
+        remote_opts = {'open': True, 'IO': 'UNIX', 'SOCKET': opts.socket}
     else:
         remote_opts = {'open': True, 'IO': 'TCP', 'PORT': opts.port,
                        'HOST': opts.host}
@@ -43,7 +43,7 @@ Mmisc     = import_relative('misc', '.')
 Msig      = import_relative('sighandler', '.lib')
 
 # Common Python packages
-import sys, types
+import sys, threading, types
 
 # External Egg packages
 import tracer, tracefilter
@@ -330,12 +330,30 @@ class Debugger:
 
         self.sigmgr = Msig.SignalManager(self)
 
+        # Functions run with this debugger after detach()
+        self.detach_hooks = []
+
         # Were we requested to activate immediately?
         if get_option('activate'):
             self.core.start(get_option('start_opts'))
             pass
         return
 
+    def detach(self):
+        """Let the program run on as if we had never been there: stop
+        tracing and put back the signal handlers we changed. Threads
+        other than this one stop tracing at their next event."""
+        self.core.stop({'remove': True})
+        threading.settrace(None)
+        if threading.activeCount() > 1:
+            tracer.add_hook(Mcore.untrace_thread, {'backlevel': None})
+            pass
+        self.sigmgr.restore()
+        for hook in self.detach_hooks:
+            hook(self)
+            pass
+        return
+
     def complete(self, last_token, state):
         if hasattr(self.core.processor, 'completer'):
             str = get_line_buffer() or last_token
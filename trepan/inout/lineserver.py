@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+#   Copyright (C) 2014 Rocky Bernstein <rocky@gnu.org>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Debugger server Input/Output of plain lines over a TCP or
+UNIX-domain socket.
+
+TCPServer frames each message for our own client. Front ends written
+in other languages find newline-terminated text easier, so this is
+what the bullwinkle processor uses: one request or response per line.
+A client may send any number of lines without waiting for replies.
+"""
+
+import os, socket
+
+from import_relative import import_relative
+Mbase       = import_relative('base', top_name='trepan')
+Mdefault    = import_relative('default', '..lib', top_name='trepan')
+Mmisc       = import_relative('misc', '..', 'trepan')
+Mtcpfns     = import_relative('tcpfns', '.', 'trepan')
+Munixserver = import_relative('unixserver', '.', 'trepan')
+
+class LineServer(Mbase.DebuggerInOutBase):
+    """Debugger Server Input/Output of lines over a socket."""
+
+    DEFAULT_INIT_OPTS = {'open': True, 'IO': 'TCP'}
+
+    # Requests can read any file the debugger can, so by default only
+    # local clients may connect. A HOST of None means all interfaces.
+    DEFAULT_OPEN_OPTS = dict(Mdefault.SERVER_SOCKET_OPTS, HOST='127.0.0.1')
+
+    def __init__(self, inout=None, opts=None):
+        get_option = lambda key: Mmisc.option_set(opts, key,
+                                                  self.DEFAULT_INIT_OPTS)
+        self.inout = None
+        self.conn  = None
+        self.buf   = ''    # Received but not yet read
+        self.state = 'disconnected'
+        self.PORT  = None
+        self.path  = None  # UNIX-domain socket, if that is used
+        if inout:
+            self.inout = inout
+        elif get_option('open'):
+            self.open(opts)
+            pass
+        return
+
+    def close(self):
+        """ Closes the connection and stops listening. """
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+            pass
+        if self.inout:
+            self.inout.close()
+            self.inout = None
+            pass
+        if self.path and os.path.exists(self.path):
+            os.unlink(self.path)
+            pass
+        self.path  = None
+        self.state = 'disconnected'
+        return
+
+    def flush(self):
+        return
+
+    def open(self, opts=None):
+        get_option = lambda key: Mmisc.option_set(opts, key,
+                                                  self.DEFAULT_OPEN_OPTS)
+        io_type = Mmisc.option_set(opts, 'IO', self.DEFAULT_INIT_OPTS)
+        if 'UNIX' == io_type:
+            path = get_option('SOCKET') or Munixserver.default_path()
+            self.inout = Munixserver.listen(path)
+            self.path  = path
+        else:
+            self.PORT  = get_option('PORT')
+            self.inout = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            if get_option('reuse'):
+                self.inout.setsockopt(socket.SOL_SOCKET,
+                                      socket.SO_REUSEADDR, 1)
+                pass
+            try:
+                self.inout.bind((get_option('HOST') or '', self.PORT))
+            except socket.error:
+                self.inout.close()
+                self.inout = None
+                raise IOError('could not open server socket on port %s' %
+                              self.PORT)
+            self.inout.listen(1)
+            if 0 == self.PORT: self.PORT = self.inout.getsockname()[1]
+            pass
+        self.state = 'listening'
+        return
+
+    def readline(self, prompt='', add_to_history=False):
+        """Return the next line, without its newline. There is no
+        prompt: the other end is a program. EOFError is raised when
+        the client disconnects."""
+        if self.state != 'connected':
+            self.wait_for_connect()
+            pass
+        while '\n' not in self.buf:
+            data = self.conn.recv(Mtcpfns.TCP_MAX_PACKET)
+            if not data:
+                self.conn.close()
+                self.conn  = None
+                self.state = 'listening'
+                raise EOFError
+            self.buf += data
+            pass
+        line, self.buf = self.buf.split('\n', 1)
+        return line.rstrip('\r')
+
+    def wait_for_connect(self):
+        self.conn, addr = self.inout.accept()
+        self.buf   = ''
+        self.state = 'connected'
+        return
+
+    def write(self, msg):
+        if self.state != 'connected':
+            self.wait_for_connect()
+            pass
+        if isinstance(msg, unicode): msg = msg.encode('utf-8')
+        self.conn.sendall(msg)
+        return
+    pass
+
+# Demo
+if __name__=='__main__':
+    import sys
+    inout = LineServer(opts={'open': False})
+    if len(sys.argv) > 1:
+        inout.open({'PORT': int(sys.argv[1])})
+        print('Listening on port %s...' % inout.PORT)
+        while True:
+            try:
+                line = inout.readline()
+            except EOFError:
+                break
+            print(line)
+            inout.writeline('ack: ' + line)
+            pass
+        pass
+    inout.close()
+    pass
@@ -34,6 +34,10 @@ class TCPClient(Mbase.DebuggerInOutBase):
         self.buf       = ''
         self.line_edit = False # Our name for GNU readline capability
         self.state     = 'disconnected'
+        self.wire_version = 1  # Raised when the server says it can
+        self.wire_features = set() # Those the server and we agreed on
+        self.HOST      = None
+        self.PORT      = None
         if inout:
             self.inout = inout
         elif get_option('open'):
@@ -54,9 +58,17 @@ class TCPClient(Mbase.DebuggerInOutBase):
        get_option = lambda key: Mmisc.option_set(opts, key,
                                                  Mdefault.CLIENT_SOCKET_OPTS)
 
-       HOST = get_option('HOST')
-       PORT = get_option('PORT')
+       if opts is not None or self.PORT is None:
+           # Kept so that a reconnect or restart goes to the same
+           # server.
+           self.HOST = get_option('HOST')
+           self.PORT = get_option('PORT')
+           pass
+       HOST, PORT = self.HOST, self.PORT
        self.inout = None
+       self.buf   = ''
+       self.wire_version = 1
+       self.wire_features = set()
        for res in socket.getaddrinfo(HOST, PORT, socket.AF_UNSPEC,
                                      socket.SOCK_STREAM):
            af, socktype, proto, canonname, sa = res
@@ -87,21 +99,19 @@ class TCPClient(Mbase.DebuggerInOutBase):
         EOFError will be raised on EOF.
         """
         if self.state == 'connected':
-            if 0 == len(self.buf):
-                self.buf = self.inout.recv(Mtcpfns.TCP_MAX_PACKET)
-                if 0 == (self.buf):
-                    self.state = 'disconnected'
-                    raise EOFError
-                pass
-            self.buf, data = Mtcpfns.unpack_msg(self.buf)
+            try:
+                self.buf, data = Mtcpfns.read_msg(self.inout, self.buf)
+            except EOFError:
+                self.state = 'disconnected'
+                raise
             return data
         else:
             raise IOError("read_msg called in state: %s." % self.state)
 
     def write(self, msg):
         """ This method the debugger uses to write a message unit."""
-        # FIXME: do we have to check the size of msg and split output?
-        return self.inout.send(Mtcpfns.pack_msg(msg))
+        return self.inout.sendall(Mtcpfns.pack_msg(
+            msg, self.wire_version, 'compress' in self.wire_features))
 
     pass
 
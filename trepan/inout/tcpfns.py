@@ -13,22 +13,189 @@
 #
 #   You should have received a copy of the GNU General Public License
 #   along with this program.  If not, see <http://www.gnu.org/licenses/>.
-"""Subsidiary routines used to "pack" and "unpack" TCP messages. """
+"""Subsidiary routines used to "pack" and "unpack" TCP messages.
+
+There are two wire formats. Version 1 frames start with the message
+length as 4 decimal digits, so a message can't be longer than 9,999
+bytes. Version 2 frames start with V2_MARK and then the length as a
+4-byte big-endian number. V2_MARK can't start a version 1 frame, so a
+reader takes either kind at any time. A writer sends version 2 only
+after the other end has said it understands it; see WIRE_HELLO.
+
+Version 3 frames are version 2 frames, except that a message of
+COMPRESS_MIN bytes or more may be sent compressed with zlib. The top
+bit of the length, V3_COMPRESSED, marks such a frame; the length is
+then that of the compressed data.
+
+Version 4 frames are version 3 frames. A client that asks for version
+4 also keeps the source text the server sends it, by its SHA1, so the
+server may send it references to source lines rather than the lines
+themselves.
+
+Compression and source references are features, which the two ends
+agree on separately; see WIRE_FEATURES and hello().
+"""
+import struct, zlib
 
 TCP_MAX_PACKET = 8192 # Largest size for a recv
 LOG_MAX_MSG    = 4    # int(log(TCP_MAX_PACKET)
-def pack_msg(msg):
+V1_MAX_MSG     = 10 ** LOG_MAX_MSG - 1
+
+V2_MARK        = '\xff'
+V2_LENGTH      = struct.Struct('!I')
+V2_HEADER_SIZE = len(V2_MARK) + V2_LENGTH.size
+
+V3_COMPRESSED  = 0x80000000
+COMPRESS_MIN   = 512  # Smaller messages aren't worth compressing
+COMPRESS_LEVEL = 1    # Fastest; most of the gain is in the first level
+
+# The newest wire format we know.
+WIRE_VERSION = 4
+
+# A client sends WIRE_HELLO followed by its WIRE_VERSION as a SYNC
+# message when the server first prompts it. A server that knows about
+# versions replies with the same message giving the version the two
+# will use. Older servers see a comment and prompt again.
+WIRE_HELLO = '#wire '
+
+# The features that come with each wire version. A hello may list the
+# ones wanted after the version; without a list, it is all of them.
+WIRE_FEATURES = {3: ('compress',), 4: ('source',)}
+
+# Once its hello is answered, a client sends SESSION_HELLO as a SYNC
+# message, followed by the token and message count of the session it
+# is resuming, if any. The server replies with SESSION_HELLO, the
+# token of its session, and the count of messages the client has been
+# sent. See ServerInterface.
+SESSION_HELLO = '#session'
+
+def pack_msg(msg, version=1, compress=None):
+    """Return *msg* framed in wire format *version*.
+
+    A version 1 frame can't hold more than V1_MAX_MSG bytes. A longer
+    message is sent as several frames, each starting with the first
+    character of *msg*, which is its control code. Unicode is sent as
+    UTF-8.
+
+    In version 3 a message of COMPRESS_MIN bytes or more is compressed
+    if that makes it smaller, unless *compress* is False.
+    """
+    if isinstance(msg, unicode): msg = msg.encode('utf-8')
+    if compress is None: compress = version >= 3
+    if compress and version >= 3 and len(msg) >= COMPRESS_MIN:
+        packed = zlib.compress(msg, COMPRESS_LEVEL)
+        if len(packed) < len(msg):
+            return (V2_MARK + V2_LENGTH.pack(len(packed) | V3_COMPRESSED) +
+                    packed)
+        pass
+    if version >= 2:
+        return V2_MARK + V2_LENGTH.pack(len(msg)) + msg
     fmt = '%%0%dd' % LOG_MAX_MSG # A funny way of writing: '%04d'
-    return ( fmt % len(msg)) + msg
+    if len(msg) <= V1_MAX_MSG:
+        return ( fmt % len(msg)) + msg
+    code, msg = msg[0], msg[1:]
+    size = V1_MAX_MSG - 1
+    frames = []
+    for i in range(0, len(msg), size):
+        chunk = code + msg[i:i+size]
+        frames.append((fmt % len(chunk)) + chunk)
+        pass
+    return ''.join(frames)
 
 def unpack_msg(buf):
-    length  = int(buf[0:LOG_MAX_MSG])
-    data    = buf[LOG_MAX_MSG:LOG_MAX_MSG+length]
-    buf     = buf[LOG_MAX_MSG+length:]
-    return buf, data
+    """Split the first frame off of *buf*. Return the rest of *buf* and
+    the message in that frame, or *buf* and None if the frame hasn't
+    all arrived yet. Compressed messages are returned uncompressed."""
+    compressed = False
+    if buf[:len(V2_MARK)] == V2_MARK:
+        if len(buf) < V2_HEADER_SIZE: return buf, None
+        length = V2_LENGTH.unpack(buf[len(V2_MARK):V2_HEADER_SIZE])[0]
+        start  = V2_HEADER_SIZE
+        if length & V3_COMPRESSED:
+            length &= ~V3_COMPRESSED
+            compressed = True
+            pass
+    else:
+        if len(buf) < LOG_MAX_MSG: return buf, None
+        length = int(buf[0:LOG_MAX_MSG])
+        start  = LOG_MAX_MSG
+        pass
+    if len(buf) < start + length: return buf, None
+    msg = buf[start:start+length]
+    if compressed: msg = zlib.decompress(msg)
+    return buf[start+length:], msg
+
+def read_msg(sock, buf):
+    """Read a message from socket *sock*, with *buf* holding whatever
+    was received after the last message. Return the new *buf* and the
+    message. EOFError is raised if the connection closes first."""
+    while True:
+        buf, data = unpack_msg(buf)
+        if data is not None: return buf, data
+        more = sock.recv(TCP_MAX_PACKET)
+        if 0 == len(more):
+            raise EOFError
+        buf += more
+        pass
+    return
+
+def wire_features(version):
+    """Return the set of features of wire format *version*."""
+    features = set()
+    for v, names in WIRE_FEATURES.items():
+        if v <= version: features.update(names)
+        pass
+    return features
+
+def hello(version, features):
+    """Return a hello asking for wire format *version* with
+    *features*. The features are only listed when they aren't all
+    those of the version, so that servers that know nothing of them
+    still understand the usual hello."""
+    if not features: version = min(version, 2)
+    msg = WIRE_HELLO + str(version)
+    if set(features) != wire_features(version):
+        msg += ' ' + ' '.join(sorted(features))
+        pass
+    return msg
+
+def hello_args(msg):
+    """If *msg* is a wire-version hello, return the version it gives
+    and the set of features, of those the version has, that it lists;
+    otherwise return None."""
+    if not msg.startswith(WIRE_HELLO): return None
+    args = msg[len(WIRE_HELLO):].split()
+    try:
+        version = int(args[0])
+    except (IndexError, ValueError):
+        return None
+    features = wire_features(version)
+    if args[1:]: features &= set(args[1:])
+    return version, features
+
+def hello_version(msg):
+    """If *msg* is a wire-version hello, return the version it gives;
+    otherwise return None."""
+    args = hello_args(msg)
+    if args is None: return None
+    return args[0]
+
+def session_args(msg):
+    """If *msg* is a session hello, return the list of what follows
+    SESSION_HELLO; otherwise return None."""
+    args = msg.split()
+    if not args or args[0] != SESSION_HELLO: return None
+    return args[1:]
 
 # Demo
 if __name__=='__main__':
     msg = "Hi there!"
     assert unpack_msg(pack_msg(msg))[1] == msg
+    big = '.' + 'x' * 100000
+    assert unpack_msg(pack_msg(big, 2))[1] == big
+    assert unpack_msg(pack_msg(big, 2)[:-1])[1] is None
+    assert unpack_msg(pack_msg(big, 3))[1] == big
+    print('%d bytes sent as %d' % (len(big), len(pack_msg(big, 3))))
+    print(hello_version(WIRE_HELLO + '2'))
+    print(hello_args(hello(4, ['compress'])))
     pass
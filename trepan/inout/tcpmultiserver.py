@@ -0,0 +1,445 @@
+# -*- coding: utf-8 -*-
+#   Copyright (C) 2014 Rocky Bernstein <rocky@gnu.org>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Debugger server Input/Output for several clients.
+
+Unlike TCPServer, nothing here waits for a client. A background
+thread accepts connections and moves data with select(). The first
+client to connect, or the first after it leaves, controls the
+debugger: its messages are what read_msg() returns. Later clients are
+observers. They get the messages whose control code is in
+*broadcast_codes*, and anything sent with observe(), but what they
+send is ignored.
+
+With option SOCKET set, the server listens on a UNIX-domain socket of
+that name rather than on a TCP port.
+
+Writes are queued and sent by the background thread, so a slow
+client never holds up the debugged program. An observer that falls
+more than MAX_BACKLOG bytes behind is dropped.
+"""
+
+import os, Queue, select, socket, sys, threading, time
+
+from import_relative import import_relative
+Mbase    = import_relative('base', top_name='trepan')
+Mdefault = import_relative('default', '..lib', top_name='trepan')
+Mmisc    = import_relative('misc', '..', 'trepan')
+Mtcpfns  = import_relative('tcpfns', '.', 'trepan')
+Munixserver = import_relative('unixserver', '.', 'trepan')
+
+MAX_BACKLOG = 1 << 20
+
+# Name of the thread which accepts and services connections.
+THREAD_NAME = 'trepan-server'
+
+class Connection:
+    """A client connection of a TCPMultiServer."""
+    def __init__(self, sock, addr):
+        self.sock    = sock
+        self.addr    = addr
+        self.inbuf   = ''  # Received but not yet unpacked
+        self.outbuf  = ''  # Waiting to be sent
+        self.wire_version = 1
+        self.wire_features = set()
+        self.messages = Queue.Queue() # Messages read; None at EOF
+        self.closed   = False
+        return
+
+    def __str__(self):
+        if not isinstance(self.addr, tuple):
+            # UNIX-domain clients have no address.
+            return 'local'
+        return '%s:%s' % self.addr[:2]
+    pass
+
+class TCPMultiServer(Mbase.DebuggerInOutBase):
+    """Debugger server Input/Output sockets for a controlling client
+    and any number of observers."""
+
+    DEFAULT_INIT_OPTS = {'open': True}
+    def __init__(self, inout=None, opts=None):
+        get_option = lambda key: Mmisc.option_set(opts, key,
+                                                  self.DEFAULT_INIT_OPTS)
+        self.inout      = None  # Listening socket
+        self.controller = None  # Connection of the controlling client
+        self.reading    = None  # Connection read_msg() reads from
+        self.observers  = []    # Connections of the other clients
+        self.state      = 'disconnected'
+        self.PORT       = None
+        self.HOST       = None
+        self.path       = None  # UNIX-domain socket, if that is used
+        self.thread     = None
+        self.lock       = threading.RLock()
+        self.connected  = threading.Event() # Set while there's a controller
+        self.closing    = False
+        self.wakeup     = None  # Pipe to interrupt select()
+
+        # Messages whose control code is in here go to observers too.
+        self.broadcast_codes = ()
+
+        # Functions run, in the server thread, with a new connection
+        # and whether it controls the debugger.
+        self.connect_hooks = []
+        if inout:
+            self.inout = inout
+        elif get_option('open'):
+            self.open(opts)
+            pass
+        return
+
+    def close(self):
+        """Send what is waiting to be sent, for a few seconds at most,
+        then close all connections and stop listening."""
+        if self.thread:
+            end = time.time() + 5
+            while time.time() < end and self.backlog():
+                time.sleep(0.05)
+                pass
+            self.closing = True
+            self.wake()
+            if self.thread is not threading.currentThread():
+                self.thread.join()
+                pass
+            self.thread = None
+            pass
+        self.lock.acquire()
+        try:
+            for conn in self.connections():
+                conn.sock.close()
+                pass
+            self.controller = None
+            self.reading    = None
+            self.observers  = []
+            self.connected.clear()
+            if self.inout:
+                self.inout.close()
+                self.inout = None
+                pass
+            if self.path and os.path.exists(self.path):
+                os.unlink(self.path)
+                pass
+            self.path = None
+            if self.wakeup:
+                for fd in self.wakeup: os.close(fd)
+                self.wakeup = None
+                pass
+            self.state = 'disconnected'
+        finally:
+            self.lock.release()
+            pass
+        return
+
+    def open(self, opts=None):
+        get_option = lambda key: Mmisc.option_set(opts, key,
+                                                  Mdefault.SERVER_SOCKET_OPTS)
+
+        self.HOST = get_option('HOST')
+        self.PORT = get_option('PORT')
+        if get_option('SOCKET'):
+            self.inout = Munixserver.listen(get_option('SOCKET'), 5)
+            self.path  = get_option('SOCKET')
+        else:
+            self.inout = self.listen_tcp(get_option('reuse'))
+            pass
+        self.inout.setblocking(0)
+        self.wakeup  = os.pipe()
+        self.closing = False
+        self.state   = 'listening'
+        self.thread  = threading.Thread(target=self.serve, name=THREAD_NAME)
+        self.thread.setDaemon(True)
+        self.thread.start()
+        return
+
+    def listen_tcp(self, reuse):
+        sock = None
+        for res in socket.getaddrinfo(self.HOST, self.PORT, socket.AF_UNSPEC,
+                                      socket.SOCK_STREAM, 0, socket.AI_PASSIVE):
+            af, socktype, proto, canonname, sa = res
+            try:
+                sock = socket.socket(af, socktype, proto)
+            except socket.error:
+                sock = None
+                continue
+            try:
+                if reuse:
+                    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+                    pass
+                sock.bind(sa)
+                sock.listen(5)
+            except socket.error:
+                sock.close()
+                sock = None
+                continue
+            break
+        if sock is None:
+            raise IOError('could not open server socket on port %s' %
+                            self.PORT)
+        if 0 == self.PORT: self.PORT = sock.getsockname()[1]
+        return sock
+
+    def backlog(self):
+        """Return the number of bytes waiting to be sent."""
+        self.lock.acquire()
+        try:
+            return sum([len(conn.outbuf) for conn in self.connections()])
+        finally:
+            self.lock.release()
+            pass
+        return
+
+    def connections(self):
+        if self.controller:
+            return [self.controller] + self.observers
+        return list(self.observers)
+
+    def observe(self, msg):
+        """Send *msg* to the observers only."""
+        self.lock.acquire()
+        try:
+            for conn in self.observers:
+                self.queue(conn, msg)
+                pass
+        finally:
+            self.lock.release()
+            pass
+        self.wake()
+        return
+
+    def queue(self, conn, msg):
+        """Add *msg* to what is to be sent to *conn*. Call this with
+        *lock* held."""
+        conn.outbuf += Mtcpfns.pack_msg(msg, conn.wire_version,
+                                        'compress' in conn.wire_features)
+        if conn is not self.controller and len(conn.outbuf) > MAX_BACKLOG:
+            # Too far behind. The server thread drops it.
+            conn.outbuf = ''
+            conn.closed = True
+            pass
+        return
+
+    def read_msg(self):
+        """Read a message from the controlling client, waiting for one
+        to connect if need be. EOFError is raised if it disconnects."""
+        if self.state == 'disconnected':
+            raise IOError("read_msg called in state: %s." % self.state)
+        # A controller that has left is read from until its EOF, even
+        # if another has connected since.
+        conn = self.reading
+        while conn is None:
+            # A timeout lets KeyboardInterrupt in.
+            self.connected.wait(1)
+            conn = self.reading = self.controller
+            pass
+        while True:
+            try:
+                msg = conn.messages.get(True, 1)
+                break
+            except Queue.Empty:
+                pass
+            pass
+        if msg is None:
+            self.reading = None
+            raise EOFError
+        return msg
+
+    def send_to(self, conn, msg):
+        """Send *msg* to connection *conn* only."""
+        self.lock.acquire()
+        try:
+            self.queue(conn, msg)
+        finally:
+            self.lock.release()
+            pass
+        self.wake()
+        return
+
+    def wake(self):
+        """Have the server thread look again at what there is to do."""
+        if self.wakeup:
+            try:
+                os.write(self.wakeup[1], 'x')
+            except OSError:
+                pass
+            pass
+        return
+
+    def write(self, msg):
+        """Send *msg* to the controlling client, and to the observers
+        if its control code is in *broadcast_codes*. Nothing is sent if
+        there is nobody to send it to."""
+        if isinstance(msg, unicode): msg = msg.encode('utf-8')
+        self.lock.acquire()
+        try:
+            if self.controller:
+                self.queue(self.controller, msg)
+                pass
+            if msg[:1] in self.broadcast_codes:
+                for conn in self.observers:
+                    self.queue(conn, msg)
+                    pass
+                pass
+        finally:
+            self.lock.release()
+            pass
+        self.wake()
+        return
+
+    # The rest is run in the server thread.
+
+    def serve(self):
+        # We don't want to trace ourself.
+        sys.settrace(None)
+        while not self.closing:
+            self.lock.acquire()
+            try:
+                conns = dict([(conn.sock, conn)
+                              for conn in self.connections()])
+                writers = [sock for sock, conn in conns.items()
+                           if conn.outbuf]
+            finally:
+                self.lock.release()
+                pass
+            try:
+                readable, writable, errors = \
+                    select.select([self.inout, self.wakeup[0]] + conns.keys(),
+                                  writers, [])
+            except select.error:
+                continue
+            for sock in writable:
+                self.send_some(conns[sock])
+                pass
+            for sock in readable:
+                if sock is self.inout:
+                    self.accept()
+                elif sock == self.wakeup[0]:
+                    os.read(self.wakeup[0], 4096)
+                elif not conns[sock].closed:
+                    self.receive(conns[sock])
+                    pass
+                pass
+            for conn in conns.values():
+                if conn.closed: self.drop(conn)
+                pass
+            pass
+        return
+
+    def accept(self):
+        try:
+            sock, addr = self.inout.accept()
+        except socket.error:
+            return
+        sock.setblocking(0)
+        conn = Connection(sock, addr)
+        self.lock.acquire()
+        try:
+            is_controller = self.controller is None
+            if is_controller:
+                self.controller = conn
+                self.state = 'connected'
+                self.connected.set()
+            else:
+                self.observers.append(conn)
+                pass
+        finally:
+            self.lock.release()
+            pass
+        for hook in self.connect_hooks:
+            hook(conn, is_controller)
+            pass
+        return
+
+    def drop(self, conn):
+        """Forget connection *conn*. If it was the controlling client,
+        the debugger gets EOF."""
+        conn.closed = True
+        self.lock.acquire()
+        try:
+            if conn is self.controller:
+                self.controller = None
+                self.state = 'listening'
+                self.connected.clear()
+            elif conn in self.observers:
+                self.observers.remove(conn)
+                pass
+        finally:
+            self.lock.release()
+            pass
+        conn.messages.put(None)
+        conn.sock.close()
+        return
+
+    def receive(self, conn):
+        try:
+            data = conn.sock.recv(Mtcpfns.TCP_MAX_PACKET)
+        except socket.error:
+            data = ''
+            pass
+        if not data:
+            conn.closed = True
+            return
+        conn.inbuf += data
+        while True:
+            conn.inbuf, msg = Mtcpfns.unpack_msg(conn.inbuf)
+            if msg is None: break
+            args = Mtcpfns.hello_args(msg[1:])
+            if args is not None:
+                # Reply with the same control code, in the old
+                # format, then switch.
+                version  = min(args[0], Mtcpfns.WIRE_VERSION)
+                features = args[1] & Mtcpfns.wire_features(version)
+                self.send_to(conn, msg[0] + Mtcpfns.hello(version, features)
+                             + "\n")
+                conn.wire_version  = version
+                conn.wire_features = features
+            elif conn is self.controller:
+                conn.messages.put(msg)
+                pass
+            pass
+        return
+
+    def send_some(self, conn):
+        self.lock.acquire()
+        try:
+            try:
+                sent = conn.sock.send(conn.outbuf)
+                conn.outbuf = conn.outbuf[sent:]
+            except socket.error:
+                conn.closed = True
+                pass
+        finally:
+            self.lock.release()
+            pass
+        return
+    pass
+
+# Demo
+if __name__=='__main__':
+    inout = TCPMultiServer(opts={'open': False})
+    if len(sys.argv) > 1:
+        inout.open({'PORT': int(sys.argv[1])})
+        inout.broadcast_codes = ('.',)
+        print('Listening on port %s...' % inout.PORT)
+        while True:
+            try:
+                line = inout.read_msg().rstrip('\n')
+            except EOFError:
+                break
+            print(line)
+            inout.writeline('.ack: ' + line)
+            pass
+        pass
+    inout.close()
+    pass
@@ -37,6 +37,8 @@ class TCPServer(Mbase.DebuggerInOutBase):
         self.addr   = None
         self.buf    = ''    # Read buffer
         self.state = 'disconnected'
+        self.wire_version = 1 # Raised when the client says it can
+        self.wire_features = set() # Those the client and we agreed on
         self.PORT  = None
         self.HOST  = None
         if inout:
@@ -58,6 +60,17 @@ class TCPServer(Mbase.DebuggerInOutBase):
         self.state = 'disconnected'
         return
 
+    def disconnect(self):
+        """ Drops the client connection, if any, but keeps listening
+        for another. """
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+            pass
+        self.buf   = ''
+        self.state = 'disconnected'
+        return
+
     def open(self, opts=None):
         get_option = lambda key: Mmisc.option_set(opts, key,
                                                   Mdefault.SERVER_SOCKET_OPTS)
@@ -110,20 +123,21 @@ class TCPServer(Mbase.DebuggerInOutBase):
             self.wait_for_connect()
             pass
         if self.state == 'connected':
-            if 0 == len(self.buf):
-                self.buf = self.conn.recv(Mtcpfns.TCP_MAX_PACKET)
-                if 0 == len(self.buf):
-                    self.state = 'disconnected'
-                    raise EOFError
-                pass
-            self.buf, data = Mtcpfns.unpack_msg(self.buf)
+            try:
+                self.buf, data = Mtcpfns.read_msg(self.conn, self.buf)
+            except EOFError:
+                self.state = 'disconnected'
+                raise
             return data
         else:
             raise IOError("read_msg called in state: %s." % self.state)
 
     def wait_for_connect(self):
         self.conn, self.addr = self.inout.accept()
+        self.buf   = ''
         self.state = 'connected'
+        self.wire_version = 1
+        self.wire_features = set()
         return
 
     def write(self, msg):
@@ -134,8 +148,8 @@ class TCPServer(Mbase.DebuggerInOutBase):
         if self.state != 'connected':
             self.wait_for_connect()
             pass
-        # FIXME: do we have to check the size of msg and split output?
-        return self.conn.send(Mtcpfns.pack_msg(msg))
+        return self.conn.sendall(Mtcpfns.pack_msg(
+            msg, self.wire_version, 'compress' in self.wire_features))
 
 # Demo
 if __name__=='__main__':
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+#   Copyright (C) 2014 Rocky Bernstein <rocky@gnu.org>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Debugger Client Input/Output over a UNIX-domain socket. """
+
+import socket
+from import_relative import import_relative
+Mdefault   = import_relative('default', '..lib', 'trepan')
+Mmisc      = import_relative('misc', '..', 'trepan')
+Mtcpclient = import_relative('tcpclient', '.', 'trepan')
+
+class UnixClient(Mtcpclient.TCPClient):
+    """Debugger Client Input/Output UNIX-domain Socket."""
+
+    def __init__(self, inout=None, opts=None):
+        self.path = None
+        Mtcpclient.TCPClient.__init__(self, inout, opts)
+        return
+
+    def open(self, opts=None):
+        get_option = lambda key: Mmisc.option_set(opts, key,
+                                                  Mdefault.CLIENT_SOCKET_OPTS)
+        if opts is not None:
+            # Kept so that a restart can open the same path again.
+            self.path = get_option('SOCKET')
+            pass
+        self.buf = ''
+        self.wire_version = 1
+        self.wire_features = set()
+        self.inout = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self.inout.connect(self.path)
+        except socket.error, e:
+            self.inout.close()
+            self.inout = None
+            self.state = 'disconnected'
+            raise IOError('could not open client socket %s: %s' %
+                          (self.path, e.args[-1]))
+        self.state = 'connected'
+        return
+    pass
+
+# Demo
+if __name__=='__main__':
+    inout = UnixClient(opts={'open': False})
+    import sys
+    if len(sys.argv) > 1:
+        print 'Connecting...',
+        inout.open({'SOCKET': sys.argv[1]})
+        print('connected.')
+        while True:
+            line = raw_input('nu? ')
+            if len(line) == 0: break
+            try:
+                line = inout.writeline(line)
+                print("Got: ", inout.read_msg().rstrip('\n'))
+            except EOFError:
+                break
+            pass
+        pass
+    inout.close()
+    pass
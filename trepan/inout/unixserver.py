@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+#   Copyright (C) 2014 Rocky Bernstein <rocky@gnu.org>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Debugger Server Input/Output over a UNIX-domain socket.
+
+Messages are framed as they are over TCP. The socket is a file, so
+the session has a name, and only its owner may connect: no port is
+opened to anyone else on the machine."""
+
+import errno, os, socket, stat, tempfile
+
+from import_relative import import_relative
+Mdefault   = import_relative('default', '..lib', top_name='trepan')
+Mmisc      = import_relative('misc', '..', 'trepan')
+Mtcpserver = import_relative('tcpserver', '.', 'trepan')
+
+def default_path():
+    """Where a server listens if it isn't told: like the FIFO
+    server's names, in the temporary directory and named by pid."""
+    return os.path.join(tempfile.gettempdir(), 'trepan-%s.sock' % os.getpid())
+
+def listen(path, backlog=1):
+    """Return a socket listening on *path*, which only our user can
+    connect to. A socket file left by a debugger that has gone away is
+    removed; IOError is raised if one is still listening there."""
+    if os.path.exists(path):
+        if not stat.S_ISSOCK(os.stat(path).st_mode):
+            raise IOError('%s exists and is not a socket' % path)
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            try:
+                probe.connect(path)
+            except socket.error, e:
+                if e.args[0] not in (errno.ECONNREFUSED, errno.ENOENT):
+                    raise
+                os.unlink(path)
+            else:
+                raise IOError('a debugger is already listening on %s' % path)
+        finally:
+            probe.close()
+            pass
+        pass
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    old_umask = os.umask(0177)
+    try:
+        try:
+            sock.bind(path)
+        except socket.error, e:
+            sock.close()
+            raise IOError('could not open server socket %s: %s' %
+                          (path, e.args[-1]))
+    finally:
+        os.umask(old_umask)
+        pass
+    sock.listen(backlog)
+    return sock
+
+class UnixServer(Mtcpserver.TCPServer):
+    """Debugger Server Input/Output UNIX-domain Socket."""
+
+    def __init__(self, inout=None, opts=None):
+        self.path = None
+        Mtcpserver.TCPServer.__init__(self, inout, opts)
+        return
+
+    def close(self):
+        """ Closes the connection, and removes the socket file. """
+        Mtcpserver.TCPServer.close(self)
+        if self.path and os.path.exists(self.path):
+            os.unlink(self.path)
+            pass
+        self.path = None
+        return
+
+    def open(self, opts=None):
+        get_option = lambda key: Mmisc.option_set(opts, key,
+                                                  Mdefault.SERVER_SOCKET_OPTS)
+        path = get_option('SOCKET') or default_path()
+        self.inout = listen(path)
+        self.path  = path
+        self.state = 'listening'
+        return
+    pass
+
+# Demo
+if __name__=='__main__':
+    inout = UnixServer(opts={'open': False})
+    import sys
+    if len(sys.argv) > 1:
+        inout.open({'SOCKET': sys.argv[1]})
+        print('Listening for connection on %s...' % inout.path)
+        while True:
+            try:
+                line = inout.read_msg().rstrip('\n')
+                print(line)
+                inout.writeline('ack: ' + line)
+            except EOFError:
+                break
+            pass
+        pass
+    inout.close()
+    pass
@@ -65,6 +65,13 @@ the program and the outside portion which could be
             pass
         return
 
+    def msg_source(self, prefix, filename, lineno, line, style='plain'):
+        """Used to write *prefix* followed by *line*, which is line
+        *lineno* of *filename* highlighted in *style*. A remote
+        interface may send a reference to the line instead."""
+        self.msg(prefix + line.rstrip('\n'))
+        return
+
     def msg_nocr(self, msg):
         """ used to write to a debugger that is connected to this
         server; `str' written will not have a newline added to it
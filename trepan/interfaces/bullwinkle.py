@@ -14,8 +14,8 @@
 #   You should have received a copy of the GNU General Public License
 #   along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """Interface when communicating with the user in the same process as
-    the debugged program."""
-import atexit, pprint
+    the debugged program, or with a front end over a socket."""
+import ast, atexit, json, pprint
 
 # Our local modules
 from import_relative import *
@@ -23,13 +23,25 @@ import_relative('interfaces',             '..',   'trepan')
 Minterface = import_relative('interface', '..',   'trepan')
 Minput     = import_relative('input',     '..inout', 'trepan')
 Moutput    = import_relative('output',    '..inout', 'trepan')
+Mlineserver = import_relative('lineserver', '..inout', 'trepan')
 
 class BWInterface(Minterface.DebuggerInterface):
     """Interface when communicating with the user in the same
-    process as the debugged program."""
+    process as the debugged program.
 
-    def __init__(self, inp=None, out=None, opts=None):
+    Requests are dictionaries, written in JSON or as a Python literal.
+    Given *connection_opts* with *IO* 'TCP' or 'UNIX', we instead
+    listen on a socket for a front end. Each line it sends is a JSON
+    request, and each response is a line of JSON. Requests may be sent
+    without waiting for the responses to earlier ones."""
+
+    def __init__(self, inp=None, out=None, opts=None, connection_opts=None):
         atexit.register(self.finalize)
+        self.json = False  # Write responses as JSON?
+        if connection_opts and connection_opts.get('IO') in ('TCP', 'UNIX'):
+            inp = out = Mlineserver.LineServer(opts=connection_opts)
+            self.json = True
+            pass
         self.input       = inp or Minput.DebuggerUserInput()
         self.output      = out or Moutput.DebuggerUserOutput()
         self.pp          = pprint.PrettyPrinter()
@@ -38,7 +50,7 @@ class BWInterface(Minterface.DebuggerInterface):
     def close(self):
         """ Closes both input and output """
         self.input.close()
-        self.output.close()
+        if self.output is not self.input: self.output.close()
         return
 
     def errmsg(self, msg):
@@ -53,17 +65,30 @@ class BWInterface(Minterface.DebuggerInterface):
         return
 
     def msg(self, msg):
-        self.output.write(self.pp.pformat(msg) + "\n")
+        if self.json:
+            # Anything JSON has no type for is sent as its repr.
+            self.output.write(json.dumps(msg, default=repr) + "\n")
+        else:
+            self.output.write(self.pp.pformat(msg) + "\n")
+            pass
         return
 
     def read_command(self):
         line = self.readline('Bullwinkle read: ')
+        # Input comes from a client we don't control: besides syntax
+        # errors, parsing can fail with TypeError (an unhashable key)
+        # or RuntimeError and MemoryError (deep nesting). None of those
+        # should end the debugging session.
         try:
-            command = eval(line)
-        except:
-            return "eval error";
-        pass
-        return command
+            return json.loads(line)
+        except Exception:
+            pass
+        try:
+            # Python literals are still accepted, but not evaluated.
+            return ast.literal_eval(line.strip())
+        except Exception:
+            return "eval error"
+        return
 
     def readline(self, prompt=''):
         return self.input.readline(prompt=prompt)
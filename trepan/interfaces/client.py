@@ -22,16 +22,34 @@ from import_relative import *
 Muser       = import_relative('user', top_name='trepan')
 Mtcpclient  = import_relative('tcpclient', '..inout', 'trepan')
 Mfifoclient = import_relative('fifoclient', '..inout', 'trepan')
+Munixclient = import_relative('unixclient', '..inout', 'trepan')
+Mtcpfns     = import_relative('tcpfns', '..inout', 'trepan')
 Mcomcodes   = import_relative('comcodes', '.', 'trepan')
+Mhighlight  = import_relative('highlight', '..lib', 'trepan')
 Mmisc       = import_relative('misc', '..', 'trepan')
 
 class ClientInterface(Muser.UserInterface):
     """Interface for a user which is attached to a debugged process
     via some sort of communication medium (e.g. socket, tty, FIFOs).
     This could be on the same computer in a different process or on
-    a remote computer."""
+    a remote computer.
 
-    DEFAULT_INIT_CONNECTION_OPTS = {'IO': 'FIFO'}
+    Over TCP or a UNIX-domain socket, large messages are compressed
+    unless connection option *compress* is False.
+
+    Unless connection option *source_cache* is False, we also keep the
+    source text the server sends us, by the SHA1 of the text. The
+    server then sends references to source lines rather than the
+    lines, and we ask it for the text of a file only the first time
+    one of its lines is shown. Output that comes in while we wait is
+    held back, so that read_remote() returns it in order.
+
+    The server gives us the token of its session and we count the
+    messages it sends. If the connection drops, reconnect() gives them
+    back to the server, which sends us what we missed."""
+
+    DEFAULT_INIT_CONNECTION_OPTS = {'IO': 'FIFO', 'compress': True,
+                                    'source_cache': True}
     def __init__(self, inp=None, out=None, inout=None, user_opts=None,
                  connection_opts=None):
         get_connection_option = lambda key: \
@@ -40,6 +58,25 @@ class ClientInterface(Muser.UserInterface):
         Muser.UserInterface.__init__(self, inp, out, user_opts)
 
         self.inout = None # initialize in case assignment below fails
+
+        # The newest wire format we ask for, and which of its
+        # features: each option turns one off independently.
+        self.wire_version  = Mtcpfns.WIRE_VERSION
+        self.wire_features = set()
+        if get_connection_option('compress'):
+            self.wire_features.add('compress')
+            pass
+        if get_connection_option('source_cache'):
+            self.wire_features.add('source')
+            pass
+        self.source_cache = {}  # Maps a SHA1 to a HighlightInfo or None
+        self.fetching = set()   # SHA1s asked for but not yet received
+        self.held     = []      # Messages waiting on those
+        self.session  = None    # Token of the server's session
+        self.received = 0       # Count of messages in that session
+        self.resuming = False   # Waiting for the server to resume it
+        self.greeting = None    # Where we are in greeting the server
+        self.greeted_prompt = None  # The first prompt, held back meanwhile
         if inout:
             self.inout = inout
         else:
@@ -49,20 +86,183 @@ class ClientInterface(Muser.UserInterface):
                 self.inout = Mfifoclient.FIFOClient(opts=connection_opts)
             elif 'TCP' == self.server_type:
                 self.inout = Mtcpclient.TCPClient(opts=connection_opts)
+                self.handshake()
+            elif 'UNIX' == self.server_type:
+                self.inout = Munixclient.UnixClient(opts=connection_opts)
+                self.handshake()
             else:
-                self.errmsg("Expecting server type TCP or FIFO. Got: %s." %
-                            self.server_type)
+                self.errmsg("Expecting server type TCP, UNIX or FIFO. "
+                            "Got: %s." % self.server_type)
                 return
             pass
         return
 
+    def handshake(self):
+        '''Tell the server the newest wire format we understand once it
+        first prompts us. Until it replies we keep to version 1, which
+        every server reads. The prompt is held back until then. A
+        server that knows nothing of wire versions takes our hello for
+        a comment and prompts again; that prompt is shown instead.
+        Call this each time the connection is opened.'''
+        if hasattr(self.inout, 'wire_version') and self.inout.inout:
+            self.greeting = 'pending'
+            pass
+        return
+
+    def send_hello(self):
+        self.write_remote(Mcomcodes.SYNC,
+                          Mtcpfns.hello(self.wire_version,
+                                        self.wire_features))
+        return
+
+    def send_session_hello(self):
+        session = Mtcpfns.SESSION_HELLO
+        if self.session:
+            session += ' %s %d' % (self.session, self.received)
+            pass
+        self.write_remote(Mcomcodes.SYNC, session)
+        return
+
+    def reconnect(self):
+        '''Open the connection to the server again, resuming our
+        session. IOError is raised if we can't.'''
+        self.inout.close()
+        self.inout.open()
+        # The server has resumed sessions before, so it reads our
+        # hellos.
+        self.resuming = True
+        self.greeting = None
+        self.send_hello()
+        self.send_session_hello()
+        # Replies to what we asked for may have been lost.
+        for sha1 in self.fetching:
+            self.write_remote(Mcomcodes.FETCH, sha1)
+            pass
+        return
+
     def read_remote(self):
-        '''Send a message back to the server (in contrast to
-        the local user output channel).'''
-        coded_line = self.inout.read_msg()
-        control = coded_line[0]
-        remote_line = coded_line[1:]
-        return (control, remote_line)
+        '''Read a message from the server and return it as a (control
+        code, message) tuple. The server's reply to our handshake and
+        source text are handled here and not returned. References to
+        source lines are returned as PRINT messages of the lines.'''
+        while True:
+            if self.held and not self.fetching:
+                return self.render(*self.held.pop(0))
+            try:
+                coded_line = self.inout.read_msg()
+            except EOFError:
+                if not self.held: raise
+                # We won't get the text now; show what we have.
+                self.fetching = set()
+                continue
+            control = coded_line[0]
+            remote_line = coded_line[1:]
+            if self.resuming and control != Mcomcodes.SYNC:
+                # Sent before the server knew who we are. What we
+                # need comes again after its reply to our session hello.
+                continue
+            if control not in (Mcomcodes.SYNC, Mcomcodes.FETCH,
+                               Mcomcodes.SHA1):
+                self.received += 1
+                if ('pending' == self.greeting and
+                    control in (Mcomcodes.PROMPT, Mcomcodes.CONFIRM_TRUE,
+                                Mcomcodes.CONFIRM_FALSE)):
+                    self.greeting = 'wire'
+                    self.greeted_prompt = (control, remote_line)
+                    self.send_hello()
+                    continue
+                elif 'wire' == self.greeting:
+                    # The server took our hello for a comment. It asks
+                    # again for what the held prompt asked for.
+                    self.greeting = None
+                    self.greeted_prompt = None
+                    pass
+                pass
+            if Mcomcodes.SYNC == control:
+                args = Mtcpfns.hello_args(remote_line)
+                if args is not None:
+                    self.inout.wire_version = min(args[0],
+                                                  self.wire_version)
+                    self.inout.wire_features = (args[1] &
+                                                self.wire_features)
+                    if 'wire' == self.greeting:
+                        self.greeting = 'session'
+                        self.send_session_hello()
+                        pass
+                    continue
+                args = Mtcpfns.session_args(remote_line)
+                if args is not None and 2 == len(args):
+                    lost = 0
+                    if args[0] == self.session:
+                        lost = int(args[1]) - self.received
+                        pass
+                    self.session, self.received = args[0], int(args[1])
+                    self.resuming = False
+                    if 'session' == self.greeting:
+                        # Now the prompt can be answered.
+                        self.greeting = None
+                        control, remote_line = self.greeted_prompt
+                        self.greeted_prompt = None
+                    elif lost <= 0:
+                        continue
+                    else:
+                        control, remote_line = (Mcomcodes.PRINT,
+                                                "** %d messages of output "
+                                                "were lost.\n" % lost)
+                        pass
+                    pass
+                pass
+            elif Mcomcodes.FETCH == control:
+                self.store_source(remote_line)
+                continue
+            elif Mcomcodes.SOURCE == control:
+                sha1 = remote_line.split(' ', 1)[0]
+                if sha1 not in self.source_cache and sha1 not in self.fetching:
+                    self.write_remote(Mcomcodes.FETCH, sha1)
+                    self.fetching.add(sha1)
+                    pass
+                pass
+            if self.held or self.fetching:
+                self.held.append((control, remote_line))
+                continue
+            return self.render(control, remote_line)
+        return
+
+    def render(self, control, remote_line):
+        '''Return a message to be returned by read_remote(). Source
+        references are turned into PRINT messages of the lines, as
+        far as we have the text.'''
+        if Mcomcodes.SOURCE != control: return (control, remote_line)
+        refs = remote_line.split('\n')
+        sha1, style = refs[0].split(' ', 1)
+        info = self.source_cache.get(sha1)
+        text = []
+        for ref in refs[1:]:
+            lineno, prefix = ref.split(' ', 1)
+            lineno = int(lineno)
+            line = ''
+            if info and 1 <= lineno <= len(info.plain):
+                line = Mhighlight.info_line(info, lineno, style)
+                pass
+            text.append(prefix + line.rstrip('\n') + '\n')
+            pass
+        return (Mcomcodes.PRINT, ''.join(text))
+
+    def store_source(self, remote_line):
+        '''Keep the source text in *remote_line*, the server's reply
+        to a FETCH request.'''
+        header, text = remote_line.split('\n', 1)
+        sha1, first = header.split()
+        self.fetching.discard(sha1)
+        if '1' == first:
+            self.source_cache[sha1] = Mhighlight.HighlightInfo(
+                text.splitlines(True), sha1)
+        else:
+            # Either the server no longer has the text, or this is
+            # part of a file, which we don't ask for.
+            self.source_cache.setdefault(sha1, None)
+            pass
+        return
 
     def write_remote(self, code, msg):
         '''Send a message back to the server (in contrast to
@@ -23,3 +23,8 @@ QUIT          = 'q'
 PROMPT        = 'p'
 SYNC          = 's'   # Resynchronize communication
 RESTART       = 'r'
+
+# Source text by SHA1; see ClientInterface and tcpfns.WIRE_VERSION.
+SOURCE        = 'l'   # source lines given by the SHA1 of the file text
+SHA1          = 'h'   # ask for or give the SHA1 of a file's text
+FETCH         = 'f'   # ask for or give source text by its SHA1
@@ -14,34 +14,82 @@
 #   You should have received a copy of the GNU General Public License
 #   along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """Module for Server (i.e. program to communication-device) interaction"""
-import atexit, os
+import atexit, collections, os, socket
+import pyficache
 
 # Our local modules
 from import_relative import *
 Minterface  = import_relative('interface',  '..',   'trepan')
 Mtcpserver  = import_relative('tcpserver', '..inout', 'trepan')
+Mtcpmulti   = import_relative('tcpmultiserver', '..inout', 'trepan')
 Mfifoserver = import_relative('fifoserver', '..inout', 'trepan')
+Munixserver = import_relative('unixserver', '..inout', 'trepan')
 Mmisc       = import_relative('misc', '..', 'trepan')
 Mcomcodes   = import_relative('comcodes', '.', 'trepan')
+Mtcpfns     = import_relative('tcpfns', '..inout', 'trepan')
 
 class ServerInterface(Minterface.DebuggerInterface):
     """Interface for debugging a program but having user control
     reside outside of the debugged process, possibly on another
-    computer."""
+    computer.
 
-    DEFAULT_INIT_CONNECTION_OPTS = {'IO': 'TCP'}
+    Output is collected and sent in one message when the server
+    prompts, asks for confirmation or reads, or once *buffer_size*
+    bytes have collected, so that a command's output costs one round
+    trip rather than one per line. A *buffer_size* of 0 sends each
+    message as it comes.
+
+    *IO* is 'TCP', 'FIFO' or 'UNIX'. A 'UNIX' server listens on the
+    UNIX-domain socket named by option *SOCKET*, or on one named by
+    pid in the temporary directory.
+
+    With connection option *multi* set, a TCP or UNIX server doesn't
+    wait for a client. The program runs until one connects, and then stops.
+    Clients that connect while another is in control can watch but not
+    type commands.
+
+    A client that speaks wire version 4 keeps source text by its SHA1.
+    Source lines are then sent to it as references, and it asks for
+    the text of a file it doesn't have. Answering its requests for a
+    SHA1 or for text is done while reading a command.
+
+    If the client of a single TCP or UNIX server goes away without
+    quitting, the program stays stopped until a client connects again,
+    unless connection option *resume* is False. The messages we send
+    are counted, and the last *backlog_size* bytes of them are kept. A
+    client that gives the token of our session and the count of
+    messages it got is sent those it missed; see Mtcpfns.SESSION_HELLO.
+    Any other client is prompted again."""
+
+    DEFAULT_INIT_CONNECTION_OPTS = {'IO': 'TCP', 'buffer_size': 16384,
+                                    'multi': False, 'SOCKET': None,
+                                    'resume': True, 'backlog_size': 65536}
     def __init__(self, inout=None, out=None, connection_opts=None):
         get_option = lambda key: \
             Mmisc.option_set(connection_opts, key,
                              self.DEFAULT_INIT_CONNECTION_OPTS)
         atexit.register(self.finalize)
         self.inout = None # initialize in case assignment below fails
+        self.multi = False
         if inout:
             self.inout = inout
         else:
             self.server_type = get_option('IO')
             if 'FIFO' == self.server_type:
                 self.inout = Mfifoserver.FIFOServer()
+            elif get_option('multi'):
+                opts = connection_opts
+                if 'UNIX' == self.server_type:
+                    opts = dict(connection_opts)
+                    opts['SOCKET'] = (get_option('SOCKET') or
+                                      Munixserver.default_path())
+                    pass
+                self.inout = Mtcpmulti.TCPMultiServer(opts=opts)
+                self.inout.broadcast_codes = (Mcomcodes.PRINT, Mcomcodes.QUIT)
+                self.inout.connect_hooks.append(self.client_connected)
+                self.multi = True
+            elif 'UNIX' == self.server_type:
+                self.inout = Munixserver.UnixServer(opts=connection_opts)
             else:
                 self.inout = Mtcpserver.TCPServer(opts=connection_opts)
                 pass
@@ -51,6 +99,40 @@ class ServerInterface(Minterface.DebuggerInterface):
         self.input  = inout
         self.interactive = True # Or at least so we think initially
         self.histfile = None
+        self.buffer_size = get_option('buffer_size')
+        self.output_buf  = []  # Output not yet sent
+        self.output_len  = 0   # Its total length
+        self.source_refs = None  # Or source lines not yet sent; see msg_source()
+        self.source_files = {}   # Maps a SHA1 we've sent to its file
+        self.attach_hook = None  # See unattended()
+        self.last_prompt = ''
+
+        # If set, the command read when the client disconnects rather
+        # than EOFError.
+        self.eof_command = None
+
+        # Session resumption
+        self.resume       = get_option('resume')
+        self.backlog_size = get_option('backlog_size')
+        self.backlog      = collections.deque()  # (count, message) pairs
+        self.backlog_len  = 0      # Total length of the messages
+        self.sent         = 0      # Count of messages sent
+        self.token        = os.urandom(8).encode('hex')
+        self.dropped      = False  # Client went away; see readline()
+        self.reconnected  = False  # ...and another has connected since
+        self.prompt_msg   = None   # Last prompt or confirmation sent
+        return
+
+    def client_connected(self, conn, is_controller):
+        """Run in the server thread when a client connects to a multi
+        server."""
+        if is_controller:
+            if self.attach_hook: self.attach_hook()
+        else:
+            self.inout.send_to(conn, Mcomcodes.PRINT +
+                               "Another client is in control. You are " +
+                               "watching; commands are ignored.\n")
+            pass
         return
 
     def close(self):
@@ -85,12 +167,29 @@ class ServerInterface(Minterface.DebuggerInterface):
 
     def finalize(self, last_wishes=Mcomcodes.QUIT):
         # print exit annotation
-        if self.is_connected():
-            self.inout.writeline(last_wishes)
+        if self.is_connected() or self.multi:
+            self.flush()
+            self.send(last_wishes + "\n")
             pass
         self.close()
         return
 
+    def flush(self):
+        """Send any output that has been collected. That is either
+        text or references to source lines, never both."""
+        if self.output_buf:
+            text = ''.join(self.output_buf)
+            self.output_buf = []
+            self.output_len = 0
+            self.send(Mcomcodes.PRINT + text)
+        elif self.source_refs:
+            sha1, style, refs = self.source_refs
+            self.source_refs = None
+            self.send(Mcomcodes.SOURCE + sha1 + ' ' + style +
+                      ''.join(['\n%d %s' % ref for ref in refs]))
+            pass
+        return
+
     def is_connected(self):
         """ Return True if we are connected """
         return 'connected' == self.inout.state
@@ -99,18 +198,49 @@ class ServerInterface(Minterface.DebuggerInterface):
         """ used to write to a debugger that is connected to this
         server; `str' written will have a newline added to it
         """
-        self.inout.writeline(Mcomcodes.PRINT + msg)
+        self.write_output(msg + "\n")
+        return
+
+    def msg_source(self, prefix, filename, lineno, line, style='plain'):
+        """Like msg(prefix + line), but if the client keeps source
+        text, a reference to the line is sent instead. Consecutive
+        lines of a file go in one message as a list of line numbers
+        and prefixes, after the SHA1 of the file text and *style*."""
+        sha1 = None
+        if not self.multi and 'source' in getattr(self.inout,
+                                                  'wire_features', ()):
+            # Refer to the line the text came from, as
+            # trepan.lib.highlight.getline() shows it.
+            filename = pyficache.unmap_file(filename)
+            filename, lineno = pyficache.unmap_file_line(filename, lineno)
+            sha1 = self.source_sha1(filename)
+            pass
+        if not sha1:
+            return self.msg(prefix + line.rstrip('\n'))
+        if self.source_refs and self.source_refs[:2] != (sha1, style):
+            self.flush()
+            pass
+        if not self.source_refs:
+            self.flush()
+            self.source_refs = (sha1, style, [])
+            pass
+        self.source_refs[2].append((lineno, prefix))
         return
 
     def msg_nocr(self, msg):
         """ used to write to a debugger that is connected to this
         server; `str' written will not have a newline added to it
         """
-        self.inout.write(Mcomcodes.PRINT +  msg)
+        self.write_output(msg)
         return
 
     def read_command(self, prompt):
-        return self.readline(prompt)
+        try:
+            return self.readline(prompt)
+        except EOFError:
+            if self.eof_command: return self.eof_command
+            raise
+        return
 
     def read_data(self):
         return self.inout.read_data()
@@ -118,17 +248,195 @@ class ServerInterface(Minterface.DebuggerInterface):
     def readline(self, prompt, add_to_history=True):
         if prompt:
             self.write_prompt(prompt)
+        else:
+            self.flush()
             pass
-        coded_line = self.inout.read_msg()
-        self.read_ctrl = coded_line[0]
-        return coded_line[1:]
+        while True:
+            try:
+                if self.dropped: self.accept()
+                coded_line = self.inout.read_msg()
+                self.read_ctrl = coded_line[0]
+                if (Mcomcodes.SYNC == self.read_ctrl and
+                    (self.handshake(coded_line[1:]) or
+                     self.start_session(coded_line[1:]))):
+                    continue
+                if Mcomcodes.SHA1 == self.read_ctrl:
+                    self.send_sha1(coded_line[1:])
+                    continue
+                if Mcomcodes.FETCH == self.read_ctrl:
+                    self.send_source(coded_line[1:])
+                    continue
+            except (EOFError, socket.error):
+                if not self.resumable(): raise
+                # Stay stopped, and read from the next client.
+                self.inout.disconnect()
+                self.dropped = True
+                continue
+            if self.multi:
+                # Show observers what was typed.
+                self.inout.observe(Mcomcodes.PRINT + self.last_prompt +
+                                   coded_line[1:])
+                pass
+            return coded_line[1:]
+        return
+
+    def accept(self):
+        '''Wait for a client to take the place of one that went away.
+        It is prompted again, outside of our session, so that a client
+        which knows nothing of sessions can go on. A client resuming
+        our session ignores this; see start_session().'''
+        self.inout.wait_for_connect()
+        self.dropped = False
+        self.reconnected = True
+        if self.prompt_msg: self.inout.write(self.prompt_msg)
+        return
+
+    def handshake(self, line):
+        '''If *line* is a client's wire-version hello, agree on a
+        version and its features, tell the client and return True. The reply goes out
+        in the old format; everything after it in the new one.'''
+        args = Mtcpfns.hello_args(line)
+        if args is None or not hasattr(self.inout, 'wire_version'):
+            return False
+        version  = min(args[0], Mtcpfns.WIRE_VERSION)
+        features = args[1] & Mtcpfns.wire_features(version)
+        self.inout.writeline(Mcomcodes.SYNC + Mtcpfns.hello(version, features))
+        self.inout.wire_version  = version
+        self.inout.wire_features = features
+        return True
+
+    def resumable(self):
+        """Return True if we wait for a client that went away to come
+        back."""
+        return (self.resume and not self.multi and not self.eof_command
+                and hasattr(self.inout, 'disconnect'))
+
+    def send(self, msg):
+        """Send *msg*, counting it and keeping it in the backlog. If
+        the client has gone away, it is only kept."""
+        self.sent += 1
+        self.backlog.append((self.sent, msg))
+        self.backlog_len += len(msg)
+        while self.backlog_len > self.backlog_size and len(self.backlog) > 1:
+            self.backlog_len -= len(self.backlog.popleft()[1])
+            pass
+        if self.dropped: return
+        try:
+            self.inout.write(msg)
+        except socket.error:
+            if not self.resumable(): raise
+            self.inout.disconnect()
+            self.dropped = True
+            pass
+        return
+
+    def start_session(self, line):
+        '''If *line* is a client's session hello, reply with our token
+        and the count of messages the client has been sent. A client
+        resuming our session is then sent the messages it missed, as
+        far as we still have them. If it has come back while we read a
+        command, it is prompted again if there is nothing to resend: it
+        ignored the prompt accept() sent. Any other client has that
+        prompt already. Return True if *line* was a session hello.'''
+        args = Mtcpfns.session_args(line)
+        if args is None: return False
+        start = self.sent
+        resuming = 2 == len(args) and args[0] == self.token
+        if resuming:
+            try:
+                start = int(args[1])
+            except ValueError:
+                pass
+            if self.backlog:
+                start = max(start, self.backlog[0][0] - 1)
+                pass
+            start = min(start, self.sent)
+            pass
+        self.inout.writeline(Mcomcodes.SYNC + Mtcpfns.SESSION_HELLO +
+                             ' %s %d' % (self.token, start))
+        missed = [msg for count, msg in self.backlog if count > start]
+        for msg in missed:
+            self.inout.write(msg)
+            pass
+        if self.reconnected and resuming and not missed and self.prompt_msg:
+            self.send(self.prompt_msg)
+            pass
+        self.reconnected = False
+        return True
+
+    def send_sha1(self, filename):
+        """Reply to a request for the SHA1 of *filename* with the
+        SHA1, or '-' if we can't read the file, and the file name."""
+        filename = filename.rstrip('\n')
+        sha1 = self.source_sha1(filename) or '-'
+        self.inout.writeline(Mcomcodes.SHA1 + sha1 + ' ' + filename)
+        return
+
+    def send_source(self, request):
+        """Reply to a request for source text. *request* is a SHA1
+        we have sent, optionally followed by the first and last line
+        numbers wanted. The reply gives the SHA1 and the first line
+        number, then the text. The first line number is 0 if we no
+        longer have the text."""
+        args = request.split()
+        sha1 = args[0]
+        lines = None
+        filename = self.source_files.get(sha1)
+        if filename and self.source_sha1(filename) == sha1:
+            lines = pyficache.getlines(filename, {'output': 'plain'})
+            pass
+        if not lines:
+            self.inout.write(Mcomcodes.FETCH + sha1 + ' 0\n')
+            return
+        try:
+            first = max(1, int(args[1]))
+            last  = int(args[2])
+        except (IndexError, ValueError):
+            first, last = 1, len(lines)
+            pass
+        self.inout.write(Mcomcodes.FETCH + '%s %d\n' % (sha1, first) +
+                         ''.join(lines[first-1:last]))
+        return
+
+    def source_sha1(self, filename):
+        """Return the SHA1 of the text of *filename*, or None if we
+        can't read it, and remember which file it was."""
+        try:
+            sha1 = pyficache.sha1(filename)
+        except (IOError, UnicodeError):
+            return None
+        if sha1: self.source_files[sha1] = filename
+        return sha1
 
     def state(self):
         """ Return connected """
         return self.inout.state
 
+    def unattended(self, attach_hook=None):
+        """Return True if nobody controls this server, in which case
+        the program should run on. *attach_hook* is run, in another
+        thread, once somebody takes control. Only a multi server can
+        be unattended."""
+        if not self.multi: return False
+        self.attach_hook = attach_hook
+        return not self.is_connected()
+
+    def write_output(self, text):
+        """Collect *text* to be sent as output, sending what has been
+        collected if that is more than our buffer size."""
+        if self.source_refs: self.flush()
+        self.output_buf.append(text)
+        self.output_len += len(text)
+        if self.output_len >= self.buffer_size:
+            self.flush()
+            pass
+        return
+
     def write_prompt(self, prompt):
-        return self.inout.writeline(Mcomcodes.PROMPT + prompt)
+        self.flush()
+        self.last_prompt = prompt
+        self.prompt_msg  = Mcomcodes.PROMPT + prompt + "\n"
+        return self.send(self.prompt_msg)
 
     def write_confirm(self, prompt, default):
         if default:
@@ -136,7 +444,10 @@ class ServerInterface(Minterface.DebuggerInterface):
         else:
             code = Mcomcodes.CONFIRM_FALSE
             pass
-        return self.inout.writeline(code + prompt)
+        self.flush()
+        self.last_prompt = prompt + ' '
+        self.prompt_msg  = code + prompt + "\n"
+        return self.send(self.prompt_msg)
 
     pass
 
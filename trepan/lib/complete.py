@@ -15,21 +15,140 @@
 #   along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """Command completion routines."""
 
-import re
+import bisect, re
+
+class TrieNode:
+    def __init__(self):
+        self.children = {}
+        self.keys     = []  # Sorted keys in and below this node
+        return
+    pass
+
+class PrefixTrie:
+    """A set of strings kept as a prefix tree. Every node holds the
+    sorted list of keys below it, so finding the keys that start with a
+    prefix takes time proportional to the length of the prefix and the
+    number of matches, not to the number of keys."""
+
+    def __init__(self, keys=()):
+        self.root = TrieNode()
+        for key in keys: self.add(key)
+        return
+
+    def __contains__(self, key):
+        node = self.find(key)
+        # A key sorts before every longer key with it as a prefix.
+        return node is not None and node.keys[0:1] == [key]
+
+    def __len__(self):
+        return len(self.root.keys)
+
+    def find(self, prefix):
+        """Return the node for *prefix* or None if no key starts with
+        it."""
+        node = self.root
+        for ch in prefix:
+            node = node.children.get(ch)
+            if node is None: return None
+            pass
+        return node
+
+    def add(self, key):
+        if key in self: return
+        node = self.root
+        bisect.insort(node.keys, key)
+        for ch in key:
+            child = node.children.get(ch)
+            if child is None:
+                child = node.children[ch] = TrieNode()
+                pass
+            node = child
+            bisect.insort(node.keys, key)
+            pass
+        return
+
+    def remove(self, key):
+        if key not in self: return
+        node = self.root
+        path = [(None, node)]
+        for ch in key:
+            node = node.children[ch]
+            path.append((ch, node))
+            pass
+        for i in range(len(path)-1, -1, -1):
+            ch, node = path[i]
+            del node.keys[bisect.bisect_left(node.keys, key)]
+            if ch is not None and not node.keys:
+                del path[i-1][1].children[ch]
+                pass
+            pass
+        return
+
+    def starting_with(self, prefix):
+        """Return the sorted list of keys which start with *prefix*."""
+        node = self.find(prefix)
+        if node is None: return []
+        return list(node.keys)
+    pass
+
+class CompletionDict(dict):
+    """A dictionary whose keys are also kept in a PrefixTrie, *trie*,
+    for completion."""
+
+    def __init__(self, *args, **kwargs):
+        dict.__init__(self, *args, **kwargs)
+        self.trie = PrefixTrie(self.keys())
+        return
+
+    def __setitem__(self, key, value):
+        dict.__setitem__(self, key, value)
+        self.trie.add(key)
+        return
+
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+        self.trie.remove(key)
+        return
+
+    def clear(self):
+        dict.clear(self)
+        self.trie = PrefixTrie()
+        return
+
+    def pop(self, key, *default):
+        self.trie.remove(key)
+        return dict.pop(self, key, *default)
+
+    def popitem(self):
+        key, value = dict.popitem(self)
+        self.trie.remove(key)
+        return key, value
+
+    def setdefault(self, key, default=None):
+        self.trie.add(key)
+        return dict.setdefault(self, key, default)
+
+    def update(self, *args, **kwargs):
+        dict.update(self, *args, **kwargs)
+        for key in self.keys(): self.trie.add(key)
+        return
+    pass
+
+def matching_keys(complete_hash, prefix):
+    """Return the sorted keys of *complete_hash* starting with *prefix*,
+    using its trie if it has one."""
+    if hasattr(complete_hash, 'trie'):
+        return complete_hash.trie.starting_with(prefix)
+    return sorted([key for key in list(complete_hash.keys())
+                   if key.startswith(prefix)])
 
 def complete_token(complete_ary, prefix):
     return sorted([cmd for cmd in
                    complete_ary if cmd.startswith(prefix)])
 
 def complete_token_with_next(complete_hash, prefix, cmd_prefix=''):
-    result = []
-    for cmd_name in list(complete_hash.keys()):
-        if cmd_name.startswith(cmd_prefix + prefix):
-            result.append([cmd_name[len(cmd_prefix):], complete_hash[cmd_name]])
-            pass
-        pass
-    pass
-    return sorted(result, key=lambda pair: pair[0])
+    return [[cmd_name[len(cmd_prefix):], complete_hash[cmd_name]]
+            for cmd_name in matching_keys(complete_hash, cmd_prefix + prefix)]
 
 def complete_token_filtered_with_next(aliases, prefix, expanded, commands):
 
@@ -37,22 +156,19 @@ def complete_token_filtered_with_next(aliases, prefix, expanded, commands):
     with *prefix*, but filter out any matches already in
     *expanded*."""
 
-    complete_ary = list(aliases.keys())
-    expanded_ary = list(expanded.keys())
+    complete_ary = matching_keys(aliases, prefix)
+    expanded_set = set(expanded.keys())
     # result = [cmd for cmd in
     #             complete_ary if cmd.startswith(prefix) and not (
     #                 cmd in aliases and
     #                 0 == len(set(expanded_ary) - set([aliases[cmd]])))]
     result = []
     for cmd in complete_ary:
-        if cmd.startswith(prefix):
-            if cmd in aliases and (
-                    0 == len(set(expanded_ary) - set([aliases[cmd]]))):
-                result.append([cmd, aliases[cmd]])
+        if 0 == len(expanded_set - set([aliases[cmd]])):
+            result.append([cmd, aliases[cmd]])
             pass
         pass
-    pass
-    return sorted(result, key=lambda pair: pair[0])
+    return result
 
 # Find all starting matches in Hash +aliases+ that start with +prefix+,
 # but filter out any matches already in +expanded+.
@@ -85,6 +201,10 @@ if __name__=='__main__':
     print(next_token('ab cd ef', 0))
     print(next_token('ab cd ef', 2))
     print(complete_token(('-1', '0'), ''))
+    h = CompletionDict({'ab':1, 'aac':2, 'aa':3, 'b':4})
+    print(h.trie.starting_with('a'))
+    del h['aa']
+    print(complete_token_with_next(h, 'a'))
 
     ##   0         1
     ##   0123456789012345678
@@ -38,6 +38,13 @@ Mbwproc    = import_relative('main', '..bwprocessor')
 Mstack     = import_relative('stack')
 Mclifns    = import_relative('clifns', '...trepan')
 
+def untrace_thread(frame, event, arg):
+    """A trace hook that turns tracing off in the thread it runs in.
+    Tracing can only be turned off by the thread itself, so when the
+    debugger detaches this is left for other traced threads."""
+    sys.settrace(None)
+    return None
+
 class DebuggerCore:
 
     DEFAULT_INIT_OPTS = {
@@ -120,6 +127,11 @@ class DebuggerCore:
         # What routines (keyed by f_code) will we not trace into?
         self.ignore_filter = get_option('ignore_filter')
 
+        # Whether trace_dispatch is one of tracer's hooks, as of the
+        # last start() or stop(). Signal handlers look at this rather
+        # than call is_started().
+        self.trace_hooked = False
+
         self.search_path     = sys.path # Source filename search path
 
         # When trace_hook_suspend is set True, we'll suspend
@@ -200,7 +212,7 @@ class DebuggerCore:
         '''Return True if debugging is in progress.'''
         return (tracer.is_started() and
                 not self.trace_hook_suspend
-                and tracer.find_hook(self.trace_dispatch))
+                and tracer.find_hook(self.trace_dispatch) is not None)
 
     def remove_ignore(self, frame_or_fn):
         """Remove `frame_or_fn' to the list of functions that are not to
@@ -225,6 +237,9 @@ class DebuggerCore:
 
             add_hook_opts = get_option('add_hook_opts')
 
+            # Left by an earlier detach; it would stop us tracing.
+            tracer.remove_hook(untrace_thread)
+
             # Has tracer been started?
             if not tracer.is_started():
                 # FIXME: should filter out opts not for tracer
@@ -232,11 +247,15 @@ class DebuggerCore:
                 tracer_start_opts = default.START_OPTS.copy()
                 tracer_start_opts['trace_fn'] = self.trace_dispatch
                 tracer_start_opts['add_hook_opts'] = add_hook_opts
+                tracer_start_opts['include_threads'] = \
+                    get_option('include_threads')
                 tracer.start(tracer_start_opts)
             elif get_option('force') \
                     and not tracer.find_hook(self.trace_dispatch):
                 tracer.add_hook(self.trace_dispatch, add_hook_opts)
                 pass
+            self.trace_hooked = \
+                tracer.find_hook(self.trace_dispatch) is not None
             self.execution_status = 'Running'
         finally:
             self.trace_hook_suspend = False
@@ -249,6 +268,10 @@ class DebuggerCore:
             self.trace_hook_suspend = True
             get_option = lambda key: Mmisc.option_set(options, key,
                                                       default.STOP_OPTS)
+            # Don't leave coalesced signals unreported.
+            if self.debugger.sigmgr.pending:
+                self.debugger.sigmgr.process_pending(sys._getframe(1), True)
+                pass
             args = [self.trace_dispatch]
             remove = get_option('remove')
             if remove:
@@ -260,6 +283,7 @@ class DebuggerCore:
                 except LookupError:
                     pass
                 pass
+            self.trace_hooked = False
         finally:
             self.trace_hook_suspend = False
         return
@@ -378,11 +402,21 @@ class DebuggerCore:
             pass
         return False
 
+    def stop_soon(self):
+        """Stop at the next event, whatever the program was doing. This
+        may be called from another thread, e.g. when a debugger client
+        attaches."""
+        self.step_events = None
+        self.stop_level  = None
+        self.step_ignore = 0
+        return
+
     def set_next(self, frame, step_ignore=0, step_events=None):
         "Sets to stop on the next event that happens in frame 'frame'."
         self.step_events      = None # Consider all events
         self.stop_level       = Mstack.count_frames(frame)
         self.last_frame       = frame
+        self.last_level       = self.stop_level
         self.stop_on_finish   = False
         self.step_ignore      = step_ignore
         return
@@ -413,6 +447,13 @@ class DebuggerCore:
             if self.ignore_filter and self.ignore_filter.is_included(frame):
                 return True
 
+            # Act on signals that have come in since the last event.
+            # Not in ignored frames: one of those may be the signal
+            # handler in the middle of counting a signal.
+            if self.debugger.sigmgr.pending:
+                if self.debugger.sigmgr.process_pending(frame): return True
+                pass
+
             if self.debugger.settings['trace']:
                 print_event_set = self.debugger.settings['printset']
                 if self.event in print_event_set:
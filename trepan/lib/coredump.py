@@ -0,0 +1,426 @@
+# -*- coding: utf-8 -*-
+#   Copyright (C) 2014 Rocky Bernstein <rocky@gnu.org>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Core files: the state of a program that died of an exception, saved
+for post-mortem debugging in another process.
+
+For each frame of the traceback we save where it was, the SHA1 of its
+source file, and reprs of its local and global variables. Reprs are
+cut short and only so many variables are kept, so a core file stays
+small. The stacks of the program's other threads are saved too. The
+data is JSON compressed with zlib, after a line identifying the file.
+
+Nothing here but the standard library is imported, so writing a core
+file from an except hook is cheap.
+
+To read a core file back we build a real traceback that looks like the
+saved one. For each saved frame we compile a stand-in for its code
+with the same file name, function name and line numbers, and call it
+with the saved variables. Line *n* of the stand-in calls the stand-in
+for the next frame, and the last one raises the saved exception. The
+debugger can then show the stack, list source and evaluate
+expressions as if it were looking at the original.
+"""
+import ast, hashlib, json, os, re, sys, threading, time, traceback, types
+import zlib
+from repr import Repr
+
+# First line of a core file
+MAGIC = 'trepan2 core 1\n'
+
+# Limits on what is saved
+MAX_FRAMES    = 100  # innermost frames of a traceback
+MAX_VARIABLES = 200  # per scope
+MAX_REPR      = 200  # characters in a repr
+
+# co_flags bits
+CO_OPTIMIZED = 0x0001
+CO_VARARGS   = 0x0004
+CO_VARKEYWORDS = 0x0008
+
+# The prefix of names we add to the globals of stand-in code.
+HIDDEN = '__trepan_core_'
+
+is_identifier = re.compile('^[A-Za-z_][A-Za-z0-9_]*$').match
+
+repr_obj = Repr()
+repr_obj.maxstring = MAX_REPR
+repr_obj.maxother  = MAX_REPR
+
+def bounded_repr(value):
+    """Return a repr of *value* no longer than MAX_REPR characters."""
+    try:
+        text = repr_obj.repr(value)
+    except:
+        return '<unprintable %s object>' % type(value).__name__
+    if len(text) > MAX_REPR:
+        text = text[:MAX_REPR-3] + '...'
+        pass
+    return text
+
+def scope_reprs(scope):
+    """Return the reprs of the variables in dictionary *scope*."""
+    names = sorted([name for name in scope if name != '__builtins__'])
+    return dict([(name, bounded_repr(scope[name]))
+                 for name in names[:MAX_VARIABLES]])
+
+def file_sha1(filename, cache):
+    """Return the SHA1 of *filename*, or None if it can't be read.
+    Results are kept in dictionary *cache*."""
+    if filename not in cache:
+        try:
+            fp = open(filename, 'rb')
+            try:
+                cache[filename] = hashlib.sha1(fp.read()).hexdigest()
+            finally:
+                fp.close()
+                pass
+        except IOError:
+            cache[filename] = None
+            pass
+        pass
+    return cache[filename]
+
+def capture(exc_info):
+    """Return a dictionary saving the exception *exc_info*, a triple
+    like sys.exc_info() returns, and the program's threads."""
+    exc_type, exc_value, exc_tb = exc_info
+    sha1s = {}
+    scopes = {}
+    frames = []
+    for frame, lineno in walk_tb(exc_tb):
+        code = frame.f_code
+        module = frame.f_globals.get('__name__', '?')
+        if module not in scopes:
+            scopes[module] = scope_reprs(frame.f_globals)
+            pass
+        record = {'filename':    code.co_filename,
+                  'name':        code.co_name,
+                  'firstlineno': code.co_firstlineno,
+                  'lineno':      lineno,
+                  'flags':       code.co_flags,
+                  'argnames':    list(code.co_varnames[:arg_count(code)]),
+                  'module':      module,
+                  'sha1':        file_sha1(code.co_filename, sha1s)}
+        if frame.f_locals is not frame.f_globals:
+            record['locals'] = scope_reprs(frame.f_locals)
+            pass
+        frames.append(record)
+        pass
+    threads = []
+    names = dict([(t.ident, t.getName()) for t in threading.enumerate()])
+    me = threading.currentThread().ident
+    for ident, frame in sys._current_frames().items():
+        if ident == me: continue
+        threads.append({'name': names.get(ident, str(ident)),
+                        'stack': walk_stack(frame)})
+        pass
+    return {'pid':       os.getpid(),
+            'argv':      list(sys.argv),
+            'time':      time.time(),
+            'exception': [exc_type.__name__,
+                          getattr(exc_type, '__module__', ''),
+                          bounded_repr(exc_value), safe_str(exc_value)],
+            'traceback': ''.join(traceback.format_exception(*exc_info)),
+            'frames':    frames[-MAX_FRAMES:],
+            'globals':   scopes,
+            'threads':   threads}
+
+def arg_count(code):
+    """Return the number of argument names in *code*'s co_varnames."""
+    count = code.co_argcount
+    if code.co_flags & CO_VARARGS: count += 1
+    if code.co_flags & CO_VARKEYWORDS: count += 1
+    return count
+
+def walk_tb(tb):
+    """Yield the frame and line number of each traceback entry."""
+    while tb is not None:
+        yield tb.tb_frame, tb.tb_lineno
+        tb = tb.tb_next
+        pass
+    return
+
+def walk_stack(frame):
+    """Return [filename, lineno, name] for *frame* and its callers,
+    outermost first."""
+    stack = []
+    while frame is not None:
+        stack.append([frame.f_code.co_filename, frame.f_lineno,
+                      frame.f_code.co_name])
+        frame = frame.f_back
+        pass
+    stack.reverse()
+    return stack
+
+def safe_str(value):
+    try:
+        return str(value)
+    except:
+        return bounded_repr(value)
+    return
+
+def default_filename():
+    return 'trepan2.core.%d' % os.getpid()
+
+def write(exc_info, filename=None):
+    """Write a core file for *exc_info* to *filename*, by default
+    trepan2.core.<pid> in the current directory. Return the file name."""
+    if filename is None: filename = default_filename()
+    data = zlib.compress(json.dumps(capture(exc_info)), 9)
+    fp = open(filename, 'wb')
+    try:
+        fp.write(MAGIC)
+        fp.write(data)
+    finally:
+        fp.close()
+        pass
+    return filename
+
+def excepthook(exc_type, exc_value, exc_tb):
+    """An except hook that reports the exception and writes a core
+    file rather than entering the debugger."""
+    traceback.print_exception(exc_type, exc_value, exc_tb)
+    try:
+        filename = write((exc_type, exc_value, exc_tb))
+    except (IOError, OSError):
+        sys.stderr.write("Can't write core file: %s\n" % sys.exc_info()[1])
+        return
+    sys.stderr.write('Core file written to %s\n' % filename)
+    return
+
+def to_str(value):
+    """JSON gives us unicode strings. Turn them back into str."""
+    if isinstance(value, unicode):
+        return value.encode('utf-8')
+    elif isinstance(value, list):
+        return [to_str(item) for item in value]
+    elif isinstance(value, dict):
+        return dict([(to_str(key), to_str(item))
+                     for key, item in value.items()])
+    return value
+
+def read(filename):
+    """Return the saved data in core file *filename*. IOError is raised
+    if the file can't be read and ValueError if it isn't a core file."""
+    fp = open(filename, 'rb')
+    try:
+        magic = fp.read(len(MAGIC))
+        data  = fp.read()
+    finally:
+        fp.close()
+        pass
+    if magic != MAGIC:
+        raise ValueError('%s is not a trepan2 core file' % filename)
+    try:
+        return to_str(json.loads(zlib.decompress(data)))
+    except (zlib.error, ValueError):
+        raise ValueError('%s is damaged' % filename)
+    return
+
+class SavedValue(object):
+    '''The saved repr of a value that can't be rebuilt from it'''
+    def __init__(self, text):
+        self.text = text
+        return
+
+    def __repr__(self):
+        return self.text
+
+    __str__ = __repr__
+    pass
+
+class SavedException(Exception):
+    '''Stands in for the exception a core file was written for'''
+    def __init__(self, text):
+        Exception.__init__(self, text)
+        self.text = text
+        return
+
+    def __str__(self):
+        return self.text
+    pass
+
+def saved_value(text):
+    """Return the value whose repr is *text* if it is a literal,
+    otherwise a SavedValue showing it."""
+    try:
+        return ast.literal_eval(text)
+    except:
+        return SavedValue(text)
+    return
+
+def saved_scope(reprs):
+    return dict([(name, saved_value(text)) for name, text in reprs.items()])
+
+def stand_in(record, i, last):
+    """Return the code for frame *record*, the *i*'th of the traceback.
+    At its line it calls the stand-in for the next frame or, if *last*
+    is set, raises the exception."""
+    if last:
+        action = 'raise %sexc__' % HIDDEN
+    else:
+        action = '%s%d__(*%sargs_%d__)' % (HIDDEN, i+1, HIDDEN, i+1)
+        pass
+    lineno = max(1, record['lineno'])
+    if not record['flags'] & CO_OPTIMIZED:
+        # Module or class body
+        source = '\n' * (lineno-1) + action + '\n'
+        code = compile(source, record['filename'], 'exec')
+    else:
+        params = [name for name in record['argnames']
+                  if is_identifier(name)]
+        if record['flags'] & CO_VARKEYWORDS and params:
+            params[-1] = '**' + params[-1]
+            if record['flags'] & CO_VARARGS and len(params) > 1:
+                params[-2] = '*' + params[-2]
+                pass
+        elif record['flags'] & CO_VARARGS and params:
+            params[-1] = '*' + params[-1]
+            pass
+        # Only plain parameters are passed. The other variables,
+        # *args and **kwds included, are assigned at the frame's line.
+        body = ['%s = %slocals_%d__[%r]' % (name, HIDDEN, i, name)
+                for name in sorted(record.get('locals', {}))
+                if is_identifier(name) and name not in plain_params(record)]
+        body.append(action)
+        firstlineno = min(record['firstlineno'], lineno)
+        header = ('\n' * (firstlineno-1) +
+                  'def stand_in(%s):' % ', '.join(params))
+        if lineno == firstlineno:
+            source = header + ' ' + '; '.join(body) + '\n'
+        else:
+            source = (header + '\n' * (lineno-firstlineno) + '    ' +
+                      '; '.join(body) + '\n')
+            pass
+        module_code = compile(source, record['filename'], 'exec')
+        code = [c for c in module_code.co_consts
+                if isinstance(c, types.CodeType)][0]
+        pass
+    return types.CodeType(code.co_argcount, code.co_nlocals,
+                          code.co_stacksize, code.co_flags, code.co_code,
+                          code.co_consts, code.co_names, code.co_varnames,
+                          code.co_filename, record['name'],
+                          code.co_firstlineno, code.co_lnotab,
+                          code.co_freevars, code.co_cellvars)
+
+def plain_params(record):
+    """Return the names of the parameters of frame *record*, other
+    than *args and **kwds."""
+    names = record['argnames']
+    if record['flags'] & CO_VARKEYWORDS: names = names[:-1]
+    if record['flags'] & CO_VARARGS: names = names[:-1]
+    return [name for name in names if is_identifier(name)]
+
+def rebuild(core):
+    """Return an exception triple, like sys.exc_info() returns, for
+    the exception saved in *core*. Its traceback has a frame standing in
+    for each saved frame. The traceback starts with the innermost frame;
+    follow f_back to get to the others. The traceback is None if the
+    frames couldn't be rebuilt."""
+    import __builtin__
+    frames = core['frames']
+    scopes = {}
+    for module, reprs in core['globals'].items():
+        scopes[module] = saved_scope(reprs)
+        scopes[module]['__builtins__'] = __builtin__
+        pass
+    exc_name, exc_module, exc_repr, exc_str = core['exception']
+    exc_class = type(exc_name, (SavedException,), {'__module__': exc_module})
+    calls = []
+    for i, record in enumerate(frames):
+        code = stand_in(record, i, i == len(frames)-1)
+        scope = scopes.setdefault(record['module'],
+                                  {'__builtins__': __builtin__})
+        if 'locals' in record:
+            local_scope = saved_scope(record['locals'])
+        else:
+            local_scope = scope
+            pass
+        if record['flags'] & CO_OPTIMIZED:
+            fn = types.FunctionType(code, scope)
+            args = tuple([local_scope.get(name, SavedValue('?'))
+                          for name in plain_params(record)])
+        else:
+            fn = eval
+            args = (code, scope, local_scope)
+            pass
+        if i > 0:
+            calls[-1][0]['%s%d__' % (HIDDEN, i)] = fn
+            calls[-1][0]['%sargs_%d__' % (HIDDEN, i)] = args
+            pass
+        scope['%slocals_%d__' % (HIDDEN, i)] = local_scope
+        calls.append((scope, fn, args))
+        pass
+    exc_value = exc_class(exc_str)
+    if not calls: return exc_class, exc_value, None
+    calls[-1][0][HIDDEN + 'exc__'] = exc_value
+    tb = None
+    try:
+        try:
+            scope, fn, args = calls[0]
+            fn(*args)
+        except SavedException:
+            tb = sys.exc_info()[2]
+        except Exception:
+            # The stand-ins didn't get to the innermost frame, so
+            # their frames aren't the saved ones.
+            pass
+    finally:
+        # The frames are done with the names we added.
+        for scope in scopes.values():
+            for name in [name for name in scope if name.startswith(HIDDEN)]:
+                del scope[name]
+                pass
+            pass
+        pass
+    if tb is None: return exc_class, exc_value, None
+    while tb.tb_next is not None: tb = tb.tb_next
+    return exc_class, exc_value, tb
+
+def changed_files(core):
+    """Return the names of the source files in *core* that have changed
+    since it was written."""
+    sha1s = {}
+    changed = []
+    for record in core['frames']:
+        filename = record['filename']
+        if filename in sha1s: continue
+        if file_sha1(filename, sha1s) != record['sha1']:
+            changed.append(filename)
+            pass
+        pass
+    return changed
+
+# Demo it
+if __name__=='__main__':
+    import tempfile
+    def foo(a, b=2, *args, **kwds):
+        x = [1, 2, 3]
+        return a / 0
+    try:
+        foo(1)
+    except:
+        fd, filename = tempfile.mkstemp()
+        os.close(fd)
+        write(sys.exc_info(), filename)
+        pass
+    core = read(filename)
+    os.unlink(filename)
+    exc_type, exc_value, tb = rebuild(core)
+    print(exc_type, exc_value)
+    traceback.print_stack(tb.tb_frame)
+    print(tb.tb_frame.f_locals)
+    pass
@@ -121,12 +121,20 @@ DEBUGGER_SETTINGS = {
     # Reread source file if we determine it has changed?
     'reload'        : False,
 
+    # Coalesce signals that arrive quickly, printing or stopping for
+    # them once at the next trace event rather than for each signal?
+    'sigcoalesce'   : True,
+
     # Stop at 'def' and 'class' statements?
     'skip'          : True,
 
     # print trace output?
     'trace'         : False,
 
+    # If not None, the path of a ring buffer file that trace output is
+    # written into rather than printed. See "set tracebuffer".
+    'tracebuffer'   : None,
+
     # The target maximum print length. Used for example in listing
     # arrays which are columnized.
     'width'         : width
@@ -134,14 +142,16 @@ DEBUGGER_SETTINGS = {
 
 CLIENT_SOCKET_OPTS = {
     'HOST': '127.0.0.1',
-    'PORT': 1027          # Arbitrary non-privileged port
+    'PORT': 1027,         # Arbitrary non-privileged port
+    'SOCKET': None        # Path of a UNIX-domain socket
     }
 
 
 SERVER_SOCKET_OPTS = {
     'HOST':  None,   # Symbolic name meaning all available interfaces
     'PORT':  1027,   # Arbitrary non-privileged port
-    'reuse': 'posix' == os.name # Allow port to be resued on close?
+    'reuse': 'posix' == os.name, # Allow port to be resued on close?
+    'SOCKET': None,  # Path of a UNIX-domain socket; None: by pid in temp dir
     }
 
 # Default settings on the Debugger#start() method call
@@ -150,6 +160,7 @@ START_OPTS = {
     'backlevel'     : 0,      # trace caller and frames created from that
     'event_set'     : tracer.ALL_EVENTS,
     'force'         : False,  # Force a new event handler?
+    'include_threads': False, # Trace threads started from now on?
     'start'         : False,
     }
 
@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+#   Copyright (C) 2014 Rocky Bernstein <rocky@gnu.org>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Cached, incremental syntax highlighting of source lines.
+
+pyficache highlights a whole file in one go and throws that away
+whenever it rereads the file. For big files that is slow. Here we
+split a file into *segments* at the start of each top-level statement;
+the Pygments lexer is always in its initial state at such a point, so
+each segment can be highlighted on its own. Segments are highlighted
+only when a line in them is asked for.
+
+Highlighted lines are kept keyed by the SHA1 of the file text and the
+highlight style. When a file changes we diff the old and new text and
+keep the highlighting of those segments which are unchanged.
+"""
+import bisect, difflib, hashlib
+import pyficache
+
+try:
+    import ast
+except ImportError:
+    # Python 2.5 and before. We will treat each file as a single
+    # segment.
+    ast = None
+    pass
+
+class HighlightInfo:
+    '''Plain text and segment boundaries of a cached file'''
+    def __init__(self, plain, sha1):
+        self.plain  = plain   # Lines as pyficache gives them
+        self.sha1   = sha1
+        self.bounds = segment_starts(plain)
+        return
+    pass
+
+# Pygments lexer and formatters, created on first use.
+python_lexer = None
+terminal_formatters = {}
+
+# Maps a filename to its HighlightInfo.
+file_cache = {}
+
+# Maps a (sha1, style) tuple to an array of highlighted lines with
+# one entry per plain line. An entry is None if its segment has not
+# been highlighted yet.
+highlight_cache = {}
+
+def clear_cache(filename=None):
+    """Clear the highlight cache. If no filename is given clear it
+    entirely, otherwise just that for *filename*."""
+    global file_cache, highlight_cache
+    if filename is None:
+        file_cache = {}
+        highlight_cache = {}
+    elif filename in file_cache:
+        sha1 = file_cache[filename].sha1
+        del file_cache[filename]
+        for key in list(highlight_cache.keys()):
+            if key[0] == sha1: del highlight_cache[key]
+            pass
+        pass
+    return
+
+def lines_sha1(lines):
+    sha1 = hashlib.sha1()
+    for line in lines:
+        try:
+            sha1.update(line)
+        except (TypeError, UnicodeError):
+            sha1.update(line.encode('utf-8'))
+            pass
+        pass
+    return sha1.hexdigest()
+
+def segment_starts(lines):
+    """Return a sorted list of the 0-origin indices of *lines* at which a
+    top-level statement starts. The first entry is always 0. If *lines*
+    isn't valid Python, the whole file is a single segment."""
+    if ast is None: return [0]
+    try:
+        tree = compile(''.join(lines), '<highlight>', 'exec',
+                       ast.PyCF_ONLY_AST, True)
+    except:
+        return [0]
+    starts = set([0])
+    for node in tree.body:
+        # Before Python 3.8 a multi-line string statement gets the
+        # line number of its *last* line and a column offset of -1.
+        # Those aren't good places to split.
+        if 0 == node.col_offset:
+            starts.add(node.lineno - 1)
+            pass
+        pass
+    return sorted(starts)
+
+def highlight_segment(info, hilite, start, style):
+    """Fill in highlighted lines of *hilite* for the segment starting at
+    index *start*."""
+    i = bisect.bisect_right(info.bounds, start)
+    if i < len(info.bounds):
+        end = info.bounds[i]
+    else:
+        end = len(info.plain)
+        pass
+    segment = info.plain[start:end]
+    fmt_lines = [line + '\n' for line in
+                 highlight_string(''.join(segment), style).split('\n')]
+    if len(fmt_lines) < len(segment):
+        # Shouldn't happen, but don't leave holes
+        fmt_lines += segment[len(fmt_lines):]
+        pass
+    hilite[start:end] = fmt_lines[:len(segment)]
+    return
+
+def highlight_string(string, style):
+    """Highlight *string* for a terminal with a *style* ('light' or
+    'dark') background."""
+    global python_lexer
+    if python_lexer is None:
+        from pygments.lexers import PythonLexer
+        # Unlike pyficache, don't strip leading and trailing newlines:
+        # that would shift the lines of a segment.
+        python_lexer = PythonLexer(stripnl=False)
+        pass
+    formatter = terminal_formatters.get(style)
+    if formatter is None:
+        from pygments.formatters import TerminalFormatter
+        formatter = terminal_formatters[style] = TerminalFormatter(bg=style)
+        pass
+    from pygments import highlight
+    return highlight(string, python_lexer, formatter)
+
+def update_info(filename, plain):
+    """Make sure the cache entry for *filename* reflects *plain*, the
+    current text of the file. If the file has changed, keep the
+    highlighted segments that are still valid."""
+    old_info = file_cache.get(filename)
+    if old_info and old_info.plain is plain:
+        return old_info
+    sha1 = lines_sha1(plain)
+    if old_info and old_info.sha1 == sha1:
+        old_info.plain = plain
+        return old_info
+    info = HighlightInfo(plain, sha1)
+    file_cache[filename] = info
+    if not old_info: return info
+
+    # The file has changed. For every highlighting of the old text
+    # carry over the segments whose lines are unchanged and which
+    # started a segment in the old text as well.
+    matcher = difflib.SequenceMatcher(None, old_info.plain, plain, False)
+    new2old = {}
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if 'equal' == tag:
+            for k in range(j2-j1):
+                new2old[j1+k] = i1+k
+                pass
+            pass
+        pass
+    old_bounds = set(old_info.bounds)
+    for key in list(highlight_cache.keys()):
+        if key[0] != old_info.sha1: continue
+        old_hilite = highlight_cache[key]
+        del highlight_cache[key]
+        hilite = [None] * len(plain)
+        for k, start in enumerate(info.bounds):
+            if k+1 < len(info.bounds):
+                end = info.bounds[k+1]
+            else:
+                end = len(plain)
+                pass
+            if new2old.get(start) not in old_bounds: continue
+            old_start = new2old[start]
+            for j in range(start, end):
+                if new2old.get(j) != old_start + j - start: break
+                pass
+            else:
+                hilite[start:end] = old_hilite[old_start:old_start+end-start]
+                pass
+            pass
+        highlight_cache[(sha1, key[1])] = hilite
+        pass
+    return info
+
+def getlines(filename, opts={}):
+    """Like pyficache.getlines(), but highlighted lines come from
+    our cache. Returns None if we can not get lines."""
+    style = opts.get('output', 'plain')
+    filename = pyficache.unmap_file(filename)
+    plain_opts = {'reload_on_change': opts.get('reload_on_change', False),
+                  'output': 'plain'}
+    plain = pyficache.getlines(filename, plain_opts)
+    if 'plain' == style or not plain: return plain
+    info = update_info(filename, plain)
+    key  = (info.sha1, style)
+    hilite = highlight_cache.get(key)
+    if hilite is None:
+        hilite = highlight_cache[key] = [None] * len(plain)
+        pass
+    if None in hilite:
+        for start in info.bounds:
+            if hilite[start] is None:
+                highlight_segment(info, hilite, start, style)
+                pass
+            pass
+        pass
+    return hilite
+
+def getline(filename, line_number, opts={}):
+    """Like pyficache.getline(): get line *line_number* from
+    *filename*. Return None if there was a problem or it is not
+    found. Only the segment containing the line is highlighted."""
+    style = opts.get('output', 'plain')
+    if 'plain' == style:
+        return pyficache.getline(filename, line_number, opts)
+    filename = pyficache.unmap_file(filename)
+    filename, line_number = pyficache.unmap_file_line(filename, line_number)
+    plain_opts = {'reload_on_change': opts.get('reload_on_change', False),
+                  'output': 'plain'}
+    plain = pyficache.getlines(filename, plain_opts)
+    if not plain or line_number < 1 or line_number > len(plain):
+        return None
+    line = info_line(update_info(filename, plain), line_number, style)
+    if opts.get('strip_nl', True):
+        return line.rstrip('\n')
+    return line
+
+def info_line(info, line_number, style):
+    """Return line *line_number* of the text that *info* describes,
+    highlighted in *style*."""
+    i = line_number - 1
+    if 'plain' == style: return info.plain[i]
+    key  = (info.sha1, style)
+    hilite = highlight_cache.get(key)
+    if hilite is None:
+        hilite = highlight_cache[key] = [None] * len(info.plain)
+        pass
+    if hilite[i] is None:
+        start = info.bounds[bisect.bisect_right(info.bounds, i) - 1]
+        highlight_segment(info, hilite, start, style)
+        pass
+    return hilite[i]
+
+# Demo it
+if __name__=='__main__':
+    import os
+    filename = os.path.abspath(__file__)
+    opts = {'output': 'light', 'strip_nl': False}
+    for lineno in (1, 30, 31):
+        print(getline(filename, lineno, opts))
+        pass
+    info = file_cache[filename]
+    print('%d segments in %d lines' % (len(info.bounds), len(info.plain)))
+    hilite = highlight_cache[(info.sha1, 'light')]
+    print('%d lines highlighted' % len([l for l in hilite if l is not None]))
+    pass
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+#   Copyright (C) 2014 Rocky Bernstein <rocky@gnu.org>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Index of loaded modules by file, and of the files the debugger knows.
+
+Programs can have thousands of modules loaded, so rather than scan
+*sys.modules* each time we want the modules for a file, we keep a
+file-to-modules map. It is brought up to date only when the number of
+entries in *sys.modules*, or in pyficache's file cache, has changed
+since we last looked. Just the added and removed entries are processed
+then.
+
+File names are kept sorted so that names with a given prefix, or
+suffix, are found by binary search.
+"""
+import bisect, os, sys
+import pyficache
+
+class SortedNames:
+    '''A set of strings which can be searched by prefix or suffix'''
+    def __init__(self):
+        self.members = set()
+        self.names   = []  # Sorted names
+        self.rnames  = []  # Sorted reversed names, for suffix searches
+        return
+
+    def __contains__(self, name):
+        return name in self.members
+
+    def __len__(self):
+        return len(self.members)
+
+    def add(self, name):
+        if name in self.members: return
+        self.members.add(name)
+        bisect.insort(self.names, name)
+        bisect.insort(self.rnames, name[::-1])
+        return
+
+    def remove(self, name):
+        if name not in self.members: return
+        self.members.remove(name)
+        del self.names[bisect.bisect_left(self.names, name)]
+        del self.rnames[bisect.bisect_left(self.rnames, name[::-1])]
+        return
+
+    def starting_with(self, prefix):
+        """Return the sorted list of names starting with *prefix*."""
+        return prefix_range(self.names, prefix)
+
+    def ending_with(self, suffix):
+        """Return the sorted list of names ending in *suffix*."""
+        return sorted([rname[::-1] for rname in
+                       prefix_range(self.rnames, suffix[::-1])])
+    pass
+
+def prefix_range(names, prefix):
+    """Return the entries of sorted list *names* that start with
+    *prefix*."""
+    lo = bisect.bisect_left(names, prefix)
+    hi = lo
+    while hi < len(names) and names[hi].startswith(prefix):
+        hi += 1
+        pass
+    return names[lo:hi]
+
+# Maps a module name to the canonic name of its source file.
+module2file = {}
+
+# Maps a canonic file name to the set of module names loaded from it.
+file2modules = {}
+
+# Files pyficache has cached or has remapped.
+debugger_files = SortedNames()
+
+# Sizes seen at the last refresh. -1 means never refreshed.
+modules_seen = -1
+files_seen   = -1
+
+def canonic(filename):
+    """Our canonic form of a module's __file__: the absolute name of the
+    source rather than of the compiled file."""
+    if filename.endswith('.pyc') or filename.endswith('.pyo'):
+        filename = filename[:-1]
+        pass
+    return os.path.normcase(os.path.abspath(filename))
+
+def add_module(modname, filename):
+    filename = canonic(filename)
+    module2file[modname] = filename
+    file2modules.setdefault(filename, set()).add(modname)
+    return
+
+def remove_module(modname):
+    filename = module2file.pop(modname)
+    modnames = file2modules[filename]
+    modnames.discard(modname)
+    if not modnames: del file2modules[filename]
+    return
+
+def refresh_modules():
+    """Bring the module indices up to date with *sys.modules*."""
+    global modules_seen
+    if len(sys.modules) == modules_seen: return
+    loaded = {}
+    for modname, mod in list(sys.modules.items()):
+        filename = getattr(mod, '__file__', None)
+        if filename: loaded[modname] = filename
+        pass
+    for modname in [m for m in module2file if m not in loaded]:
+        remove_module(modname)
+        pass
+    for modname, filename in loaded.items():
+        if modname not in module2file:
+            add_module(modname, filename)
+            pass
+        pass
+    modules_seen = len(sys.modules)
+    return
+
+def refresh_files():
+    """Bring the set of debugger files up to date with pyficache."""
+    global files_seen
+    count = len(pyficache.file_cache) + len(pyficache.file2file_remap)
+    if count == files_seen: return
+    current = set(pyficache.cached_files())
+    current.update(pyficache.file2file_remap.keys())
+    for filename in [f for f in debugger_files.members if f not in current]:
+        debugger_files.remove(filename)
+        pass
+    for filename in current:
+        debugger_files.add(filename)
+        pass
+    files_seen = count
+    return
+
+def modules_for_file(filename):
+    """Return the sorted list of names of loaded modules whose source is
+    *filename*."""
+    refresh_modules()
+    return sorted(file2modules.get(canonic(filename), []))
+
+def complete(prefix):
+    """Return the sorted list of debugger file names starting with
+    *prefix*."""
+    refresh_files()
+    return debugger_files.starting_with(prefix)
+
+def files_ending_with(suffix):
+    """Return the sorted list of debugger file names ending with
+    *suffix*."""
+    refresh_files()
+    return debugger_files.ending_with(suffix)
+
+# Demo it
+if __name__=='__main__':
+    print(modules_for_file(os.__file__))
+    print(len(module2file))
+    pyficache.cache_file(os.path.abspath(__file__))
+    print(complete(os.path.dirname(os.path.abspath(__file__))))
+    print(files_ending_with('modindex.py'))
+    pass
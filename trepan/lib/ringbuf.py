@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+#   Copyright (C) 2014 Rocky Bernstein <rocky@gnu.org>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""A ring buffer of trace events in a memory-mapped file, written by
+the debugged program and read by a viewer in another process.
+
+Sending each event over a socket or FIFO costs a system call or two;
+here writing one is a copy into shared memory. The file starts with a
+header giving the size of the ring and three counters: the events
+written, the events the reader has read, and the events dropped. Then
+come *slots* records of RECORD_SIZE bytes each.
+
+There is one writer and at most one reader. Only the writer changes
+the written and dropped counts, and only the reader the read count. A
+record is filled in before the written count is raised past it, and
+the writer never reuses a slot the reader hasn't read. When the ring
+is full, the writer doesn't wait: it drops the event and counts it.
+Threads of the writing process take turns through a lock.
+
+Nothing here but the standard library is imported.
+"""
+import mmap, os, struct, tempfile, threading, time
+
+MAGIC   = 'trepring'
+VERSION = 1
+
+# magic, version, record size, slots
+HEADER  = struct.Struct('<8sIII')
+COUNT   = struct.Struct('<Q')
+WRITTEN_OFFSET = 24
+READ_OFFSET    = 32
+DROPPED_OFFSET = 40
+HEADER_SIZE    = 64
+
+# time, line number, thread id, event, function name, file name, repr
+# of the event argument. File names that don't fit keep their end.
+RECORD = struct.Struct('<dII12s40s128s60s')
+RECORD_SIZE = RECORD.size
+
+DEFAULT_SLOTS = 4096
+
+def fit(s, size, keep_end=False):
+    """Return *s* as a byte string of at most *size* bytes."""
+    if isinstance(s, unicode): s = s.encode('utf-8', 'replace')
+    if len(s) <= size: return s
+    if keep_end: return s[len(s)-size:]
+    return s[:size]
+
+class Event:
+    '''A trace event read from a ring buffer'''
+    def __init__(self, record):
+        (self.time, self.lineno, self.thread, event, fn_name,
+         filename, arg) = RECORD.unpack(record)
+        self.event    = event.rstrip('\0')
+        self.fn_name  = fn_name.rstrip('\0')
+        self.filename = filename.rstrip('\0')
+        self.arg      = arg.rstrip('\0')
+        return
+
+    def __str__(self):
+        s = '%s - %s:%d' % (self.event, self.filename, self.lineno)
+        if self.arg: s += ', %s' % self.arg
+        return s
+    pass
+
+class RingWriter:
+    '''The writing end of a ring buffer. Creating one creates the file
+    *path*, or replaces it if it exists. A new file is written and
+    renamed to *path*, so a reader of the old one can go on reading it
+    and sees that *path* is now another file.'''
+    def __init__(self, path, slots=DEFAULT_SLOTS):
+        self.path    = path
+        self.slots   = slots
+        self.written = 0
+        self.dropped = 0
+        self.lock    = threading.Lock()
+        size = HEADER_SIZE + slots * RECORD_SIZE
+        dirname, basename = os.path.split(os.path.abspath(path))
+        fd, tmpname = tempfile.mkstemp(dir=dirname, prefix='.' + basename)
+        try:
+            os.ftruncate(fd, size)
+            self.map = mmap.mmap(fd, size)
+            HEADER.pack_into(self.map, 0, MAGIC, VERSION, RECORD_SIZE,
+                             slots)
+            os.rename(tmpname, path)
+        except:
+            os.unlink(tmpname)
+            raise
+        finally:
+            os.close(fd)
+            pass
+        return
+
+    def close(self):
+        self.lock.acquire()
+        try:
+            if self.map:
+                self.map.close()
+                self.map = None
+                pass
+        finally:
+            self.lock.release()
+            pass
+        return
+
+    def write(self, event, filename, lineno, fn_name='', arg='',
+              thread=0):
+        '''Add an event to the ring. Return False if it was full, or
+        the ring is closed, and the event was dropped. Any thread may
+        call this.'''
+        record = (time.time(), lineno, thread & 0xffffffff,
+                  fit(event, 12), fit(fn_name, 40),
+                  fit(filename, 128, True), fit(arg, 60))
+        self.lock.acquire()
+        try:
+            if not self.map: return False
+            read = COUNT.unpack_from(self.map, READ_OFFSET)[0]
+            if self.written - read >= self.slots:
+                self.dropped += 1
+                COUNT.pack_into(self.map, DROPPED_OFFSET, self.dropped)
+                return False
+            offset = HEADER_SIZE + (self.written % self.slots) * RECORD_SIZE
+            RECORD.pack_into(self.map, offset, *record)
+            self.written += 1
+            COUNT.pack_into(self.map, WRITTEN_OFFSET, self.written)
+        finally:
+            self.lock.release()
+            pass
+        return True
+    pass
+
+class RingReader:
+    '''The reading end of a ring buffer written by a RingWriter.
+    IOError is raised if *path* isn't one.'''
+    def __init__(self, path):
+        self.path = path
+        fd = os.open(path, os.O_RDWR)
+        try:
+            size = os.fstat(fd).st_size
+            if size < HEADER_SIZE:
+                raise IOError('%s is not a trace ring buffer' % path)
+            self.map = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+            pass
+        magic, version, record_size, self.slots = \
+            HEADER.unpack_from(self.map, 0)
+        if (magic != MAGIC or version != VERSION or
+            record_size != RECORD_SIZE or
+            size < HEADER_SIZE + self.slots * RECORD_SIZE):
+            self.close()
+            raise IOError('%s is not a trace ring buffer' % path)
+        return
+
+    def close(self):
+        if self.map:
+            self.map.close()
+            self.map = None
+            pass
+        return
+
+    def count(self, offset):
+        return COUNT.unpack_from(self.map, offset)[0]
+
+    def dropped(self):
+        '''Return the number of events the writer has dropped.'''
+        return self.count(DROPPED_OFFSET)
+
+    def read(self):
+        '''Return a list of the events written since the last read.'''
+        written = self.count(WRITTEN_OFFSET)
+        read    = self.count(READ_OFFSET)
+        events  = []
+        for i in range(read, written):
+            offset = HEADER_SIZE + (i % self.slots) * RECORD_SIZE
+            events.append(Event(self.map[offset:offset+RECORD_SIZE]))
+            pass
+        COUNT.pack_into(self.map, READ_OFFSET, written)
+        return events
+    pass
+
+# Demo
+if __name__=='__main__':
+    import tempfile
+    path = tempfile.mktemp()
+    writer = RingWriter(path, 4)
+    reader = RingReader(path)
+    for lineno in range(1, 7):
+        writer.write('line', __file__, lineno, '<module>')
+        pass
+    for event in reader.read(): print(event)
+    print('%d dropped' % reader.dropped())
+    reader.close()
+    writer.close()
+    os.unlink(path)
+    pass
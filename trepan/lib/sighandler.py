@@ -20,7 +20,7 @@
 #         ignore=True, print=False, pass=True
 #
 #
-import signal
+import signal, time
 
 def YN(b):
     """Return 'Yes' for True and 'No' for False, and ?? for anything
@@ -34,26 +34,14 @@ def YN(b):
 def lookup_signame(num):
     """Find the corresponding signal name for 'num'. Return None
     if 'num' is invalid."""
-    signames = signal.__dict__
-    num = abs(num)
-    for signame in list(signames.keys()):
-        if signames[signame] == num: return signame
-        pass
-    # Something went wrong. Should have returned above
-    return None
+    return signum2name.get(abs(num))
 
 def lookup_signum(name):
     """Find the corresponding signal number for 'name'. Return None
     if 'name' is invalid."""
     uname = name.upper()
-    if (uname.startswith('SIG') and hasattr(signal, uname)):
-        return getattr(signal, uname)
-    else:
-        uname = "SIG"+uname
-        if hasattr(signal, uname):
-            return getattr(signal, uname)
-        return None
-    return # Not reached
+    if uname in signame2num: return signame2num[uname]
+    return signame2num.get('SIG' + uname)
 
 def canonic_signame(name_num):
     """Return a signal name for a signal name or signal
@@ -125,6 +113,35 @@ signal_description = {
   "SIGSAK"    : "Secure attention"
   }
 
+# Signal names on this OS, e.g. SIGINT, mapped to their numbers.
+signame2num = {}
+for signame, signum in list(signal.__dict__.items()):
+    if signame.startswith('SIG') and '_' not in signame:
+        signame2num[signame] = signum
+        pass
+    pass
+
+# signal.signal() before any SignalManager replaced it. Each manager
+# sets handlers with this rather than with another manager's
+# replacement.
+orig_set_signal = signal.signal
+
+# The sorted list of signal names.
+signames = sorted(signame2num.keys())
+
+# Signal numbers mapped to names. Some numbers have more than one
+# name, like SIGABRT and SIGIOT; we prefer a name that has a
+# description, and after that the first one alphabetically.
+signum2name = {}
+for signame in signames:
+    signum = signame2num[signame]
+    if (signum not in signum2name or
+        (signame in signal_description and
+         signum2name[signum] not in signal_description)):
+        signum2name[signum] = signame
+        pass
+    pass
+
 
 class SignalManager:
     """Manages Signal Handling information for the debugger
@@ -141,22 +158,44 @@ class SignalManager:
     All the methods which change these attributes return None on error, or
     True/False if we have set the action (pass/print/stop) for a signal
     handler.
+
+    A SigHandler is created for a signal, and our handler installed
+    for it, only when its actions are changed or the program sets a
+    handler for it. Until then the default actions are reported for it.
+
+    When the *sigcoalesce* setting is on and the program is being
+    traced, a signal that we print or stop for is just noted in
+    *pending*, and repeats of it add to its count. At a trace event
+    process_pending() then prints or stops once for each signal. Signals
+    we stop for are processed at the next trace event; when we only
+    print, we wait until *coalesce_interval* seconds have passed since
+    we last printed so that a burst of signals gives a message or two.
     """
     def __init__(self, dbgr, ignore_list=None, default_print=True):
         self.dbgr    = dbgr
-        # dbgr.core.add_ignore(SigHandler.handle)
+        # Don't trace our handler: it can run for every signal in a burst.
+        dbgr.core.add_ignore(SigHandler.handle)
         self.sigs    = {}
-        self.siglist = [] # List of signals. Dunno why signal doesn't provide.
+        self.siglist = signames
+
+        # Signals received and not yet processed. Maps a signal number
+        # to [count, SigHandler].
+        self.pending = {}
+
+        # Seconds between printing coalesced signals, and the time
+        # after which pending signals are next processed.
+        self.coalesce_interval = 0.1
+        self.process_time      = 0
 
         # Ignore signal handling initially for these known signals.
         if ignore_list is None:
             ignore_list = ['SIGALRM',    'SIGCHLD',  'SIGURG',
                            'SIGIO',      'SIGCLD',
-                           'SIGVTALRM'   'SIGPROF',  'SIGWINCH',  'SIGPOLL',
+                           'SIGVTALRM',  'SIGPROF',  'SIGWINCH',  'SIGPOLL',
                            'SIGWAITING', 'SIGLWP',   'SIGCANCEL', 'SIGTRAP',
                            'SIGTERM',    'SIGQUIT',  'SIGILL']
         self.ignore_list = ignore_list
-        self._orig_set_signal  = signal.signal
+        self._orig_set_signal  = orig_set_signal
         signal.signal = self.set_signal_replacement
 
         self.info_fmt='%-14s%-4s\t%-4s\t%-5s\t%-4s\t%s'
@@ -164,15 +203,43 @@ class SignalManager:
                                         'Stack', 'Pass',
                                         'Description')
 
-        if default_print: default_print = self.dbgr.intf[-1].msg
+        self.action('SIGINT stop print nostack nopass')
+        return
 
-        for signame in list(signal.__dict__.keys()):
-            # Look for a signal name on this os.
-            if signame.startswith('SIG') and '_' not in signame:
-                self.siglist.append(signame)
-                self.initialize_handler(signame)
+    def process_pending(self, frame, force=False):
+        """Handle the pending signals if it is time to, or if *force* is
+        set. *frame* is the frame of the current trace event. Return
+        True if we stopped for one of them."""
+        if not force and time.time() < self.process_time: return False
+        # Signals arriving from here on go in a new dictionary.
+        pending, self.pending = self.pending, {}
+        stopped = False
+        for signum in sorted(pending.keys()):
+            count, sighandler = pending[signum]
+            if sighandler.deliver(signum, frame, count): stopped = True
             pass
-        self.action('SIGINT stop print nostack nopass')
+        self.process_time = time.time() + self.coalesce_interval
+        return stopped
+
+    def restore(self):
+        """Put back the program's handlers in place of ours, and the
+        real signal.signal(). After this we see no more signals."""
+        if signal.signal == self.set_signal_replacement:
+            signal.signal = self._orig_set_signal
+            pass
+        for sighandler in list(self.sigs.values()):
+            try:
+                if signal.getsignal(sighandler.signum) != sighandler.handle:
+                    continue
+                old_handler = sighandler.old_handler
+                if old_handler is None: old_handler = signal.SIG_DFL
+                self._orig_set_signal(sighandler.signum, old_handler)
+            except ValueError:
+                # Not a signal we can handle, or not in the main thread
+                pass
+            pass
+        self.sigs    = {}
+        self.pending = {}
         return
 
     def initialize_handler(self, signame):
@@ -214,6 +281,10 @@ class SignalManager:
             self.dbgr.intf[-1].errmsg(("%s is not a signal number" +
                                        " I know about.")  % signum)
             return False
+        if signame not in self.sigs:
+            if not self.initialize_handler(signame):
+                return self._orig_set_signal(signum, handle)
+            pass
         # Since the intent is to set a handler, we should pass this
         # signal on to the handler
         self.sigs[signame].pass_along = True
@@ -280,11 +351,16 @@ class SignalManager:
         else:
             description=""
             pass
-        if signame not in list(self.sigs.keys()):
-            # Fake up an entry as though signame were in sigs.
-            self.dbgr.intf[-1].msg(self.info_fmt
-                                   % (signame, 'No', 'No', 'No', 'Yes',
-                                      description))
+        if signame not in self.sigs:
+            # Fake up an entry with the actions initialize_handler()
+            # would give it.
+            if signame in fatal_signals or signame in self.ignore_list:
+                actions = ('No', 'No', 'No', 'Yes')
+            else:
+                actions = ('Yes', 'Yes', 'No', 'No')
+                pass
+            self.dbgr.intf[-1].msg(self.info_fmt %
+                                   ((signame,) + actions + (description,)))
             return
 
         sig_obj = self.sigs[signame]
@@ -339,7 +415,7 @@ class SignalManager:
         if signame in fatal_signals:
             return None
 
-        if signame not in list(self.sigs.keys()):
+        if signame not in self.sigs:
             if not self.initialize_handler(signame): return None
             pass
 
@@ -444,9 +520,45 @@ class SigHandler:
 
     def handle(self, signum, frame):
         """This method is called when a signal is received."""
+        if self.print_method or self.b_stop:
+            # While tracing, every Python call made here is traced too,
+            # so the coalescing path makes none.
+            core = self.dbgr.core
+            if (self.dbgr.settings['sigcoalesce'] and core.trace_hooked
+                and not core.trace_hook_suspend):
+                sigmgr = self.dbgr.sigmgr
+                entry = sigmgr.pending.get(signum)
+                if entry:
+                    entry[0] += 1
+                else:
+                    sigmgr.pending[signum] = [1, self]
+                    pass
+                # Don't keep the program running when we should stop.
+                if self.b_stop: sigmgr.process_time = 0
+            else:
+                self.deliver(signum, frame)
+                pass
+            pass
+        if self.pass_along:
+            # pass the signal to the program
+            if self.old_handler:
+                self.old_handler(signum, frame)
+                pass
+            pass
+        return
+
+    def deliver(self, signum, frame, count=1):
+        """Print and stop, as set, for *count* receipts of signal
+        *signum*. Return True if we stopped."""
         if self.print_method:
-            self.print_method('\nProgram received signal %s.'
-                              % self.signame)
+            if 1 == count:
+                self.print_method('\nProgram received signal %s.'
+                                  % self.signame)
+            else:
+                self.print_method('\nProgram received signal %s %d times.'
+                                  % (self.signame, count))
+                pass
+            pass
         if self.print_stack:
             import traceback
             strings = traceback.format_stack(frame)
@@ -463,14 +575,8 @@ class SigHandler:
                                 (self.signame, signum))
             core.processor.event_processor(frame, 'signal', signum)
             core.trace_hook_suspend = old_trace_hook_suspend
-            pass
-        if self.pass_along:
-            # pass the signal to the program
-            if self.old_handler:
-                self.old_handler(signum, frame)
-                pass
-            pass
-        return
+            return True
+        return False
     pass
 
 # When invoked as main program, do some basic tests of a couple of functions
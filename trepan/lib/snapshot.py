@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+#   Copyright (C) 2014 Rocky Bernstein <rocky@gnu.org>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Checkpoints: restarting a program from a snapshot taken with fork().
+
+Restarting a program by running it again means importing all of its
+modules again. Instead, when a checkpoint is taken the process forks.
+The parent keeps the snapshot: it just waits for the child, which goes
+on debugging. Since fork() copies memory only as pages are written, a
+checkpoint costs little. To restart, the child sends the parent its
+breakpoints and settings over a pipe and exits. The parent takes these
+and forks a new child, which starts off where the checkpoint was taken.
+
+A checkpoint can be taken in a process that was itself started from a
+checkpoint, so checkpoints form a chain of processes. Messages to a
+checkpoint are passed back along the chain until they reach the process
+holding it. Restarting from a checkpoint ends those taken after it,
+since they are in a future that didn't happen. A deleted checkpoint's
+process stays on only to pass messages along. When a child finishes
+without asking for a restart, each process up the chain exits with the
+same status.
+
+fork() copies only the thread calling it, so no checkpoint is taken
+while the program has other threads running.
+"""
+import errno, os, pickle, signal, struct, sys
+from import_relative import import_relative
+
+Mtracelines = import_relative('tracelines', '.', 'trepan')
+Msig        = import_relative('sighandler', '.', 'trepan')
+Mthread     = import_relative('thred', '.', 'trepan')
+
+class Snapshot:
+    '''A checkpoint held by an ancestor process'''
+    def __init__(self, number, filename, lineno):
+        self.number   = number
+        self.filename = filename
+        self.lineno   = lineno
+        self.pid      = os.getpid()  # Process holding it
+        self.restarts = 0            # Times we have restarted from it
+        return
+
+    def __str__(self):
+        if self.filename:
+            return 'checkpoint %d at %s:%d' % (self.number, self.filename,
+                                               self.lineno)
+        return 'checkpoint %d' % self.number
+    pass
+
+# Checkpoints held by our ancestors, oldest first.
+snapshots = []
+
+# The number of the last checkpoint taken. Numbers aren't reused, even
+# for checkpoints that are gone.
+last_number = 0
+
+# The pipe to the process holding the last checkpoint.
+report_fd = None
+
+def unavailable():
+    """Return the reason a checkpoint can't be taken now, or None if
+    one can."""
+    if not sys.platform.startswith('linux'):
+        return 'checkpoints are only supported on Linux'
+    if not hasattr(os, 'fork'):
+        return 'this Python has no fork()'
+    # The thread filling the line-number cache only saves work, and
+    # take() makes sure it isn't holding a lock when we fork.
+    threads = Mthread.debugged_threads()
+    if len(threads) > 1:
+        return 'the program has %d other threads running' % (len(threads)-1)
+    return None
+
+def flush(dbg):
+    """Flush output so that it isn't written again by each child."""
+    for fp in (sys.stdout, sys.stderr, dbg.intf[-1], dbg.intf[-1].output):
+        if hasattr(fp, 'flush'): fp.flush()
+        pass
+    return
+
+def read_exactly(fd, size):
+    """Read *size* bytes from *fd*. Fewer are returned only at end of
+    file."""
+    chunks = []
+    while size > 0:
+        try:
+            data = os.read(fd, size)
+        except OSError:
+            if errno.EINTR == sys.exc_info()[1].errno: continue
+            raise
+        if not data: break
+        chunks.append(data)
+        size -= len(data)
+        pass
+    return ''.join(chunks)
+
+def wait_for(pid):
+    """Wait for child *pid* to finish and return its exit status."""
+    while True:
+        try:
+            status = os.waitpid(pid, 0)[1]
+        except OSError:
+            if errno.EINTR == sys.exc_info()[1].errno: continue
+            raise
+        break
+    if os.WIFSIGNALED(status): return 128 + os.WTERMSIG(status)
+    return os.WEXITSTATUS(status)
+
+def write_all(fd, data):
+    while data:
+        data = data[os.write(fd, data):]
+        pass
+    return
+
+def send(fd, msg):
+    """Send dictionary *msg* up the pipe *fd*, preceded by its length."""
+    data = pickle.dumps(msg, pickle.HIGHEST_PROTOCOL)
+    write_all(fd, struct.pack('!I', len(data)) + data)
+    return
+
+def receive(fd):
+    """Return the next message from pipe *fd*, or None at end of file."""
+    header = read_exactly(fd, 4)
+    if len(header) < 4: return None
+    return pickle.loads(read_exactly(fd, struct.unpack('!I', header)[0]))
+
+def forget(number):
+    """Remove checkpoint *number* from our list of checkpoints."""
+    snapshots[:] = [snap for snap in snapshots if snap.number != number]
+    return
+
+def debugger_state(dbg):
+    """Return the breakpoints and settings of *dbg* that carry over to
+    a restarted program."""
+    settings = {}
+    for key, value in dbg.settings.items():
+        try:
+            pickle.dumps(value)
+        except:
+            continue
+        settings[key] = value
+        pass
+    return {'bpmgr': dbg.core.bpmgr, 'settings': settings}
+
+def take(dbg, filename=None, lineno=None):
+    """Take a checkpoint at *filename* and *lineno*, which are just for
+    reporting. In the child this returns the new Snapshot. The process
+    holding the checkpoint never returns from here."""
+    global last_number, report_fd
+    last_number += 1
+    snap = Snapshot(last_number, filename, lineno)
+    deleted = False
+    while True:
+        flush(dbg)
+        read_fd, write_fd = os.pipe()
+        # Don't fork while the prefill thread is using pyficache;
+        # the child would find it locked for good.
+        Mtracelines.pyficache_lock.acquire()
+        try:
+            pid = os.fork()
+        finally:
+            Mtracelines.pyficache_lock.release()
+            pass
+        if 0 == pid:
+            os.close(read_fd)
+            if report_fd is not None: os.close(report_fd)
+            report_fd = write_fd
+            snapshots.append(snap)
+            return snap
+
+        # We hold the checkpoint. ^C is for the child.
+        os.close(write_fd)
+        old_handler = signal.getsignal(signal.SIGINT)
+        Msig.orig_set_signal(signal.SIGINT, signal.SIG_IGN)
+        request = None
+        while True:
+            msg = receive(read_fd)
+            if msg is None: break
+            if 'delete' == msg['action']:
+                if msg['number'] == snap.number:
+                    deleted = True
+                else:
+                    forget(msg['number'])
+                    send(report_fd, msg)
+                    pass
+            else:
+                request = msg
+                pass
+            pass
+        status = wait_for(pid)
+        os.close(read_fd)
+        Msig.orig_set_signal(signal.SIGINT, old_handler)
+
+        if request is None: os._exit(status)
+        if request['number'] != snap.number or deleted:
+            # The restart is for an older checkpoint
+            send(report_fd, request)
+            os._exit(0)
+            pass
+        dbg.core.bpmgr = request['state']['bpmgr']
+        dbg.settings.update(request['state']['settings'])
+        last_number = request['last_number']
+        snap.restarts += 1
+        pass
+    return # Not reached
+
+def find(number):
+    """Return checkpoint *number* or None if there isn't one."""
+    for snap in snapshots:
+        if snap.number == number: return snap
+        pass
+    return None
+
+def restart(dbg, number=None):
+    """Restart from checkpoint *number*, by default the last one. This
+    doesn't return unless there is no such checkpoint, in which case
+    False is returned."""
+    if not snapshots: return False
+    if number is None: number = snapshots[-1].number
+    if find(number) is None: return False
+    flush(dbg)
+    send(report_fd, {'action': 'restart', 'number': number,
+                     'last_number': last_number,
+                     'state': debugger_state(dbg)})
+    os._exit(0)
+    return # Not reached
+
+def delete(number):
+    """Delete checkpoint *number*. False is returned if there is no
+    such checkpoint."""
+    if find(number) is None: return False
+    forget(number)
+    send(report_fd, {'action': 'delete', 'number': number})
+    return True
+
+# Demo it
+if __name__=='__main__':
+    print(unavailable())
+    print(Snapshot(1, __file__, 10))
+    pass
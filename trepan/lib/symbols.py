@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+#   Copyright (C) 2014 Rocky Bernstein <rocky@gnu.org>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Index of the functions, methods and classes defined in a file.
+
+The index for a file is built the first time it is asked for by
+compiling the file and walking its code objects, so modules don't have
+to be imported, or even importable, to find a function in them. An
+index is rebuilt when the SHA1 of the file text changes.
+
+Names are qualified by the names of enclosing classes and functions,
+e.g. "Bar.baz" for method baz of class Bar. When looking up a name
+that isn't qualified, the last component has to match and be unique.
+"""
+import dis, os, sys
+from import_relative import import_relative
+
+Mtracelines = import_relative('tracelines', '.', 'trepan')
+
+# co_flags bit that is set for function code but not class bodies.
+CO_OPTIMIZED = 0x0001
+
+class Symbol:
+    '''A function, method or class found in a file'''
+    def __init__(self, name, kind, filename, lineno, body_lineno):
+        self.name        = name         # Qualified name, e.g. Bar.baz
+        self.kind        = kind         # 'function' or 'class'
+        self.filename    = filename
+        self.lineno      = lineno       # Line of the "def" or "class"
+        self.body_lineno = body_lineno  # First line of code in the body
+        return
+
+    def __repr__(self):
+        return '<%s %s at %s:%d>' % (self.kind, self.name, self.filename,
+                                     self.lineno)
+    pass
+
+class SymbolIndex:
+    '''The symbols of a single version of a file'''
+    def __init__(self, sha1, symbols):
+        self.sha1    = sha1
+        self.symbols = symbols
+        self.by_name = {}
+        self.by_last = {}
+        for sym in symbols:
+            self.by_name[sym.name] = sym
+            last = sym.name.split('.')[-1]
+            self.by_last.setdefault(last, []).append(sym)
+            pass
+        self.names = sorted(self.by_name.keys())
+        return
+    pass
+
+# Maps a filename to its SymbolIndex.
+index_cache = {}
+
+def clear_cache(filename=None):
+    """Clear the symbol index cache. If no filename is given clear it
+    entirely, otherwise just that for *filename*."""
+    global index_cache
+    if filename is None:
+        index_cache = {}
+    elif filename in index_cache:
+        del index_cache[filename]
+        pass
+    return
+
+def body_line(code):
+    """Return the line number of the first instruction of *code*."""
+    for offset, lineno in dis.findlinestarts(code):
+        return lineno
+    return code.co_firstlineno
+
+def code_symbols(code, filename, prefix, symbols):
+    """Append to *symbols* the symbols for the code objects nested in
+    *code*. *prefix* is the qualified name of *code* plus a dot, or the
+    empty string at the top level."""
+    for const in code.co_consts:
+        if not hasattr(const, 'co_code'): continue
+        if const.co_name.startswith('<'):
+            # A lambda, generator expression or comprehension. Anything
+            # defined inside doesn't have a name we can give.
+            continue
+        name = prefix + const.co_name
+        if const.co_flags & CO_OPTIMIZED:
+            kind = 'function'
+        else:
+            kind = 'class'
+            pass
+        symbols.append(Symbol(name, kind, filename, const.co_firstlineno,
+                              body_line(const)))
+        code_symbols(const, filename, name + '.', symbols)
+        pass
+    return symbols
+
+def file_symbols(filename):
+    """Return a list of the symbols in *filename* ordered by line, or
+    None if the file can't be read or compiled."""
+    try:
+        fp = open(filename, 'rU')
+        try:
+            source = fp.read()
+        finally:
+            fp.close()
+            pass
+        code = compile(source, filename, 'exec')
+    except:
+        return None
+    symbols = code_symbols(code, filename, '', [])
+    symbols.sort(key=lambda sym: sym.lineno)
+    return symbols
+
+def get_index(filename):
+    """Return the SymbolIndex for *filename*, building it if it isn't
+    cached or the file has changed. None is returned if the file
+    can't be read or compiled."""
+    sha1 = Mtracelines.file_sha1(filename)
+    if sha1 is None: return None
+    index = index_cache.get(filename)
+    if index and index.sha1 == sha1: return index
+    symbols = file_symbols(filename)
+    if symbols is None: return None
+    index = index_cache[filename] = SymbolIndex(sha1, symbols)
+    return index
+
+def lookup(filename, name):
+    """Return the Symbol for *name* in *filename* or None if there isn't
+    a single one."""
+    index = get_index(filename)
+    if index is None: return None
+    sym = index.by_name.get(name)
+    if sym: return sym
+    if '.' not in name:
+        candidates = index.by_last.get(name, [])
+        if len(candidates) == 1: return candidates[0]
+        pass
+    return None
+
+def complete(filename, prefix):
+    """Return the sorted list of names in *filename* that start with
+    *prefix*."""
+    index = get_index(filename)
+    if index is None: return []
+    return [name for name in index.names if name.startswith(prefix)]
+
+def module_file(modname):
+    """Return the source file for dotted module *modname* without
+    importing it, or None if it isn't found along sys.path."""
+    mod = sys.modules.get(modname)
+    if mod and getattr(mod, '__file__', None):
+        filename = mod.__file__
+        if filename.endswith('.pyc') or filename.endswith('.pyo'):
+            filename = filename[:-1]
+            pass
+        return filename
+    relname = modname.replace('.', os.sep)
+    for dirname in sys.path:
+        if not dirname: dirname = os.curdir
+        for tail in ('.py', os.path.join(os.sep, '__init__.py')):
+            filename = os.path.join(dirname, relname + tail)
+            if os.path.isfile(filename): return os.path.abspath(filename)
+            pass
+        pass
+    return None
+
+def find(name, filename=None):
+    """Find *name* first in *filename*, if given, and then, if *name* is
+    dotted, as *module.name* for some module along sys.path. Return the
+    Symbol found or None."""
+    if filename:
+        sym = lookup(filename, name)
+        if sym: return sym
+        pass
+    parts = name.split('.')
+    for i in range(len(parts)-1, 0, -1):
+        modfile = module_file('.'.join(parts[:i]))
+        if modfile:
+            sym = lookup(modfile, '.'.join(parts[i:]))
+            if sym: return sym
+            pass
+        pass
+    return None
+
+# Demo it
+if __name__=='__main__':
+    filename = os.path.abspath(__file__)
+    for sym in get_index(filename).symbols:
+        print(sym)
+        pass
+    print(lookup(filename, '__init__'))
+    print(lookup(filename, 'Symbol.__init__'))
+    print(complete(filename, 'Symbol'))
+    print(find('os.path.join'))
+    pass
@@ -16,10 +16,23 @@
 """Routines related to threading. Assumes Python 2.5 or greater"""
 
 import threading
+from import_relative import import_relative
+
+Mtracelines = import_relative('tracelines', '.', 'trepan')
 
 def current_thread_name():
     return threading.currentThread().getName()
 
+def is_debugger_thread(thread):
+    """Return True if *thread* was started by the debugger for its own
+    use rather than by the debugged program."""
+    return thread.getName() == Mtracelines.PREFILL_THREAD_NAME
+
+def debugged_threads():
+    """Like threading.enumerate() but without the debugger's own
+    threads."""
+    return [t for t in threading.enumerate() if not is_debugger_thread(t)]
+
 def find_debugged_frame(frame):
     """Find the first frame that is a debugged frame. We do this
     Generally we want traceback information without polluting it with
@@ -52,6 +65,7 @@ def map_thread_names():
     name2id = {}
     for thread_id in list(threading._active.keys()):
         thread = threading._active[thread_id]
+        if is_debugger_thread(thread): continue
         name = thread.getName()
         if name not in list(name2id.keys()):
             name2id[name] = thread_id
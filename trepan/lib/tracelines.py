@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+#   Copyright (C) 2014 Rocky Bernstein <rocky@gnu.org>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Persistent cache of the line numbers at which a file can stop.
+
+Finding the lines a breakpoint may be set on means compiling a whole
+file. Here we save the result on disk under the user's cache directory
+keyed by the SHA1 of the file text and the Python version, so each
+version of a file is only analyzed once. The line numbers are those of
+the code compiled from the very text that was hashed. Entries that
+haven't been used for MAX_ENTRY_AGE seconds are removed, as are the
+least recently used ones beyond MAX_ENTRIES. The cache can be filled
+in a background thread for all of the Python files under a directory.
+"""
+import dis, hashlib, os, sys, tempfile, threading, time, types
+import pyficache
+
+# Python version part of a cache key. Line-number tables may change
+# between Python versions.
+PYVER = 'py%d%d' % sys.version_info[0:2]
+
+# Maps a filename to (st_mtime, st_size, sha1) so we don't rehash
+# files that haven't changed.
+sha1_cache = {}
+
+# Maps a cache key to the sorted list of trace line numbers.
+lines_cache = {}
+
+# pyficache isn't thread safe. Held when we ask it for line numbers.
+pyficache_lock = threading.Lock()
+
+# Directories that have been, or are being, filled in the background.
+prefilled_dirs = set()
+
+# Stop prefilling after this many files. A script sitting in a home
+# directory shouldn't make us analyze everything below it.
+MAX_PREFILL_FILES = 5000
+
+# Name of the thread doing the prefilling.
+PREFILL_THREAD_NAME = 'trepan-lines-cache'
+
+# Bounds on the on-disk cache, applied the first time something is
+# written to it in a process.
+MAX_ENTRIES   = 20000
+MAX_ENTRY_AGE = 30 * 24 * 60 * 60
+pruned = False
+
+def cache_dir():
+    """Return the directory that holds cached line numbers."""
+    base = os.environ.get('XDG_CACHE_HOME')
+    if not base:
+        base = os.path.join(os.path.expanduser('~'), '.cache')
+        pass
+    return os.path.join(base, 'trepan', 'lines')
+
+def file_sha1(filename):
+    """Return the SHA1 of the text of *filename* or None if we can't
+    read it."""
+    try:
+        st = os.stat(filename)
+    except os.error:
+        return None
+    entry = sha1_cache.get(filename)
+    if entry and entry[0:2] == (st.st_mtime, st.st_size):
+        return entry[2]
+    return read_file(filename)[0]
+
+def read_file(filename):
+    """Return the SHA1 of the text of *filename* and the text, or
+    (None, None) if we can't read it."""
+    try:
+        st = os.stat(filename)
+        fp = open(filename, 'rb')
+        try:
+            text = fp.read()
+        finally:
+            fp.close()
+            pass
+    except (IOError, OSError):
+        return None, None
+    sha1 = hashlib.sha1(text).hexdigest()
+    sha1_cache[filename] = (st.st_mtime, st.st_size, sha1)
+    return sha1, text
+
+def cache_path(key):
+    return os.path.join(cache_dir(), key)
+
+def read_entry(key):
+    """Return the line numbers saved on disk for *key* or None."""
+    path = cache_path(key)
+    try:
+        fp = open(path)
+        try:
+            linenos = [int(lineno) for lineno in fp.read().split()]
+        finally:
+            fp.close()
+            pass
+        # Note that the entry is still in use; see prune().
+        os.utime(path, None)
+    except (IOError, OSError, ValueError):
+        return None
+    return linenos
+
+def write_entry(key, linenos):
+    """Save *linenos* on disk for *key*. We write a temporary file and
+    rename it so that readers never see a partial entry. Failure isn't
+    an error: the cache is just an optimization."""
+    dirname = cache_dir()
+    try:
+        if not os.path.isdir(dirname):
+            os.makedirs(dirname)
+            pass
+        if not pruned: prune()
+        fd, tmpname = tempfile.mkstemp(dir=dirname, prefix='.' + key)
+        os.write(fd, ' '.join([str(lineno) for lineno in linenos]))
+        os.close(fd)
+        os.rename(tmpname, cache_path(key))
+    except (IOError, OSError):
+        return False
+    return True
+
+def prune(max_entries=MAX_ENTRIES, max_age=MAX_ENTRY_AGE):
+    """Remove entries from the on-disk cache that haven't been used in
+    *max_age* seconds, and then the least recently used ones until
+    there are no more than *max_entries*."""
+    global pruned
+    pruned = True
+    dirname = cache_dir()
+    entries = []
+    try:
+        for name in os.listdir(dirname):
+            path = os.path.join(dirname, name)
+            entries.append((os.stat(path).st_mtime, path))
+            pass
+    except OSError:
+        return
+    entries.sort()
+    oldest = time.time() - max_age
+    for i, (mtime, path) in enumerate(entries):
+        if mtime >= oldest and len(entries) - i <= max_entries: break
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+        pass
+    return
+
+def code_line_numbers(text, filename):
+    """Return the sorted line numbers that start code compiled from
+    *text*, or None if it doesn't compile."""
+    try:
+        code = compile(text, filename, 'exec')
+    except (SyntaxError, TypeError, ValueError):
+        return None
+    linenos = set()
+    codes = [code]
+    while codes:
+        code = codes.pop()
+        linenos.update([lineno for offset, lineno in dis.findlinestarts(code)])
+        codes += [const for const in code.co_consts
+                  if isinstance(const, types.CodeType)]
+        pass
+    return sorted(linenos)
+
+def compute_line_numbers(filename):
+    """Ask pyficache for the trace line numbers of *filename*. If the
+    file wasn't in the pyficache cache before, we leave it that way."""
+    pyficache_lock.acquire()
+    try:
+        was_cached = filename in pyficache.file_cache
+        linenos = pyficache.trace_line_numbers(filename)
+        if not was_cached:
+            pyficache.clear_file_cache(filename)
+            pass
+    finally:
+        pyficache_lock.release()
+        pass
+    if linenos is None: return None
+    return sorted(set(linenos))
+
+def trace_line_numbers(filename):
+    """Return a sorted list of the line numbers in *filename* that a
+    breakpoint can be set on, or None if there aren't any or *filename*
+    can't be read. Results are taken from the on-disk cache when
+    possible."""
+    sha1 = file_sha1(filename)
+    if sha1 is None:
+        # Not a regular file. Let pyficache figure it out.
+        return compute_line_numbers(filename)
+    key = '%s-%s' % (sha1, PYVER)
+    linenos = lines_cache.get(key)
+    if linenos is not None: return linenos
+    linenos = read_entry(key)
+    if linenos is None:
+        # Hash what we compile: the file may have changed since.
+        sha1, text = read_file(filename)
+        if sha1 is None: return None
+        key = '%s-%s' % (sha1, PYVER)
+        linenos = code_line_numbers(text, filename)
+        if linenos is None: return None
+        write_entry(key, linenos)
+        pass
+    lines_cache[key] = linenos
+    return linenos
+
+def prefill(dirname, max_files=MAX_PREFILL_FILES):
+    """Make sure the Python files under *dirname*, up to *max_files*
+    of them, are in the cache. Return the number of files seen."""
+    count = 0
+    for root, dirs, files in os.walk(dirname):
+        # Skip hidden directories such as .git
+        dirs[:] = [d for d in dirs if not d.startswith('.')]
+        for name in files:
+            if not name.endswith('.py'): continue
+            if count >= max_files: return count
+            trace_line_numbers(os.path.join(root, name))
+            count += 1
+            pass
+        pass
+    return count
+
+def start_prefill(dirname):
+    """Fill the cache for files under *dirname* in a background
+    thread. This should be started before debugging starts so that
+    the thread isn't traced. Return the thread or None if *dirname* is
+    already being handled."""
+    dirname = os.path.realpath(dirname or os.curdir)
+    if dirname in prefilled_dirs: return None
+    prefilled_dirs.add(dirname)
+    def fill():
+        sys.settrace(None)
+        try:
+            prefill(dirname)
+        except:
+            # This is only an optimization; never disturb the debugged
+            # program.
+            pass
+        return
+    thread = threading.Thread(target=fill, name=PREFILL_THREAD_NAME)
+    thread.setDaemon(True)
+    thread.start()
+    return thread
+
+# Demo it
+if __name__=='__main__':
+    print(cache_dir())
+    print(trace_line_numbers(os.path.abspath(__file__)))
+    print(trace_line_numbers('<string>'))
+    thread = start_prefill(os.path.dirname(__file__))
+    thread.join()
+    print(len(lines_cache))
+    pass
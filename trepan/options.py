@@ -72,6 +72,10 @@ def process_options(debugger_name, pkg_version, sys_argv, option_list=None):
     optparser.add_option("--confirm", dest="confirm",
                          action="store_true", default=True,
                          help="Confirm potentially dangerous operations")
+    optparser.add_option("--core", dest="core",
+                         action="store", type='string', metavar='FILE',
+                         help="Debug the exception saved in core file " +
+                         "FILE post-mortem. No program is run.")
     optparser.add_option("--dbg_trepan", dest="dbg_trepan",
                          action="store_true", default=False,
                          help="Debug the debugger")
@@ -120,9 +124,21 @@ def process_options(debugger_name, pkg_version, sys_argv, option_list=None):
     optparser.add_option("--server", dest="server",
                          action='store_true',
                          help="Out-of-process server connection mode")
+    optparser.add_option("--socket", dest="socket", default=None,
+                         action="store", type='string', metavar='PATH',
+                         help="With --server or --client, use the " +
+                         "UNIX-domain socket PATH rather than a TCP port")
+    optparser.add_option("--multi-client", dest="multi_client",
+                         action='store_true', default=False,
+                         help="With --server, run the program until a " +
+                         "client connects, and let later clients watch")
     optparser.add_option("--sigcheck", dest="sigcheck",
                          action="store_true", default=False,
                          help="Set to watch for signal handler changes")
+    optparser.add_option("--snapshot", dest="snapshot",
+                         action="store_true", default=False,
+                         help="Take a checkpoint at the first stop for " +
+                         "fast restarts (Linux only)")
     optparser.add_option("-t", "--target", dest="target",
                          help="Specify a target to connect to. Arguments" \
                          + " should be of form, 'protocol address'."),
@@ -249,6 +265,10 @@ def _postprocess_options(dbg, opts):
     #     if opts.execute:
     #         dbg.cmdqueue = list(opts.execute.split(';;'))
 
+    if opts.snapshot:
+        dbg.core.processor.cmd_queue.append('checkpoint')
+        pass
+
     if opts.post_mortem:
         Mapi.debugger_on_post_mortem()
         pass
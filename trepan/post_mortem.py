@@ -15,12 +15,13 @@
 #   along with this program.  If not, see <http://www.gnu.org/licenses/>.
 # Post-Mortem interface
 
-import inspect, os, sys, re, traceback
+import inspect, os, sys, re, time, traceback
 
 # Our local modules
 from import_relative import import_relative
 Mdebugger = import_relative('debugger', '.', 'trepan')
 Mexcept   = import_relative('exception', '.', 'trepan')
+Mcoredump = import_relative('coredump', '.lib', 'trepan')
 
 def get_last_or_frame_exception():
     """Intended to be used going into post mortem routines.  If
@@ -156,8 +157,69 @@ def post_mortem(exc=None, frameno=1, dbg=None):
             pass
     except Mexcept.DebuggerQuit:
         pass
+    except:
+        # The command processor may have its own copy of module
+        # exception, so go by name.
+        if 'DebuggerQuit' != sys.exc_info()[0].__name__: raise
+        pass
     return
 
+def post_mortem_core(filename, dbg=None):
+    """Enter the debugger read loop on the exception saved in core file
+    *filename*; see trepan.lib.coredump. Variables have the values
+    saved, or if these can't be rebuilt from their reprs, objects that
+    show the reprs. The program can't be run; leave with quit or
+    continue."""
+    if dbg is None:
+        if Mdebugger.debugger_obj is None:
+            Mdebugger.debugger_obj = Mdebugger.Debugger()
+            pass
+        dbg = Mdebugger.debugger_obj
+        pass
+    try:
+        core = Mcoredump.read(filename)
+    except (IOError, ValueError):
+        dbg.intf[-1].errmsg(str(sys.exc_info()[1]))
+        return False
+    intf = dbg.intf[-1]
+    intf.msg('Core file %s was written by process %d at %s, running:' %
+             (filename, core['pid'], time.ctime(core['time'])))
+    intf.msg('    ' + ' '.join(core['argv']))
+    intf.msg(core['traceback'].rstrip('\n'))
+    for thread in core['threads']:
+        intf.msg('Thread %s:' % thread['name'])
+        for entry in thread['stack']:
+            intf.msg('    File "%s", line %d, in %s' % tuple(entry))
+            pass
+        pass
+    for changed in Mcoredump.changed_files(core):
+        intf.msg('Warning: %s has changed since the core file was written.'
+                 % changed)
+        pass
+
+    dbg.core.add_ignore(Mcoredump.rebuild)
+    exc = Mcoredump.rebuild(core)
+    if exc[2] is None:
+        intf.errmsg('The core file has no traceback.')
+        return False
+    dbg.core.execution_status = ('Terminated with unhandled exception %s; '
+                                 'from core file %s' %
+                                 (core['exception'][0], filename))
+    dbg.mainpyfile = core['frames'][0]['filename']
+    try:
+        dbg.core.processor.event_processor(exc[2].tb_frame, 'exception', exc,
+                                           'trepan2:core')
+    except:
+        # The command processor may have its own copy of module
+        # exception, so go by name.
+        exception_name = sys.exc_info()[0].__name__
+        if 'DebuggerRestart' == exception_name:
+            intf.msg("A program from a core file can't be restarted.")
+        elif 'DebuggerQuit' != exception_name:
+            raise
+        pass
+    return True
+
 def uncaught_exception(dbg):
     exc = sys.exc_info()
     exc_type, exc_value, exc_tb = exc
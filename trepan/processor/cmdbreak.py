@@ -14,10 +14,12 @@
 #  You should have received a copy of the GNU General Public License
 #  along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-import inspect, os, pyficache
+import inspect, os
 
 from import_relative import import_relative
-Mmisc = import_relative('misc', '..')
+Mmisc       = import_relative('misc', '..')
+Msymbols    = import_relative('symbols', '..lib', 'trepan')
+Mtracelines = import_relative('tracelines', '..lib', 'trepan')
 
 def set_break(cmd_obj, func, filename, lineno, condition, temporary, args):
     if lineno is None:
@@ -32,7 +34,7 @@ def set_break(cmd_obj, func, filename, lineno, condition, temporary, args):
         filename = cmd_obj.core.canonic(filename)
         pass
     if func is None:
-        ok_linenos = pyficache.trace_line_numbers(filename)
+        ok_linenos = Mtracelines.trace_line_numbers(filename)
         if not ok_linenos or lineno not in ok_linenos:
             part1 = ('File %s' % cmd_obj.core.filename(filename))
             msg = Mmisc.wrapped_lines(part1, 
@@ -86,6 +88,11 @@ def parse_break_cmd(cmd_obj, args):
         pass
     if inspect.isfunction(modfunc):
         func = modfunc
+    elif isinstance(modfunc, Msymbols.Symbol) and ':' not in args[0]:
+        # Found in the symbol index but not as a live function. Stop
+        # at the first line of its body.
+        func = None
+        lineno = modfunc.body_lineno
     else:
         func = None
     return (func, filename, lineno, condition)
@@ -26,9 +26,14 @@ Mexcept    = import_relative('exception', '...trepan')
 Mdisplay   = import_relative('display', '..lib', 'trepan')
 Mmisc      = import_relative('misc', '..', 'trepan')
 Mfile      = import_relative('file', '..lib', 'trepan')
+Mhighlight = import_relative('highlight', '..lib', 'trepan')
 Mstack     = import_relative('stack', '..lib', 'trepan')
+Msymbols   = import_relative('symbols', '..lib', 'trepan')
 Mthread    = import_relative('thred', '..lib', 'trepan')
 Mcomplete  = import_relative('processor.complete', '...trepan')
+Mcmdtable  = import_relative('cmdtable', '.', 'trepan')
+Mlazycmd   = import_relative('lazycmd', '.', 'trepan')
+Mlibcomplete = import_relative('complete', '..lib', 'trepan')
 
 # arg_split culled from ipython's routine
 def arg_split(s,posix=False):
@@ -109,20 +114,28 @@ def resolve_name(obj, command_name):
         return None
     return
 
-def print_source_line(msg, lineno, line, event_str=None):
+def print_source_line(msg, lineno, line, event_str=None, msg_source=None,
+                      filename=None, style='plain'):
     """Print out a source line of text , e.g. the second
     line in:
         (/tmp.py:2):  <module>
         L -- 2 import sys,os
         (trepan2)
 
+    If *msg_source* is given, it is used rather than *msg*: it is an
+    interface's msg_source(), which for a remote client may send
+    a reference to line *lineno* of *filename* in *style* instead.
+
     We define this method
     specifically so it can be customized for such applications
     like ipython."""
 
+    prefix = '%s %d ' % (event_str, lineno)
+    if msg_source:
+        return msg_source(prefix, filename, lineno, line, style)
     # We don't use the filename normally. ipython and other applications
     # however might.
-    return msg('%s %d %s' % (event_str, lineno, line))
+    return msg(prefix + line)
 
 def print_source_location_info(print_fn, filename, lineno, fn_name=None,
                                f_lasti=None, remapped_file=None):
@@ -198,7 +211,7 @@ def print_location(proc_obj):
             'reload_on_change' : proc_obj.settings('reload'),
             'output'           : proc_obj.settings('highlight')
             }
-        line = pyficache.getline(filename, lineno, opts)
+        line = Mhighlight.getline(filename, lineno, opts)
         if not line:
             if sys.version_info[1] <= 4:
                 # Python 2.4 and before doesn't have 3-arg getline
@@ -212,7 +225,9 @@ def print_location(proc_obj):
         if line and len(line.strip()) != 0:
             if proc_obj.event:
                 print_source_line(intf_obj.msg, lineno, line,
-                                  proc_obj.event2short[proc_obj.event])
+                                  proc_obj.event2short[proc_obj.event],
+                                  intf_obj.msg_source, filename,
+                                  opts['output'])
             pass
         if '<string>' != filename: break
         pass
@@ -277,7 +292,8 @@ class CommandProcessor(Mprocessor.Processor):
         self.list_lineno    = 0      # last list number used in "list"
         self.list_filename  = None   # last filename used in list
 
-        self.macros         = {}     # Debugger Macros
+        # Debugger Macros
+        self.macros         = Mlibcomplete.CompletionDict()
 
         # Create a custom safe Repr instance and increase its maxstring.
         # The default of 30 truncates error messages too easily.
@@ -312,6 +328,13 @@ class CommandProcessor(Mprocessor.Processor):
             pass
         return filename
 
+    def complete_location(self, prefix):
+        """Complete *prefix* as the name of a function, method or class
+        in the current file."""
+        if not self.curframe: return []
+        filename = self.core.canonic(self.defaultFile())
+        return Msymbols.complete(filename, prefix)
+
     def event_processor(self, frame, event, event_arg, prompt='trepan2'):
         'command event processor: reading a commands do something with them.'
         self.frame     = frame
@@ -461,6 +484,17 @@ class CommandProcessor(Mprocessor.Processor):
                     modfunc = modfunc.im_func
                     pass
                 else:
+                    # Perhaps it is defined in the current file or in
+                    # a module which hasn't been imported yet.
+                    if self.curframe:
+                        curfile = self.core.canonic(self.defaultFile())
+                    else:
+                        curfile = None
+                        pass
+                    sym = Msymbols.find(arg, curfile)
+                    if sym:
+                        return (sym, self.core.canonic(sym.filename),
+                                sym.lineno)
                     if show_errmsg: self.errmsg(msg)
                     return(None, None, None)
                 code     = modfunc.func_code
@@ -598,6 +632,18 @@ class CommandProcessor(Mprocessor.Processor):
             self.setup()
             self.location()
             pass
+        intf = self.debugger.intf[-1]
+        if self.core.is_running() and hasattr(intf, 'unattended'):
+            # A server that nobody controls yet: run on as "continue"
+            # would, until somebody takes control.
+            saved = self.core.step_events, self.core.step_ignore
+            self.core.step_events = None
+            self.core.step_ignore = -1
+            if intf.unattended(self.core.stop_soon):
+                intf.flush()
+                return False
+            self.core.step_events, self.core.step_ignore = saved
+            pass
         leave_loop = run_hooks(self, self.preloop_hooks)
         self.continue_running = False
 
@@ -627,7 +673,12 @@ class CommandProcessor(Mprocessor.Processor):
                     break
                 pass
             pass
-        return run_hooks(self, self.postcmd_hooks)
+        leave_loop = run_hooks(self, self.postcmd_hooks)
+        # Remote interfaces collect output until they prompt. Don't
+        # leave it there while the program runs.
+        intf = self.debugger.intf[-1]
+        if hasattr(intf, 'flush'): intf.flush()
+        return leave_loop
 
     def process_command(self):
         # process command
@@ -813,65 +864,63 @@ class CommandProcessor(Mprocessor.Processor):
 
     def _populate_commands(self):
         """ Create an instance of each of the debugger
-        commands. Commands are found by importing files in the
-        directory 'command'. Some files are excluded via an array set
-        in __init__.  For each of the remaining files, we import them
-        and scan for class names inside those files and for each class
-        name, we will create an instance of that class. The set of
-        DebuggerCommand class instances form set of possible debugger
-        commands."""
+        commands. Commands listed in the generated registry, module
+        cmdtable, get a LazyCommand which imports the command's module
+        the first time it is needed. Files in directory 'command' that
+        aren't in the registry are imported now, and we scan them for
+        class names and create an instance of each class. Some files
+        are excluded via an array set in __init__. The set of
+        DebuggerCommand class instances, or their stand-ins, form the
+        set of possible debugger commands."""
         cmd_instances = []
         Mcommand = import_relative('command')
-        eval_cmd_template = 'command_mod.%s(self)'
-        srcdir = get_srcdir()
-        sys.path.insert(0, srcdir)
+        self.srcdir = get_srcdir()
+        registered = set()
+        for entry in Mcmdtable.COMMANDS:
+            if entry['module'] not in Mcommand.__modules__: continue
+            registered.add(entry['module'])
+            cmd_instances.append(Mlazycmd.LazyCommand(entry,
+                                                      self._load_command))
+            pass
         for mod_name in Mcommand.__modules__:
-            if mod_name in ('info_sub', 'set_sub', 'show_sub',):
-                pass
+            if mod_name in registered: continue
             import_name = "command." + mod_name
-            if False:
-                # Sometimes we want this
-                command_mod = getattr(__import__(import_name), mod_name)
-            else:
-                # FIXME give more info like the above when desired
-                # For debugging:
-                command_mod = getattr(__import__(import_name), mod_name)
-                try:
-                    command_mod = getattr(__import__(import_name), mod_name)
-                except:
-                    print('Error importing %s: %s' %
-                          (mod_name, sys.exc_info()[0]))
-                    continue
-                pass
+            try:
+                command_mod = Mlazycmd.import_module(self.srcdir,
+                                                     import_name)
+            except:
+                print('Error importing %s: %s' %
+                      (mod_name, sys.exc_info()[0]))
+                continue
 
-            classnames = [ tup[0] for tup in
-                           inspect.getmembers(command_mod, inspect.isclass)
-                           if ('DebuggerCommand' != tup[0] and
-                               tup[0].endswith('Command')) ]
-            for classname in classnames:
-                eval_cmd = eval_cmd_template % classname
-                if False:
-                    instance = eval(eval_cmd)
+            for classname in Mlazycmd.command_classnames(command_mod):
+                try:
+                    instance = getattr(command_mod, classname)(self)
                     cmd_instances.append(instance)
-                else:
-                    try:
-                        instance = eval(eval_cmd)
-                        cmd_instances.append(instance)
-                    except:
-                        print('Error loading %s from %s: %s' %
-                              (classname, mod_name, sys.exc_info()[0]))
-                        pass
+                except:
+                    print('Error loading %s from %s: %s' %
+                          (classname, mod_name, sys.exc_info()[0]))
                     pass
                 pass
             pass
-        sys.path.remove(srcdir)
         return cmd_instances
 
+    def _load_command(self, entry):
+        """Import and create the command for registry *entry*. It
+        replaces its LazyCommand stand-in in self.commands."""
+        command_mod = Mlazycmd.import_module(self.srcdir,
+                                             'command.' + entry['module'])
+        instance = getattr(command_mod, entry['classname'])(self)
+        if isinstance(self.commands.get(instance.name), Mlazycmd.LazyCommand):
+            self.commands[instance.name] = instance
+            pass
+        return instance
+
     def _populate_cmd_lists(self):
         """ Populate self.lists and hashes:
         self.commands, and self.aliases, self.category """
-        self.commands = {}
-        self.aliases = {}
+        self.commands = Mlibcomplete.CompletionDict()
+        self.aliases = Mlibcomplete.CompletionDict()
         self.category = {}
 #         self.short_help = {}
         for cmd_instance in self.cmd_instances:
@@ -0,0 +1,908 @@
+# -*- coding: utf-8 -*-
+# Registry of debugger commands and subcommands.
+#
+# This file is generated by running trepan/processor/lazycmd.py.
+# Do not edit it by hand.
+
+COMMANDS = [{'attrs': {'aliases': ('alias1', 'alias2..'),
+            'category': 'support',
+            'max_args': 2,
+            'min_args': 0,
+            'name': 'alias',
+            'need_stack': True,
+            'short_help': 'Add an alias for a debugger command'},
+  'classname': 'AliasCommand',
+  'module': 'alias'},
+ {'attrs': {'aliases': ('bt', 'where'),
+            'category': 'stack',
+            'max_args': 1,
+            'min_args': 0,
+            'name': 'backtrace',
+            'need_stack': True,
+            'short_help': 'Print backtrace of stack frames'},
+  'classname': 'BacktraceCommand',
+  'module': 'backtrace'},
+ {'attrs': {'aliases': ('b',),
+            'category': 'breakpoints',
+            'max_args': None,
+            'min_args': 0,
+            'name': 'break',
+            'need_stack': True,
+            'short_help': 'Set breakpoint at specified line or function'},
+  'classname': 'BreakCommand',
+  'module': 'break'},
+ {'attrs': {'aliases': ('chdir',),
+            'category': 'files',
+            'max_args': 1,
+            'min_args': 1,
+            'name': 'cd',
+            'need_stack': False,
+            'short_help': 'Set working directory to DIR for debugger and program being debugged'},
+  'classname': 'CDCommand',
+  'module': 'cd'},
+ {'attrs': {'aliases': ('snapshot',),
+            'category': 'running',
+            'max_args': 0,
+            'min_args': 0,
+            'name': 'checkpoint',
+            'need_stack': False,
+            'short_help': 'Save the program state here to restart from'},
+  'classname': 'CheckpointCommand',
+  'module': 'checkpoint'},
+ {'attrs': {'aliases': ('cond',),
+            'category': 'breakpoints',
+            'max_args': None,
+            'min_args': 1,
+            'name': 'condition',
+            'need_stack': False,
+            'short_help': 'Specify breakpoint number N to break only if COND is True'},
+  'classname': 'ConditionCommand',
+  'module': 'condition'},
+ {'attrs': {'aliases': ('c',),
+            'category': 'running',
+            'max_args': None,
+            'min_args': 0,
+            'name': 'continue',
+            'need_stack': True,
+            'short_help': 'Continue execution of debugged program'},
+  'classname': 'ContinueCommand',
+  'module': 'continue'},
+ {'attrs': {'aliases': ('alias1', 'alias2..'),
+            'category': 'support',
+            'max_args': None,
+            'min_args': 1,
+            'name': 'debug',
+            'need_stack': True,
+            'short_help': 'Debug PYTHON-EXPR'},
+  'classname': 'DebugCommand',
+  'module': 'debug'},
+ {'attrs': {'aliases': ('alias1', 'alias2..'),
+            'category': 'breakpoints',
+            'max_args': None,
+            'min_args': 0,
+            'name': 'delete',
+            'need_stack': False,
+            'short_help': 'Delete some breakpoints or auto-display expressions'},
+  'classname': 'DeleteCommand',
+  'module': 'delete'},
+ {'attrs': {'aliases': ('alias1', 'alias2..'),
+            'category': 'running',
+            'max_args': 0,
+            'min_args': 0,
+            'name': 'detach',
+            'need_stack': False,
+            'short_help': 'Leave the debugger and let the program run without it'},
+  'classname': 'DetachCommand',
+  'module': 'detach'},
+ {'attrs': {'aliases': ('alias1', 'alias2..'),
+            'category': 'breakpoints',
+            'max_args': None,
+            'min_args': 0,
+            'name': 'disable',
+            'need_stack': False,
+            'short_help': 'Disable some breakpoints'},
+  'classname': 'DisableCommand',
+  'module': 'disable'},
+ {'attrs': {'aliases': ('disasm',),
+            'category': 'data',
+            'max_args': 2,
+            'min_args': 0,
+            'name': 'disassemble',
+            'need_stack': True,
+            'short_help': 'Disassemble Python bytecode'},
+  'classname': 'DisassembleCommand',
+  'module': 'disassemble'},
+ {'attrs': {'aliases': ('alias1', 'alias2..'),
+            'category': 'data',
+            'max_args': None,
+            'min_args': 0,
+            'name': 'display',
+            'need_stack': False,
+            'short_help': 'Display expressions when entering debugger'},
+  'classname': 'DisplayCommand',
+  'module': 'display'},
+ {'attrs': {'aliases': ('alias1', 'alias2..'),
+            'category': 'stack',
+            'max_args': 1,
+            'min_args': 0,
+            'name': 'down',
+            'need_stack': True,
+            'short_help': 'Move stack frame to a more recent selected frame'},
+  'classname': 'DownCommand',
+  'module': 'down'},
+ {'attrs': {'aliases': ('ed',),
+            'category': 'files',
+            'max_args': 1,
+            'min_args': 0,
+            'name': 'edit',
+            'need_stack': False,
+            'short_help': 'Edit specified file or module'},
+  'classname': 'EditCommand',
+  'module': 'edit'},
+ {'attrs': {'aliases': ('en',),
+            'category': 'breakpoints',
+            'max_args': None,
+            'min_args': 0,
+            'name': 'enable',
+            'need_stack': False,
+            'short_help': 'Enable some breakpoints'},
+  'classname': 'EnableCommand',
+  'module': 'enable'},
+ {'attrs': {'aliases': ('eval?', '?'),
+            'category': 'data',
+            'max_args': None,
+            'min_args': 0,
+            'name': 'eval',
+            'need_stack': True,
+            'short_help': 'Print value of expression EXP'},
+  'classname': 'EvalCommand',
+  'module': 'eval'},
+ {'attrs': {'aliases': ('x',),
+            'category': 'data',
+            'max_args': None,
+            'min_args': 1,
+            'name': 'examine',
+            'need_stack': True,
+            'short_help': 'Examine value, type and object attributes of an expression'},
+  'classname': 'ExamineCommand',
+  'module': 'examine'},
+ {'attrs': {'aliases': ('alias1', 'alias2..'),
+            'category': 'support',
+            'max_args': 1,
+            'min_args': 0,
+            'name': 'exit',
+            'need_stack': False,
+            'short_help': 'Exit program via sys.exit()'},
+  'classname': 'ExitCommand',
+  'module': 'exit'},
+ {'attrs': {'aliases': ('alias1', 'alias2..'),
+            'category': 'running',
+            'max_args': 1,
+            'min_args': 0,
+            'name': 'finish',
+            'need_stack': True,
+            'short_help': 'Execute until selected stack frame returns'},
+  'classname': 'FinishCommand',
+  'module': 'finish'},
+ {'attrs': {'aliases': ('alias1', 'alias2..'),
+            'category': 'stack',
+            'max_args': 2,
+            'min_args': 0,
+            'name': 'frame',
+            'need_stack': True,
+            'short_help': 'Select and print a stack frame'},
+  'classname': 'FrameCommand',
+  'module': 'frame'},
+ {'attrs': {'aliases': ('alias1', 'alias2..'),
+            'category': 'running',
+            'max_args': None,
+            'min_args': 1,
+            'name': 'handle',
+            'need_stack': False,
+            'short_help': 'Specify how to handle a signal'},
+  'classname': 'HandleCommand',
+  'module': 'handle'},
+ {'attrs': {'aliases': ('?',),
+            'category': 'support',
+            'max_args': None,
+            'min_args': 0,
+            'name': 'help',
+            'need_stack': False,
+            'short_help': 'Print commands or give help for command(s)'},
+  'classname': 'HelpCommand',
+  'module': 'help'},
+ {'attrs': {'aliases': ('i',),
+            'category': 'status',
+            'max_args': None,
+            'min_args': 0,
+            'name': 'info',
+            'need_stack': False,
+            'short_help': 'Information about debugged program and its environment'},
+  'classname': 'InfoCommand',
+  'module': 'info'},
+ {'attrs': {'aliases': ('j',),
+            'category': 'running',
+            'max_args': 1,
+            'min_args': 1,
+            'name': 'jump',
+            'need_stack': False,
+            'short_help': 'Set the next line to be executed'},
+  'classname': 'JumpCommand',
+  'module': 'jump'},
+ {'attrs': {'aliases': ('alias1', 'alias2..'),
+            'category': 'running',
+            'max_args': 1,
+            'min_args': 0,
+            'name': 'kill',
+            'need_stack': False,
+            'short_help': 'Send this process a POSIX signal ("9" for "kill -9")'},
+  'classname': 'KillCommand',
+  'module': 'kill'},
+ {'attrs': {'aliases': ('l',),
+            'category': 'files',
+            'max_args': 3,
+            'min_args': 0,
+            'name': 'list',
+            'need_stack': False,
+            'short_help': 'List source code'},
+  'classname': 'ListCommand',
+  'module': 'list'},
+ {'attrs': {'aliases': ('alias1', 'alias2..'),
+            'category': 'support',
+            'max_args': None,
+            'min_args': 2,
+            'name': 'macro',
+            'need_stack': False,
+            'short_help': 'Define a macro'},
+  'classname': 'MacroCommand',
+  'module': 'macro'},
+ {'attrs': {'aliases': ('next+', 'next-', 'n', 'n-', 'n+'),
+            'category': 'running',
+            'max_args': 1,
+            'min_args': 0,
+            'name': 'next',
+            'need_stack': True,
+            'short_help': 'Step program without entering called functions'},
+  'classname': 'NextCommand',
+  'module': 'next'},
+ {'attrs': {'aliases': ('alias1', 'alias2..'),
+            'category': 'data',
+            'max_args': 1,
+            'min_args': 1,
+            'name': 'pdef',
+            'need_stack': True,
+            'short_help': 'Print the definition header for a callable object'},
+  'classname': 'PrintDefCommand',
+  'module': 'pdef'},
+ {'attrs': {'aliases': ('alias1', 'alias2..'),
+            'category': 'data',
+            'max_args': None,
+            'min_args': 1,
+            'name': 'pp',
+            'need_stack': False,
+            'short_help': 'Pretty print value of expression EXP'},
+  'classname': 'PrettyPrintCommand',
+  'module': 'pp'},
+ {'attrs': {'aliases': ('alias1', 'alias2..'),
+            'category': 'data',
+            'max_args': None,
+            'min_args': 1,
+            'name': 'pr',
+            'need_stack': True,
+            'short_help': 'Print value of expression EXP'},
+  'classname': 'PrCommand',
+  'module': 'pr'},
+ {'attrs': {'aliases': ('alias1', 'alias2..'),
+            'category': 'data',
+            'max_args': None,
+            'min_args': 1,
+            'name': 'pydocx',
+            'need_stack': False,
+            'short_help': 'Run pydoc'},
+  'classname': 'PyDocCommand',
+  'module': 'pydocx'},
+ {'attrs': {'aliases': ('py', 'shell'),
+            'category': 'support',
+            'max_args': 1,
+            'min_args': 0,
+            'name': 'python',
+            'need_stack': False,
+            'short_help': 'Run Python as a command subshell'},
+  'classname': 'PythonCommand',
+  'module': 'python'},
+ {'attrs': {'aliases': ('q',),
+            'category': 'support',
+            'max_args': 0,
+            'min_args': 0,
+            'name': 'quit',
+            'need_stack': False,
+            'short_help': 'Terminate the program - gently'},
+  'classname': 'QuitCommand',
+  'module': 'quit'},
+ {'attrs': {'aliases': ('alias1', 'alias2..'),
+            'category': 'support',
+            'max_args': 1,
+            'min_args': 0,
+            'name': 'restart',
+            'need_stack': False,
+            'short_help': '(Hard) restart of program via execv()'},
+  'classname': 'RestartCommand',
+  'module': 'restart'},
+ {'attrs': {'aliases': ('R',),
+            'category': 'support',
+            'max_args': 0,
+            'min_args': 0,
+            'name': 'run',
+            'need_stack': False,
+            'short_help': '(Soft) restart program via a DebuggerRestart exception'},
+  'classname': 'RunCommand',
+  'module': 'run'},
+ {'attrs': {'aliases': ('alias1', 'alias2..'),
+            'category': 'data',
+            'max_args': None,
+            'min_args': 0,
+            'name': 'set',
+            'need_stack': False,
+            'short_help': 'Modify parts of the debugger environment'},
+  'classname': 'SetCommand',
+  'module': 'set'},
+ {'attrs': {'aliases': ('alias1', 'alias2..'),
+            'category': 'status',
+            'max_args': None,
+            'min_args': 0,
+            'name': 'show',
+            'need_stack': False,
+            'short_help': 'Show parts of the debugger environment'},
+  'classname': 'ShowCommand',
+  'module': 'show'},
+ {'attrs': {'aliases': ('sk',),
+            'category': 'running',
+            'max_args': 1,
+            'min_args': 0,
+            'name': 'skip',
+            'need_stack': True,
+            'short_help': 'Skip lines to be executed'},
+  'classname': 'SkipCommand',
+  'module': 'skip'},
+ {'attrs': {'aliases': ('alias1', 'alias2..'),
+            'category': 'support',
+            'max_args': None,
+            'min_args': 1,
+            'name': 'source',
+            'need_stack': False,
+            'short_help': 'Read and run debugger commands from a file'},
+  'classname': 'SourceCommand',
+  'module': 'source'},
+ {'attrs': {'aliases': ('step+',
+                        'step-',
+                        'step>',
+                        'step<',
+                        'step!',
+                        's',
+                        's+',
+                        's-',
+                        's<',
+                        's>',
+                        's!'),
+            'category': 'running',
+            'max_args': None,
+            'min_args': 0,
+            'name': 'step',
+            'need_stack': True,
+            'short_help': 'Step program (possibly entering called functions)'},
+  'classname': 'StepCommand',
+  'module': 'step'},
+ {'attrs': {'aliases': ('alias1', 'alias2..'),
+            'category': 'breakpoints',
+            'max_args': None,
+            'min_args': 0,
+            'name': 'tbreak',
+            'need_stack': True,
+            'short_help': 'Set temporary breakpoint at specified line or function'},
+  'classname': 'TempBreakCommand',
+  'module': 'tbreak'},
+ {'attrs': {'aliases': ('alias1', 'alias2..'),
+            'category': 'support',
+            'max_args': None,
+            'min_args': 1,
+            'name': 'unalias',
+            'need_stack': True,
+            'short_help': 'Remove an alias'},
+  'classname': 'UnaliasCommand',
+  'module': 'unalias'},
+ {'attrs': {'aliases': ('und',),
+            'category': 'data',
+            'max_args': None,
+            'min_args': 1,
+            'name': 'undisplay',
+            'need_stack': False,
+            'short_help': 'Cancel some expressions to be displayed when program stops'},
+  'classname': 'UndisplayCommand',
+  'module': 'undisplay'},
+ {'attrs': {'aliases': ('alias1', 'alias2..'),
+            'category': 'stack',
+            'max_args': 1,
+            'min_args': 0,
+            'name': 'up',
+            'need_stack': True,
+            'short_help': 'Move frame in the direction of the caller of the last-selected frame'},
+  'classname': 'UpCommand',
+  'module': 'up'},
+ {'attrs': {'aliases': (),
+            'category': 'data',
+            'max_args': None,
+            'min_args': 0,
+            'name': 'whatis',
+            'need_stack': True,
+            'short_help': 'Print data type of expression EXP'},
+  'classname': 'WhatisCommand',
+  'module': 'whatis'}]
+
+SUBCOMMANDS = {'info': [{'attrs': {'in_list': True,
+                     'min_abbrev': 1,
+                     'name': 'args',
+                     'need_stack': True,
+                     'run_cmd': True,
+                     'run_in_help': True,
+                     'short_help': 'Argument variables of the current stack frame'},
+           'classname': 'InfoArgs',
+           'module': 'args'},
+          {'attrs': {'in_list': True,
+                     'min_abbrev': 1,
+                     'name': 'break',
+                     'need_stack': False,
+                     'run_cmd': True,
+                     'run_in_help': True,
+                     'short_help': 'Status of user-settable breakpoints'},
+           'classname': 'InfoBreak',
+           'module': 'break'},
+          {'attrs': {'in_list': True,
+                     'min_abbrev': 2,
+                     'name': 'checkpoints',
+                     'need_stack': False,
+                     'run_cmd': True,
+                     'run_in_help': True,
+                     'short_help': 'Checkpoints the program can be restarted from'},
+           'classname': 'InfoCheckpoints',
+           'module': 'checkpoints'},
+          {'attrs': {'in_list': True,
+                     'min_abbrev': 2,
+                     'name': 'display',
+                     'need_stack': True,
+                     'run_cmd': True,
+                     'run_in_help': True,
+                     'short_help': 'Expressions to display when program stops'},
+           'classname': 'InfoDisplay',
+           'module': 'display'},
+          {'attrs': {'in_list': True,
+                     'min_abbrev': 2,
+                     'name': 'files',
+                     'need_stack': False,
+                     'run_cmd': True,
+                     'run_in_help': True,
+                     'short_help': 'Show information about an imported or loaded Python file'},
+           'classname': 'InfoFiles',
+           'module': 'files'},
+          {'attrs': {'in_list': True,
+                     'min_abbrev': 2,
+                     'name': 'globals',
+                     'need_stack': True,
+                     'run_cmd': True,
+                     'run_in_help': True,
+                     'short_help': "Show the debugged programs's global variables"},
+           'classname': 'InfoGlobals',
+           'module': 'globals'},
+          {'attrs': {'in_list': True,
+                     'min_abbrev': 2,
+                     'name': 'line',
+                     'need_stack': True,
+                     'run_cmd': True,
+                     'run_in_help': True,
+                     'short_help': 'Show current-line information'},
+           'classname': 'InfoLine',
+           'module': 'line'},
+          {'attrs': {'in_list': True,
+                     'min_abbrev': 2,
+                     'name': 'locals',
+                     'need_stack': True,
+                     'run_cmd': True,
+                     'run_in_help': True,
+                     'short_help': 'Show the local variables of current stack frame'},
+           'classname': 'InfoLocals',
+           'module': 'locals'},
+          {'attrs': {'in_list': True,
+                     'min_abbrev': 1,
+                     'name': 'macro',
+                     'need_stack': True,
+                     'run_cmd': True,
+                     'run_in_help': True,
+                     'short_help': 'List of defined macros'},
+           'classname': 'InfoMacro',
+           'module': 'macro'},
+          {'attrs': {'in_list': True,
+                     'min_abbrev': 1,
+                     'name': 'program',
+                     'need_stack': True,
+                     'run_cmd': True,
+                     'run_in_help': True,
+                     'short_help': 'Execution status of the program'},
+           'classname': 'InfoProgram',
+           'module': 'program'},
+          {'attrs': {'in_list': True,
+                     'min_abbrev': 1,
+                     'name': 'return',
+                     'need_stack': True,
+                     'run_cmd': True,
+                     'run_in_help': True,
+                     'short_help': 'Show function return value'},
+           'classname': 'InfoReturn',
+           'module': 'return'},
+          {'attrs': {'in_list': True,
+                     'min_abbrev': 3,
+                     'name': 'signals',
+                     'need_stack': False,
+                     'run_cmd': True,
+                     'run_in_help': True,
+                     'short_help': 'What debugger does when program gets various signals'},
+           'classname': 'InfoSignals',
+           'module': 'signals'},
+          {'attrs': {'in_list': True,
+                     'min_abbrev': 1,
+                     'name': 'source',
+                     'need_stack': True,
+                     'run_cmd': True,
+                     'run_in_help': True,
+                     'short_help': 'Information about the current Python file'},
+           'classname': 'InfoSource',
+           'module': 'source'},
+          {'attrs': {'in_list': True,
+                     'min_abbrev': 2,
+                     'name': 'threads',
+                     'need_stack': True,
+                     'run_cmd': True,
+                     'run_in_help': True,
+                     'short_help': 'List thread info'},
+           'classname': 'InfoThread',
+           'module': 'threads'}],
+ 'set': [{'attrs': {'in_list': True,
+                    'min_abbrev': 2,
+                    'name': 'annotate',
+                    'need_stack': False,
+                    'run_cmd': True,
+                    'run_in_help': True,
+                    'short_help': "Set GNU Emacs 'annotation' level."},
+          'classname': 'SetAnnotate',
+          'module': 'annotate'},
+         {'attrs': {'in_list': True,
+                    'min_abbrev': 5,
+                    'name': 'autoeval',
+                    'need_stack': False,
+                    'run_cmd': True,
+                    'run_in_help': True,
+                    'short_help': 'Evaluate unrecognized debugger commands.'},
+          'classname': 'SetAutoEval',
+          'module': 'autoeval'},
+         {'attrs': {'in_list': True,
+                    'min_abbrev': 5,
+                    'name': 'autolist',
+                    'need_stack': False,
+                    'run_cmd': True,
+                    'run_in_help': True,
+                    'short_help': 'Run a *list* command every time we enter the debugger.'},
+          'classname': 'SetAutoList',
+          'module': 'autolist'},
+         {'attrs': {'in_list': True,
+                    'min_abbrev': 6,
+                    'name': 'autopython',
+                    'need_stack': False,
+                    'run_cmd': True,
+                    'run_in_help': True,
+                    'short_help': '**set** **autopython** [**on**|**off**]'},
+          'classname': 'SetAutoPython',
+          'module': 'autopython'},
+         {'attrs': {'in_list': True,
+                    'min_abbrev': 2,
+                    'name': 'basename',
+                    'need_stack': False,
+                    'run_cmd': True,
+                    'run_in_help': True,
+                    'short_help': 'Set basename (short filenames) in debugger output.'},
+          'classname': 'SetBasename',
+          'module': 'basename'},
+         {'attrs': {'in_list': True,
+                    'min_abbrev': 4,
+                    'name': 'cmdtrace',
+                    'need_stack': False,
+                    'run_cmd': True,
+                    'run_in_help': True,
+                    'short_help': 'Set echoing lines read from debugger command files'},
+          'classname': 'SetCmdtrace',
+          'module': 'cmdtrace'},
+         {'attrs': {'in_list': True,
+                    'min_abbrev': 3,
+                    'name': 'dbg_pydbgr',
+                    'need_stack': False,
+                    'run_cmd': True,
+                    'run_in_help': True,
+                    'short_help': 'Set the ability to debug the debugger.'},
+          'classname': 'SetCmdDbgPydb',
+          'module': 'dbg_pydbgr'},
+         {'attrs': {'in_list': True,
+                    'min_abbrev': 3,
+                    'name': 'different',
+                    'need_stack': False,
+                    'run_cmd': True,
+                    'run_in_help': True,
+                    'short_help': '**set** **different** [**on**|**off**]'},
+          'classname': 'SetDifferent',
+          'module': 'different'},
+         {'attrs': {'in_list': True,
+                    'min_abbrev': 2,
+                    'name': 'events',
+                    'need_stack': False,
+                    'run_cmd': True,
+                    'run_in_help': True,
+                    'short_help': 'Set execution-tracing event set'},
+          'classname': 'SetEvents',
+          'module': 'events'},
+         {'attrs': {'in_list': True,
+                    'min_abbrev': 3,
+                    'name': 'flush',
+                    'need_stack': False,
+                    'run_cmd': True,
+                    'run_in_help': True,
+                    'short_help': 'Set flushing output after each write'},
+          'classname': 'SetFlush',
+          'module': 'flush'},
+         {'attrs': {'in_list': True,
+                    'min_abbrev': 2,
+                    'name': 'highlight',
+                    'need_stack': False,
+                    'run_cmd': True,
+                    'run_in_help': True,
+                    'short_help': 'Set whether we use terminal highlighting'},
+          'classname': 'SetHighlight',
+          'module': 'highlight'},
+         {'attrs': {'in_list': True,
+                    'min_abbrev': 3,
+                    'name': 'listsize',
+                    'need_stack': False,
+                    'run_cmd': True,
+                    'run_in_help': True,
+                    'short_help': 'Set the number lines printed in a *list* command by default'},
+          'classname': 'SetListSize',
+          'module': 'listsize'},
+         {'attrs': {'in_list': True,
+                    'min_abbrev': 3,
+                    'name': 'maxstring',
+                    'need_stack': False,
+                    'run_cmd': True,
+                    'run_in_help': True,
+                    'short_help': 'Set maximum length to show string output'},
+          'classname': 'SetMaxString',
+          'module': 'maxstring'},
+         {'attrs': {'in_list': True,
+                    'min_abbrev': 3,
+                    'name': 'sigcoalesce',
+                    'need_stack': False,
+                    'run_cmd': True,
+                    'run_in_help': True,
+                    'short_help': '**set** **sigcoalesce** [**on**|**off**]'},
+          'classname': 'SetSigCoalesce',
+          'module': 'sigcoalesce'},
+         {'attrs': {'in_list': True,
+                    'min_abbrev': 2,
+                    'name': 'skip',
+                    'need_stack': False,
+                    'run_cmd': True,
+                    'run_in_help': True,
+                    'short_help': 'Set stopping before *def* or *class* (function or class) statements.'},
+          'classname': 'SetSkip',
+          'module': 'skip'},
+         {'attrs': {'in_list': True,
+                    'min_abbrev': 5,
+                    'name': 'trace',
+                    'need_stack': False,
+                    'run_cmd': True,
+                    'run_in_help': True,
+                    'short_help': 'Set execution tracing'},
+          'classname': 'SetTrace',
+          'module': 'trace'},
+         {'attrs': {'in_list': True,
+                    'min_abbrev': 6,
+                    'name': 'tracebuffer',
+                    'need_stack': False,
+                    'run_cmd': True,
+                    'run_in_help': True,
+                    'short_help': 'Set a ring buffer file for trace output'},
+          'classname': 'SetTraceBuffer',
+          'module': 'tracebuffer'},
+         {'attrs': {'in_list': True,
+                    'min_abbrev': 3,
+                    'name': 'width',
+                    'need_stack': False,
+                    'run_cmd': True,
+                    'run_in_help': True,
+                    'short_help': 'Set number of characters the debugger thinks are in a line'},
+          'classname': 'SetWidth',
+          'module': 'width'}],
+ 'show': [{'attrs': {'in_list': True,
+                     'min_abbrev': 2,
+                     'name': 'aliases',
+                     'need_stack': False,
+                     'run_cmd': False,
+                     'run_in_help': True,
+                     'short_help': 'Show command aliases'},
+           'classname': 'ShowAliases',
+           'module': 'aliases'},
+          {'attrs': {'in_list': True,
+                     'min_abbrev': 2,
+                     'name': 'annotate',
+                     'need_stack': False,
+                     'run_cmd': True,
+                     'run_in_help': True,
+                     'short_help': "Show GNU Emacs 'annotation' level"},
+           'classname': 'ShowAnnotate',
+           'module': 'annotate'},
+          {'attrs': {'in_list': True,
+                     'min_abbrev': 3,
+                     'name': 'args',
+                     'need_stack': False,
+                     'run_cmd': True,
+                     'run_in_help': False,
+                     'short_help': 'Show argument list to give debugged program when it is started'},
+           'classname': 'ShowArgs',
+           'module': 'args'},
+          {'attrs': {'in_list': True,
+                     'min_abbrev': 5,
+                     'name': 'autoeval',
+                     'need_stack': False,
+                     'run_cmd': True,
+                     'run_in_help': True,
+                     'short_help': 'Show Python evaluation of unrecognized debugger commands'},
+           'classname': 'ShowAutoEval',
+           'module': 'autoeval'},
+          {'attrs': {'in_list': True,
+                     'min_abbrev': 5,
+                     'name': 'autolist',
+                     'need_stack': False,
+                     'run_cmd': True,
+                     'run_in_help': True,
+                     'short_help': 'Show debugger *list* command automatically on entry.'},
+           'classname': 'ShowAutoList',
+           'module': 'autolist'},
+          {'attrs': {'in_list': True,
+                     'min_abbrev': 6,
+                     'name': 'autopython',
+                     'need_stack': False,
+                     'run_cmd': True,
+                     'run_in_help': True,
+                     'short_help': 'Show automatic Python shell entry'},
+           'classname': 'ShowAutoPython',
+           'module': 'autopython'},
+          {'attrs': {'in_list': True,
+                     'min_abbrev': 2,
+                     'name': 'basename',
+                     'need_stack': False,
+                     'run_cmd': True,
+                     'run_in_help': True,
+                     'short_help': 'Show the basename portion only of filenames'},
+           'classname': 'ShowBasename',
+           'module': 'basename'},
+          {'attrs': {'in_list': True,
+                     'min_abbrev': 4,
+                     'name': 'cmdtrace',
+                     'need_stack': False,
+                     'run_cmd': True,
+                     'run_in_help': True,
+                     'short_help': 'Show debugger commands before running them'},
+           'classname': 'ShowCmdtrace',
+           'module': 'cmdtrace'},
+          {'attrs': {'in_list': True,
+                     'min_abbrev': 3,
+                     'name': 'confirm',
+                     'need_stack': False,
+                     'run_cmd': True,
+                     'run_in_help': True,
+                     'short_help': 'Show confirmation of potentially dangerous operations'},
+           'classname': 'ShowConfirm',
+           'module': 'confirm'},
+          {'attrs': {'in_list': True,
+                     'min_abbrev': 4,
+                     'name': 'dbg_pydbgr',
+                     'need_stack': False,
+                     'run_cmd': True,
+                     'run_in_help': True,
+                     'short_help': 'Show debugging the debugger'},
+           'classname': 'ShowDbgTrepan',
+           'module': 'dbg_pydbgr'},
+          {'attrs': {'in_list': True,
+                     'min_abbrev': 3,
+                     'name': 'different',
+                     'need_stack': False,
+                     'run_cmd': True,
+                     'run_in_help': True,
+                     'short_help': 'Show consecutive stops on different file/line positions'},
+           'classname': 'ShowDifferent',
+           'module': 'different'},
+          {'attrs': {'in_list': True,
+                     'min_abbrev': 2,
+                     'name': 'events',
+                     'need_stack': False,
+                     'run_cmd': False,
+                     'run_in_help': True,
+                     'short_help': 'Show trace events we may stop on.'},
+           'classname': 'ShowEvents',
+           'module': 'events'},
+          {'attrs': {'in_list': True,
+                     'min_abbrev': 1,
+                     'name': 'highlight',
+                     'need_stack': False,
+                     'run_cmd': True,
+                     'run_in_help': True,
+                     'short_help': '**show highlight**'},
+           'classname': 'ShowHighlight',
+           'module': 'highlight'},
+          {'attrs': {'in_list': True,
+                     'min_abbrev': 3,
+                     'name': 'listsize',
+                     'need_stack': False,
+                     'run_cmd': True,
+                     'run_in_help': True,
+                     'short_help': "Show the number lines printed in a 'list' command by default"},
+           'classname': 'ShowListSize',
+           'module': 'listsize'},
+          {'attrs': {'in_list': True,
+                     'min_abbrev': 2,
+                     'name': 'maxstring',
+                     'need_stack': False,
+                     'run_cmd': True,
+                     'run_in_help': True,
+                     'short_help': 'Show maximum string length to use in string-oriented output'},
+           'classname': 'ShowMaxString',
+           'module': 'maxstring'},
+          {'attrs': {'in_list': True,
+                     'min_abbrev': 3,
+                     'name': 'sigcoalesce',
+                     'need_stack': False,
+                     'run_cmd': True,
+                     'run_in_help': True,
+                     'short_help': 'Show whether signals arriving in a burst are coalesced'},
+           'classname': 'ShowSigCoalesce',
+           'module': 'sigcoalesce'},
+          {'attrs': {'in_list': True,
+                     'min_abbrev': 2,
+                     'name': 'skip',
+                     'need_stack': False,
+                     'run_cmd': True,
+                     'run_in_help': True,
+                     'short_help': 'Show step over lines which define functions and classes'},
+           'classname': 'ShowSkip',
+           'module': 'skip'},
+          {'attrs': {'in_list': True,
+                     'min_abbrev': 2,
+                     'name': 'trace',
+                     'need_stack': False,
+                     'run_cmd': True,
+                     'run_in_help': True,
+                     'short_help': 'Show event tracing.'},
+           'classname': 'ShowTrace',
+           'module': 'trace'},
+          {'attrs': {'in_list': True,
+                     'min_abbrev': 6,
+                     'name': 'tracebuffer',
+                     'need_stack': False,
+                     'run_cmd': True,
+                     'run_in_help': True,
+                     'short_help': 'Show the ring buffer file for trace output'},
+           'classname': 'ShowTraceBuffer',
+           'module': 'tracebuffer'},
+          {'attrs': {'in_list': True,
+                     'min_abbrev': 2,
+                     'name': 'width',
+                     'need_stack': False,
+                     'run_cmd': True,
+                     'run_in_help': True,
+                     'short_help': 'Show the number of characters the debugger thinks are in a line'},
+           'classname': 'ShowWidth',
+           'module': 'width'}]}
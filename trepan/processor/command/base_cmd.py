@@ -22,8 +22,6 @@ and storing it as a list of known debugger commands.
 
 NotImplementedMessage = "This method must be overriden in a subclass"
 
-import columnize
-from pygments.console import colorize
 from import_relative import import_relative
 Mformat = import_relative('lib.format',  '....trepan')
 
@@ -56,6 +54,7 @@ class DebuggerCommand:
 
     def columnize_commands(self, commands):
         """List commands arranged in an aligned columns"""
+        import columnize
         commands.sort()
         width = self.debugger.settings['width']
         return columnize.columnize(commands, displaywidth=width,
@@ -98,6 +97,16 @@ class DebuggerCommand:
             pass
         return None
 
+    def msg_source(self, prefix, filename, lineno, line, style='plain'):
+        """ Convenience short-hand for self.debugger.intf[-1].msg_source """
+        try:
+            return(self.debugger.intf[-1].msg_source(prefix, filename,
+                                                     lineno, line, style))
+        except EOFError:
+            # FIXME: what do we do here?
+            pass
+        return None
+
     def rst_msg(self, text, opts={}):
         """Convert ReStructuredText and run through msg()"""
         text = Mformat.rst_text(text,
@@ -115,7 +124,7 @@ class DebuggerCommand:
 
     def section(self, message, opts={}):
         if 'plain' != self.settings['highlight']:
-            message = colorize('bold', message)
+            message = Mformat.colorize('bold', message)
             pass
         self.msg(message)
 
@@ -21,8 +21,7 @@ and storing it as a list of known debugger commands.
 """
 
 NotImplementedMessage = "This method must be overriden in a subclass"
-import columnize, re
-from pygments.console import colorize
+import re
 
 # Note: don't end classname with Command (capital C) since cmdproc
 # will think this a command name like QuitCommand
@@ -70,6 +69,7 @@ class DebuggerSubcommand:
 
     def columnize_commands(self, commands):
         """List commands arranged in an aligned columns"""
+        import columnize
         commands.sort()
         width = self.debugger.settings['width']
         return columnize.columnize(commands, displaywidth=width,
@@ -112,7 +112,7 @@ class DebuggerSubcommand:
 
     def section(self, message, opts={}):
         if 'plain' != self.settings['highlight']:
-            message = colorize('bold', message)
+            message = Mformat.colorize('bold', message)
             pass
         self.msg(message)
     pass
@@ -120,6 +120,7 @@ class DebuggerSubcommand:
 from import_relative import import_relative
 Mcmdfns    = import_relative('cmdfns', '..', 'trepan')
 Mcomplete  = import_relative('complete', '...lib', 'trepan')
+Mformat    = import_relative('format', '...lib', 'trepan')
 
 class DebuggerSetBoolSubcommand(DebuggerSubcommand):
 
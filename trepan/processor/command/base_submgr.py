@@ -13,11 +13,13 @@
 #
 #  You should have received a copy of the GNU General Public License
 #  along with this program.  If not, see <http://www.gnu.org/licenses/>.
-import inspect, os, re, string, sys
+import os, re, sys
 from import_relative import get_srcdir, import_relative
 Mbase_cmd  = import_relative('base_cmd')
 Msubcmd    = import_relative('subcmd', os.path.pardir)
 Mcomplete  = import_relative('complete', '...lib', 'trepan')
+Mcmdtable  = import_relative('cmdtable', '..', 'trepan')
+Mlazycmd   = import_relative('lazycmd', '..', 'trepan')
 
 class SubcommandMgr(Mbase_cmd.DebuggerCommand):
 
@@ -47,61 +49,80 @@ class SubcommandMgr(Mbase_cmd.DebuggerCommand):
 
     def _load_debugger_subcommands(self, name):
         """ Create an instance of each of the debugger
-        subcommands. Commands are found by importing files in the
-        directory 'name' + 'sub'. Some files are excluded via an array set
-        in __init__.  For each of the remaining files, we import them
-        and scan for class names inside those files and for each class
-        name, we will create an instance of that class. The set of
-        DebuggerCommand class instances form set of possible debugger
-        commands."""
+        subcommands. Subcommands listed for *name* in the generated
+        registry, module cmdtable, get a LazyCommand which imports the
+        subcommand's module the first time it is needed. Other files in
+        the directory 'name' + 'sub' are imported now, and we scan
+        them for class names and create an instance of each class.
+        Some files are excluded via an array set in __init__."""
 
         # Initialization
         cmd_instances     = []
         module_dir        = name + '_subcmd'
-        class_prefix      = string.capitalize(name) # e.g. Info, Set, or Show
         mod               = import_relative(module_dir)
-        eval_cmd_template = 'command_mod.%s(self)'
-        srcdir            = get_srcdir()
-        sys.path.insert(0, srcdir)
-        sub_srcdir = os.path.join(srcdir, module_dir)
-        sys.path.insert(0, sub_srcdir)
+        self.srcdir       = get_srcdir()
+        self.module_dir   = module_dir
+
+        registered = set()
+        for entry in Mcmdtable.SUBCOMMANDS.get(name, []):
+            if entry['module'] not in mod.__modules__: continue
+            registered.add(entry['module'])
+            instance = Mlazycmd.LazyCommand(entry, self._load_subcommand)
+            self.cmds.add(instance)
+            cmd_instances.append(instance)
+            pass
 
         # Import, instantiate, and add classes for each of the
-        # modules found in module_dir imported above.
+        # modules found in module_dir imported above which weren't
+        # in the registry.
         for module_name in mod.__modules__:
-            import_name = module_dir + '.' + module_name
-
-            command_mod = getattr(__import__(import_name), module_name)
+            if module_name in registered: continue
             try:
-                command_mod = getattr(__import__(import_name), module_name)
+                command_mod = self._import_subcommand_module(module_name)
             except ImportError:
                 print("Error importing name %s module %s: %s" %
-                      (import_name, module_name, sys.exc_info()[0]))
+                      (module_dir + '.' + module_name, module_name,
+                       sys.exc_info()[0]))
                 continue
 
-
             # Even though we tend not to do this, it is possible to
             # put more than one class into a module/file.  So look for
             # all of them.
-            classnames = [ classname for classname, classvalue in
-                           inspect.getmembers(command_mod, inspect.isclass)
-                           if ('DebuggerCommand' != classname and
-                               classname.startswith(class_prefix)) ]
-
-            for classname in classnames:
-                eval_cmd = eval_cmd_template % classname
+            for classname in Mlazycmd.subcommand_classnames(command_mod,
+                                                            name):
                 try:
-                    instance = eval(eval_cmd)
+                    instance = getattr(command_mod, classname)(self)
                     self.cmds.add(instance)
+                    cmd_instances.append(instance)
                 except:
-                    print "Error eval'ing class %s" % classname
+                    print('Error loading class %s' % classname)
                     pass
                 pass
             pass
-        sys.path.remove(srcdir)
-        sys.path.remove(sub_srcdir)
         return cmd_instances
 
+    def _import_subcommand_module(self, module_name):
+        sub_srcdir = os.path.join(self.srcdir, self.module_dir)
+        sys.path.insert(0, sub_srcdir)
+        try:
+            return Mlazycmd.import_module(self.srcdir, self.module_dir + '.' +
+                                          module_name)
+        finally:
+            sys.path.remove(sub_srcdir)
+            pass
+        return # Not reached
+
+    def _load_subcommand(self, entry):
+        """Import and create the subcommand for registry *entry*. It
+        replaces its LazyCommand stand-in."""
+        command_mod = self._import_subcommand_module(entry['module'])
+        instance = getattr(command_mod, entry['classname'])(self)
+        if isinstance(self.cmds.subcmds.get(instance.name),
+                      Mlazycmd.LazyCommand):
+            self.cmds.subcmds[instance.name] = instance
+            pass
+        return instance
+
     def help(self, args):
         """Give help for a command which has subcommands. This can be
         called in several ways:
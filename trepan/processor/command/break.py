@@ -58,6 +58,9 @@ See also `tbreak`.
     need_stack    = True
     short_help    = 'Set breakpoint at specified line or function'
 
+    def complete(self, prefix):
+        return self.proc.complete_location(prefix)
+
     def run(self, args):
         func, filename, lineno, condition = Mcmdbreak.parse_break_cmd(self,
                                                                    args[1:])
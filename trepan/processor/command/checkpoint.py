@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+#   Copyright (C) 2014 Rocky Bernstein
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import os
+from import_relative import import_relative
+
+# Our local modules
+Mbase_cmd  = import_relative('base_cmd', top_name='trepan')
+Mcmdproc   = import_relative('cmdproc', '..', 'trepan')
+Msnapshot  = import_relative('snapshot', '...lib', 'trepan')
+
+class CheckpointCommand(Mbase_cmd.DebuggerCommand):
+    """**checkpoint**
+
+Save the state of the program here so that it can be restarted from
+this point rather than from the beginning.
+
+The debugger forks: the parent process is put aside holding the
+checkpoint, and debugging continues in the child. On a restart, the
+child passes its breakpoints and settings back to the parent and
+exits, and the parent forks a new child that picks up here. A program
+that takes a long time to import its modules, or to get to the point
+of interest, can then be restarted quickly and as often as needed.
+Memory is shared with the checkpoint until it is changed, so a
+checkpoint is cheap.
+
+Checkpoints are only available on Linux and only when the program has
+no other threads running. The `--snapshot` option takes a checkpoint
+at the first stop.
+
+See also `restart`, `run`, `info checkpoints` and `delete checkpoint`.
+"""
+
+    aliases       = ('snapshot',)
+    category      = 'running'
+    min_args      = 0
+    max_args      = 0
+    name          = os.path.basename(__file__).split('.')[0]
+    need_stack    = False
+    short_help    = 'Save the program state here to restart from'
+
+    def run(self, args):
+        reason = Msnapshot.unavailable()
+        if reason:
+            self.errmsg("Can't take a checkpoint: %s." % reason)
+            return
+        frame = self.proc.curframe
+        if frame:
+            snap = Msnapshot.take(self.debugger,
+                                  self.core.filename(frame.f_code.co_filename),
+                                  frame.f_lineno)
+        else:
+            snap = Msnapshot.take(self.debugger)
+            pass
+        if snap.restarts:
+            self.msg('Restarted from %s.' % snap)
+            if frame: Mcmdproc.print_location(self.proc)
+        else:
+            self.msg('Took %s.' % snap)
+            pass
+        return
+    pass
+
+if __name__ == '__main__':
+    mock = import_relative('mock')
+    d, cp = mock.dbg_setup()
+    command = CheckpointCommand(cp)
+    command.run(['checkpoint'])
+    pass
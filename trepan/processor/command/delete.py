@@ -22,18 +22,21 @@ Mcmdfns    = import_relative('cmdfns', '..', 'trepan')
 Mfile      = import_relative('file', '...lib', 'trepan')
 Mmisc      = import_relative('misc', '...', 'trepan')
 Mbreak     = import_relative('break', '.', 'trepan')
+Msnapshot  = import_relative('snapshot', '...lib', 'trepan')
 
 class DeleteCommand(Mbase_cmd.DebuggerCommand):
     """**delete** [*bpnumber* [*bpnumber*...]]
 
-Delete some breakpoints.
+**delete checkpoint** *number* [*number*...]
+
+Delete some breakpoints, or some checkpoints.
 
 Arguments are breakpoint numbers with spaces in between.  To delete
 all breakpoints, give no argument.  those breakpoints.  Without
 argument, clear all breaks (but first ask confirmation).
 
 See also the `clear` command which clears breakpoints by line/file
-number."""
+number, and `checkpoint` for checkpoints."""
 
     category      = 'breakpoints'
     min_args      = 0
@@ -48,6 +51,10 @@ number."""
                 self.core.bpmgr.delete_all_breakpoints()
             return
 
+        if 'checkpoint' == args[1]:
+            self.delete_checkpoints(args[2:])
+            return
+
         for arg in args[1:]:
             i = self.proc.get_int(arg, min_value=1, default=None,
                                   cmdname='delete')
@@ -62,6 +69,22 @@ number."""
             pass
         return
 
+    def delete_checkpoints(self, args):
+        if not args:
+            self.errmsg('Give the numbers of the checkpoints to delete.')
+            return
+        for arg in args:
+            i = self.proc.get_int(arg, min_value=1, default=None,
+                                  cmdname='delete checkpoint')
+            if i is None: continue
+            if Msnapshot.delete(i):
+                self.msg('Deleted checkpoint %d' % i)
+            else:
+                self.errmsg('No checkpoint number %d.' % i)
+                pass
+            pass
+        return
+
 
 if __name__ == '__main__':
     Mdebugger = import_relative('debugger', '...')
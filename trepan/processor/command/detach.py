@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+#  Copyright (C) 2014 Rocky Bernstein
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import os
+from import_relative import import_relative
+
+Mbase_cmd  = import_relative('base_cmd', top_name='trepan')
+
+class DetachCommand(Mbase_cmd.DebuggerCommand):
+    """**detach**
+
+Leave the debugger and let the program run on without it. Tracing is
+turned off and the signal handlers the debugger set are put back, so
+the program runs as fast as it did before the debugger came along.
+Breakpoints are no longer checked.
+
+If the debugger was started by trepan.api.install_attach_handler(),
+the server is closed too, and the program can be attached to again
+later. A client disconnecting from such a session detaches this way.
+
+See also:
+---------
+
+`continue`, `quit`
+"""
+
+    category      = 'running'
+    execution_set = ['Running']
+    min_args      = 0
+    max_args      = 0
+    name          = os.path.basename(__file__).split('.')[0]
+    need_stack    = False
+    short_help    = 'Leave the debugger and let the program run without it'
+
+    def run(self, args):
+        self.core.step_events = None # All events
+        self.core.step_ignore = -1
+        self.debugger.detach()
+        self.proc.continue_running = True # Break out of command read loop
+        return True
+    pass
+
+if __name__ == '__main__':
+    Mdebugger = import_relative('debugger', '...')
+    d = Mdebugger.Debugger()
+    cmd = DetachCommand(d.core.processor)
+    print(cmd.short_help)
+    pass
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+#   Copyright (C) 2014 Rocky Bernstein <rocky@gnu.org>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from import_relative import import_relative
+# Our local modules
+Mbase_subcmd  = import_relative('base_subcmd', '..', 'trepan')
+Msnapshot     = import_relative('snapshot', '....lib', 'trepan')
+
+class InfoCheckpoints(Mbase_subcmd.DebuggerSubcommand):
+    '''**info checkpoints**
+
+List the checkpoints that the program can be restarted from. For each
+we give its number, the process holding it, where it was taken, and
+how many times the program has been restarted from it.
+
+See also `checkpoint`, `restart` and `delete checkpoint`.'''
+    min_abbrev = 2 # info ch
+    need_stack = False
+    short_help = 'Checkpoints the program can be restarted from'
+
+    def run(self, args):
+        if not Msnapshot.snapshots:
+            self.msg('No checkpoints.')
+            return
+        self.msg('Num Process  Restarts Where')
+        for snap in Msnapshot.snapshots:
+            if snap.filename:
+                where = '%s:%d' % (snap.filename, snap.lineno)
+            else:
+                where = ''
+                pass
+            self.msg('%-3d %-8d %-8d %s' % (snap.number, snap.pid,
+                                            snap.restarts, where))
+            pass
+        return
+    pass
+
+if __name__ == '__main__':
+    mock = import_relative('mock', '..')
+    Minfo = import_relative('info', '..')
+    d, cp = mock.dbg_setup()
+    i = Minfo.InfoCommand(cp)
+    sub = InfoCheckpoints(i)
+    sub.run([])
+    Msnapshot.snapshots.append(Msnapshot.Snapshot(1, __file__, 10))
+    sub.run([])
+    pass
@@ -13,13 +13,14 @@
 #
 #   You should have received a copy of the GNU General Public License
 #   along with this program.  If not, see <http://www.gnu.org/licenses/>.
-import columnize, inspect, pyficache, sys
+import columnize, inspect, pyficache
 
 from import_relative import import_relative
 # Our local modules
 Mbase_subcmd  = import_relative('base_subcmd', '..', 'trepan')
-Mcomplete     = import_relative('complete', '....lib', 'trepan')
 Mmisc         = import_relative('misc', '....', 'trepan')
+Mmodindex     = import_relative('modindex', '....lib', 'trepan')
+Mtracelines   = import_relative('tracelines', '....lib', 'trepan')
 
 class InfoFiles(Mbase_subcmd.DebuggerSubcommand):
     '''**info file** [*filename* [**all** | **lines** | **sha1** | **size**]]
@@ -42,13 +43,12 @@ current stack entry is used. Sub options which can be shown about a file are:
     need_stack = False
     short_help = 'Show information about an imported or loaded Python file'
 
-    def file_list(self):
-       return list(set(pyficache.cached_files() +
-                               list(pyficache.file2file_remap.keys())))
-
     def complete(self, prefix):
-        completions = sorted(['.'] + self.file_list())
-        return Mcomplete.complete_token(completions, prefix)
+        completions = Mmodindex.complete(prefix)
+        if '.'.startswith(prefix):
+            completions = sorted(['.'] + completions)
+            pass
+        return completions
 
     def run(self, args):
         """Get file information"""
@@ -74,7 +74,7 @@ current stack entry is used. Sub options which can be shown about a file are:
                 pass
             self.msg(m)
         else:
-            matches = [file for file in self.file_list() if file.endswith(filename)]
+            matches = Mmodindex.files_ending_with(filename)
             if (len(matches) > 1):
                 self.msg("Multiple files found ending filename string:")
                 for match_file in matches:
@@ -90,13 +90,10 @@ current stack entry is used. Sub options which can be shown about a file are:
         canonic_name = self.core.canonic(filename)
         self.msg(Mmisc.wrapped_lines('Canonic name:', canonic_name,
                                      self.settings['width']))
-        for name in (canonic_name, filename):
-            if name in sys.modules:
-                for key in [k for k,v in list(sys.modules.items())
-                            if name == v]:
-                    self.msg("module: %s", key)
-                    pass
-                pass
+        modnames = set(Mmodindex.modules_for_file(canonic_name))
+        modnames.update(Mmodindex.modules_for_file(filename))
+        for modname in sorted(modnames):
+            self.msg("module: %s" % modname)
             pass
         for arg in args[1:]:
             processed_arg = False
@@ -112,7 +109,7 @@ current stack entry is used. Sub options which can be shown about a file are:
                 processed_arg = True
                 pass
             if arg in ['all', 'brkpts']:
-                lines = pyficache.trace_line_numbers(canonic_name)
+                lines = Mtracelines.trace_line_numbers(canonic_name)
                 if lines:
                     self.section("Possible breakpoint line numbers:")
                     fmt_lines = columnize.columnize(lines, ljust = False,
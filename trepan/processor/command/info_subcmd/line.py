@@ -13,7 +13,7 @@
 #
 #   You should have received a copy of the GNU General Public License
 #   along with this program.  If not, see <http://www.gnu.org/licenses/>.
-import inspect, os, re
+import inspect, os
 
 from import_relative import import_relative
 # Our local modules
@@ -21,27 +21,14 @@ Mbase_subcmd  = import_relative('base_subcmd', '..')
 Mclifns       = import_relative('clifns', '.....trepan')
 Mmisc         = import_relative('misc', '.....trepan')
 Mfile         = import_relative('lib.file', '.....trepan')
+Msymbols      = import_relative('lib.symbols', '.....trepan')
 
 def find_function(funcname, filename):
-    cre = re.compile(r'def\s+%s\s*[(]' % re.escape(funcname))
-    try:
-        fp = open(filename)
-    except IOError:
-        return None
-    # consumer of this info expects the first line to be 1
-    lineno = 1
-    answer = None
-    while True:
-        line = fp.readline()
-        if line == '':
-            break
-        if cre.match(line):
-            answer = funcname, filename, lineno
-            break
-        lineno = lineno + 1
-        pass
-    fp.close()
-    return answer
+    """Return (funcname, filename, lineno) for the function, method or
+    class *funcname* defined in *filename*, or None if it isn't found."""
+    sym = Msymbols.lookup(filename, funcname)
+    if sym is None: return None
+    return funcname, filename, sym.lineno
 
 class InfoLine(Mbase_subcmd.DebuggerSubcommand):
     '''Show information about the current line'''
@@ -73,14 +60,14 @@ class InfoLine(Mbase_subcmd.DebuggerSubcommand):
         if len(parts) == 1:
             item = parts[0]
         else:
-            # More than one part.
-            # First is module, second is method/class
-            m, f = file.lookupmodule('.'.join(parts[1:]),
-                                     self.debugger.mainpyfile,
-                                     self.core.canonic)
-            if f:
-                fname = f
-            item = parts[-1]
+            # More than one part. It may be a method or class in the
+            # default file, or something in a module.
+            item = '.'.join(parts)
+            answer = find_function(item, fname)
+            if answer: return answer
+            sym = Msymbols.find(item)
+            if sym: return item, sym.filename, sym.lineno
+            return failed
         answer = find_function(item, fname)
         return answer or failed
 
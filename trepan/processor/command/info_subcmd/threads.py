@@ -102,6 +102,7 @@ To get the full stack trace for a specific thread pass in the thread name.
         # invert threading._active
         for thread_id in list(threading._active.keys()):
             thread = threading._active[thread_id]
+            if Mthread.is_debugger_thread(thread): continue
             name = thread.getName()
             if name not in list(self.name2id.keys()):
                self.name2id[name] = thread_id
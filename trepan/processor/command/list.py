@@ -21,6 +21,7 @@ from import_relative import import_relative
 Mbase_cmd = import_relative('base_cmd', top_name='trepan')
 Mcmdfns   = import_relative('cmdfns', '..', 'trepan')
 Mfile     = import_relative('file', '...lib', 'trepan')
+Mhighlight = import_relative('highlight', '...lib', 'trepan')
 
 def pyc2py(filename):
     if '.pyc' == filename[-4:]:
@@ -165,6 +166,9 @@ See `set listize` or `show listsize` to see or set the value.
         proc.list_filename = filename
         return (filename, first, last)
 
+    def complete(self, prefix):
+        return self.proc.complete_location(prefix)
+
     def run(self, args):
         filename, first, last = self.parse_list_cmd(args[1:])
         curframe = self.proc.curframe
@@ -196,7 +200,7 @@ See `set listize` or `show listsize` to see or set the value.
 
         try:
             for lineno in range(first, last+1):
-                line = pyficache.getline(filename, lineno, opts)
+                line = Mhighlight.getline(filename, lineno, opts)
                 if line is None:
                     line = linecache.getline(filename, lineno, self.proc.frame.f_globals)
                     pass
@@ -221,7 +225,8 @@ See `set listize` or `show listsize` to see or set the value.
                     else:
                         s += a_pad
                         pass
-                    self.msg(s + '\t' + line)
+                    self.msg_source(s + '\t', filename, lineno, line,
+                                    opts['output'])
                     self.proc.list_lineno = lineno
                     pass
                 pass
@@ -19,6 +19,7 @@ from import_relative import import_relative
 # Our local modules
 Mbase_cmd  = import_relative('base_cmd', '.')
 Mexcept    = import_relative('exception', '...')
+Mthread    = import_relative('thred', '...lib', 'trepan')
 
 class QuitCommand(Mbase_cmd.DebuggerCommand):
     """**quit** [**unconditionally**]
@@ -65,7 +66,7 @@ program.
         return False
 
     def run(self, args):
-        threading_list = threading.enumerate()
+        threading_list = Mthread.debugged_threads()
         if (len(threading_list) == 1 and
             threading_list[0].getName() == 'MainThread'):
             # We just have a main thread so that's safe to quit
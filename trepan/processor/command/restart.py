@@ -22,21 +22,45 @@ Mbase_cmd  = import_relative('base_cmd', top_name='trepan')
 Mcomcodes  = import_relative('comcodes', '...interfaces', 'trepan')
 debugger   = import_relative('debugger', '...')
 Mmisc      = import_relative('misc', '...', 'trepan')
+Msnapshot  = import_relative('snapshot', '...lib', 'trepan')
 
 class RestartCommand(Mbase_cmd.DebuggerCommand):
-    """**restart**
+    """**restart** [*checkpoint-number*]
 
 Restart debugger and program via an *exec()* call. All state is lost,
-and new copy of the debugger is used."""
+and new copy of the debugger is used.
+
+If a checkpoint has been taken, the program is instead restarted from
+the last checkpoint, or the one given, keeping breakpoints and
+settings. Checkpoints taken after that one are ended. See `checkpoint`
+and `info checkpoints`."""
 
     category      = 'support'
     min_args      = 0
-    max_args      = 0
+    max_args      = 1
     name          = os.path.basename(__file__).split('.')[0]
     need_stack    = False
     short_help    = '(Hard) restart of program via execv()'
 
     def run(self, args):
+        if len(args) > 1:
+            number = self.proc.get_int(args[1], min_value=1, default=None,
+                                       cmdname='restart')
+            if number is None: return
+            snap = Msnapshot.find(number)
+            if snap is None:
+                self.errmsg('No checkpoint number %d.' % number)
+                return
+        elif Msnapshot.snapshots:
+            snap = Msnapshot.snapshots[-1]
+        else:
+            snap = None
+            pass
+        if snap:
+            if self.confirm('Restart from %s' % snap, False):
+                Msnapshot.restart(self.debugger, snap.number)
+                pass
+            return
         sys_argv = self.debugger.restart_argv()
         if sys_argv and len(sys_argv) > 0:
             confirmed = self.confirm('Restart (execv)', False)
@@ -19,12 +19,17 @@ from import_relative import import_relative
 # Our local modules
 Mbase_cmd  = import_relative('base_cmd', top_name='trepan')
 Mexcept    = import_relative('exception', '...')  # No "trepan" to get name right
+Msnapshot  = import_relative('snapshot', '...lib', 'trepan')
 
 class RunCommand(Mbase_cmd.DebuggerCommand):
     """run
 
 Soft restart debugger and program via a *DebuggerRestart*
-exception."""
+exception.
+
+If a checkpoint has been taken, the program is instead restarted from
+the last checkpoint, keeping breakpoints and settings. See
+`checkpoint`."""
 
     aliases       = ('R',)
     category      = 'support'
@@ -35,6 +40,12 @@ exception."""
     short_help    = '(Soft) restart program via a DebuggerRestart exception'
 
     def run(self, args):
+        if Msnapshot.snapshots:
+            if self.confirm('Restart from %s' % Msnapshot.snapshots[-1],
+                            False):
+                Msnapshot.restart(self.debugger)
+                pass
+            return
         confirmed = self.confirm('Soft restart', False)
         if confirmed:
             self.core.step_ignore = 0
@@ -19,6 +19,7 @@ from pyficache import clear_file_format_cache
 
 # Our local modules
 Mbase_subcmd = import_relative('base_subcmd', '..', 'trepan')
+Mhighlight   = import_relative('highlight', '....lib', 'trepan')
 
 class SetHighlight(Mbase_subcmd.DebuggerSubcommand):
     """**set highlight** [**reset**] {**plain**|**light**|**dark**|**off**}
@@ -51,6 +52,7 @@ and recolor all source code output."""
             highlight_type = self.get_highlight_type(args[1])
             if not highlight_type: return
             clear_file_format_cache()
+            Mhighlight.clear_cache()
         else:
             highlight_type = self.get_highlight_type(args[0])
             if not highlight_type: return
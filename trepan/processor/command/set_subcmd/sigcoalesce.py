@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+#   Copyright (C) 2014 Rocky Bernstein
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from import_relative import import_relative
+# Our local modules
+Mbase_subcmd = import_relative('base_subcmd', '..', 'trepan')
+
+class SetSigCoalesce(Mbase_subcmd.DebuggerSetBoolSubcommand):
+    """**set** **sigcoalesce** [**on**|**off**]
+
+Set whether signals that the debugger prints or stops for are
+coalesced.
+
+When this is on and a signal comes in while the program is being
+traced, the debugger just notes it and counts repeats of it. If the
+signal is one to stop for, the debugger stops at the next trace
+event. Otherwise it prints a single message, with the count, at most
+every tenth of a second. A program that gets a burst of signals, like
+`SIGCHLD` or `SIGALRM`, then isn't slowed down by the debugger
+printing a message for each one. Signals passed to the program still
+go to its handler each time.
+
+When this is off, the debugger prints or stops as each signal arrives.
+
+See also `handle` and `info signals`.
+"""
+    in_list    = True
+    min_abbrev = len('sig')    # Min is "set sig"
+    pass
+
+if __name__ == '__main__':
+    Mhelper = import_relative('__demo_helper__', '.', 'trepan')
+    Mhelper.demo_run(SetSigCoalesce)
+    pass
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+#   Copyright (C) 2014 Rocky Bernstein
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from import_relative import import_relative
+# Our local modules
+Mbase_subcmd = import_relative('base_subcmd', '..', 'trepan')
+Mcmdfns      = import_relative('cmdfns', '...', 'trepan')
+Mringbuf     = import_relative('ringbuf', '....lib', 'trepan')
+Mtrace       = import_relative('trace', '...', 'trepan')
+
+class SetTraceBuffer(Mbase_subcmd.DebuggerSubcommand):
+    """**set tracebuffer** *path* [*slots*]
+
+**set tracebuffer off**
+
+Write trace output into a ring buffer in file *path*, rather than
+printing it. The buffer holds *slots* events; the default is 4096.
+Run `trepan2-trace` *path* in another terminal to see the events as
+they come, or pick out some of them.
+
+Writing an event into the buffer is much cheaper than printing it or
+sending it over a connection, so the program runs faster when there
+are many events. If the viewer falls behind and the buffer fills up,
+events are dropped and counted rather than making the program wait.
+
+With *off*, trace output is printed again.
+
+See also `set trace`, `set events` and `show tracebuffer`.
+"""
+    in_list    = True
+    min_abbrev = len('traceb')  # Min is "set traceb"
+    short_help = 'Set a ring buffer file for trace output'
+
+    def run(self, args):
+        if not args:
+            self.errmsg("Expecting a file name or 'off'")
+            return
+        if 'off' == args[0]:
+            processor = Mtrace.PrintProcessor(self.core)
+            path = None
+        else:
+            path = args[0]
+            slots = Mringbuf.DEFAULT_SLOTS
+            if len(args) > 1:
+                slots = Mcmdfns.get_an_int(self.errmsg, args[1],
+                                           "The number of slots must be "
+                                           "a positive integer", 1)
+                if slots is None: return
+                pass
+            try:
+                processor = Mtrace.RecordProcessor(self.core, path, slots)
+            except (IOError, OSError), e:
+                self.errmsg("Can't use %s: %s" % (path, e))
+                return
+            pass
+        if hasattr(self.core.trace_processor, 'close'):
+            self.core.trace_processor.close()
+            pass
+        self.core.trace_processor = processor
+        self.settings['tracebuffer'] = path
+        self.proc.commands['show'].run(['show', 'tracebuffer'])
+        return
+    pass
+
+if __name__ == '__main__':
+    Mhelper = import_relative('__demo_helper__', '.', 'trepan')
+    Mhelper.demo_run(SetTraceBuffer)
+    pass
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+#   Copyright (C) 2014 Rocky Bernstein
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from import_relative import import_relative
+# Our local modules
+Mbase_subcmd = import_relative('base_subcmd', '..', 'trepan')
+
+class ShowTraceBuffer(Mbase_subcmd.DebuggerSubcommand):
+    """**show tracebuffer**
+
+Show the ring buffer file trace output is written into, if any, and
+how many events have been written and dropped.
+
+See also `set tracebuffer`."""
+
+    min_abbrev = len('traceb')  # Min is "show traceb"
+    short_help = 'Show the ring buffer file for trace output'
+
+    def run(self, args):
+        path = self.settings['tracebuffer']
+        if path is None:
+            self.msg('Trace output is printed.')
+            return
+        ring = self.core.trace_processor.ring
+        self.msg('Trace output is written to %s; %d events written, '
+                 '%d dropped.' % (path, ring.written, ring.dropped))
+        return
+    pass
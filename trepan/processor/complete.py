@@ -46,9 +46,11 @@ def completer(self, str, state, last_token=''):
                                                               list(self.commands.keys()))
     match_pairs += alias_pairs
 
-    macro_pairs = Mcomplete.complete_token_filtered_with_next(self.macros,
-                                                              token, match_hash,
-                                                              self.commands.keys())
+    # Macro values are [function, string] lists, so unlike aliases
+    # they can't be compared against matched commands.
+    macro_pairs = [pair for pair in
+                   Mcomplete.complete_token_with_next(self.macros, token)
+                   if pair[0] not in match_hash]
     match_pairs += macro_pairs
 
     if len(str) == next_blank_pos:
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+#   Copyright (C) 2014 Rocky Bernstein <rocky@gnu.org>
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Lazy loading of debugger commands and subcommands.
+
+Rather than import every command module when the debugger starts, the
+command processor and subcommand managers read the registry in module
+*cmdtable*. For each command it lists the module and class that
+implement it along with the attributes needed to list, complete and
+check arguments for it. A LazyCommand built from a registry entry
+stands in for the command and only imports the module when some other
+attribute, like *run* or the help text, is needed.
+
+*cmdtable* is generated. Run this file to regenerate it after adding a
+command or changing one of the attributes listed below. Modules that
+aren't in the registry are still found and loaded when the debugger
+starts, so a stale registry is slower but not wrong.
+"""
+import inspect, os, pprint, string, sys
+from import_relative import import_relative
+
+# Attributes of a command recorded in the registry
+COMMAND_ATTRS = ('name', 'aliases', 'category', 'min_args', 'max_args',
+                 'need_stack', 'short_help')
+
+# Attributes of a subcommand recorded in the registry
+SUBCOMMAND_ATTRS = ('name', 'min_abbrev', 'in_list', 'need_stack',
+                    'short_help', 'run_cmd', 'run_in_help')
+
+# Commands that have subcommands. Their subcommands are in
+# directory <name>_subcmd.
+SUBCOMMAND_MGRS = ('info', 'set', 'show')
+
+# Stands in for a command or subcommand until more than its registry
+# attributes are needed.
+class LazyCommand(object):
+
+    # Help asks for the docstring. That is the real command's.
+    __doc__ = property(lambda self: self.lazy_load().__doc__)
+
+    lazy_loaded = None
+
+    def __init__(self, entry, loader):
+        self.__dict__.update(entry['attrs'])
+        self.__dict__['lazy_entry']  = entry
+        self.__dict__['lazy_loader'] = loader
+        return
+
+    def lazy_load(self):
+        """Return the real command, loading it if need be."""
+        if self.lazy_loaded is None:
+            self.__dict__['lazy_loaded'] = self.lazy_loader(self.lazy_entry)
+            pass
+        return self.lazy_loaded
+
+    def __getattr__(self, name):
+        # Only called for attributes that aren't in the registry.
+        return getattr(self.lazy_load(), name)
+
+    def __setattr__(self, name, value):
+        # Set it on the real command, which may be saved elsewhere
+        setattr(self.lazy_load(), name, value)
+        if name in self.__dict__: self.__dict__[name] = value
+        return
+
+    def __repr__(self):
+        return '<lazy %s from %s>' % (self.lazy_entry['classname'],
+                                      self.lazy_entry['module'])
+    pass
+
+def import_module(srcdir, import_name):
+    """Import *import_name*, e.g. "command.list", with *srcdir* at the
+    front of sys.path, the way commands have always been imported.
+    Return the module for the last part of the name."""
+    sys.path.insert(0, srcdir)
+    try:
+        mod = __import__(import_name)
+    finally:
+        sys.path.remove(srcdir)
+        pass
+    for part in import_name.split('.')[1:]:
+        mod = getattr(mod, part)
+        pass
+    return mod
+
+def command_classnames(command_mod):
+    """Return the names of the command classes in *command_mod*"""
+    return [classname for classname, classvalue in
+            inspect.getmembers(command_mod, inspect.isclass)
+            if ('DebuggerCommand' != classname and
+                classname.endswith('Command'))]
+
+def subcommand_classnames(command_mod, mgr_name):
+    """Return the names of the subcommand classes for manager
+    *mgr_name* in *command_mod*"""
+    class_prefix = string.capitalize(mgr_name) # e.g. Info, Set, or Show
+    return [classname for classname, classvalue in
+            inspect.getmembers(command_mod, inspect.isclass)
+            if ('DebuggerCommand' != classname and
+                classname.startswith(class_prefix))]
+
+def make_entry(module_name, classname, cls, attr_names):
+    attrs = {}
+    for attr in attr_names:
+        if hasattr(cls, attr): attrs[attr] = getattr(cls, attr)
+        pass
+    return {'module': module_name, 'classname': classname, 'attrs': attrs}
+
+def registry_entries():
+    """Import all command and subcommand modules and return the
+    registry entries for them as (commands, subcommands)."""
+    srcdir = os.path.dirname(os.path.abspath(__file__))
+    cmd_dir = os.path.join(srcdir, 'command')
+    Mcommand = import_relative('command')
+    commands = []
+    for module_name in sorted(Mcommand.__modules__):
+        command_mod = import_module(srcdir, 'command.' + module_name)
+        for classname in command_classnames(command_mod):
+            cls = getattr(command_mod, classname)
+            commands.append(make_entry(module_name, classname, cls,
+                                       COMMAND_ATTRS))
+            pass
+        pass
+    subcommands = {}
+    for mgr_name in SUBCOMMAND_MGRS:
+        module_dir = mgr_name + '_subcmd'
+        mod = import_relative('command.' + module_dir)
+        entries = subcommands[mgr_name] = []
+        sub_srcdir = os.path.join(cmd_dir, module_dir)
+        sys.path.insert(0, sub_srcdir)
+        for module_name in sorted(mod.__modules__):
+            command_mod = import_module(cmd_dir, module_dir + '.' +
+                                        module_name)
+            for classname in subcommand_classnames(command_mod, mgr_name):
+                cls = getattr(command_mod, classname)
+                entry = make_entry(module_name, classname, cls,
+                                   SUBCOMMAND_ATTRS)
+                # These are set when a subcommand is created.
+                entry['attrs']['name'] = module_name
+                if 'short_help' not in entry['attrs']:
+                    entry['attrs']['short_help'] = cls.__doc__.split("\n")[0]
+                    pass
+                entries.append(entry)
+                pass
+            pass
+        sys.path.remove(sub_srcdir)
+        pass
+    return commands, subcommands
+
+def generate(filename=None):
+    """Write the command registry module to *filename*, by default
+    cmdtable.py next to this file."""
+    if filename is None:
+        filename = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                'cmdtable.py')
+        pass
+    commands, subcommands = registry_entries()
+    fp = open(filename, 'w')
+    fp.write('''# -*- coding: utf-8 -*-
+# Registry of debugger commands and subcommands.
+#
+# This file is generated by running trepan/processor/lazycmd.py.
+# Do not edit it by hand.
+
+COMMANDS = %s
+
+SUBCOMMANDS = %s
+''' % (pprint.pformat(commands), pprint.pformat(subcommands)))
+    fp.close()
+    return filename
+
+# Regenerate the registry
+if __name__=='__main__':
+    print('Wrote %s' % generate(*sys.argv[1:]))
+    pass
@@ -15,20 +15,22 @@
 #  along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """Handles gdb-like subcommand processing."""
 
+from import_relative import import_relative
+Mcomplete = import_relative('complete', '..lib', 'trepan')
+
 class Subcmd:
     """Gdb-like subcommand handling """
     def __init__(self, name, cmd_obj):
         self.name    = name
         self.cmd_obj = cmd_obj
-        self.subcmds = {}
+        self.subcmds = Mcomplete.CompletionDict()
         self.cmdlist = []
         return
 
     def lookup(self, subcmd_prefix):
         """Find subcmd in self.subcmds"""
-        for subcmd_name in list(self.subcmds.keys()):
-            if subcmd_name.startswith(subcmd_prefix) \
-               and len(subcmd_prefix) >= self.subcmds[subcmd_name].__class__.min_abbrev:
+        for subcmd_name in self.subcmds.trie.starting_with(subcmd_prefix):
+            if len(subcmd_prefix) >= self.subcmds[subcmd_name].min_abbrev:
                 return self.subcmds[subcmd_name]
             pass
         return None
@@ -18,9 +18,13 @@
 # 'Helper' function for Processor. Put here so we
 # can use this in a couple of processors.
 
+import thread
+from repr import Repr
+
 from import_relative import *
 from tracer import EVENT2SHORT
 Mprocessor = import_relative('vprocessor', '..', 'trepan')
+Mringbuf   = import_relative('ringbuf', '..lib', 'trepan')
 
 class PrintProcessor(Mprocessor.Processor):
     """ A processor that just prints out events as we see them. This
@@ -51,3 +55,34 @@ class PrintProcessor(Mprocessor.Processor):
         return self.event_processor
 
     pass
+
+class RecordProcessor(Mprocessor.Processor):
+    """ A processor that writes events into a ring buffer in the file
+    *path*, for a viewer in another process to read; see
+    trepan.lib.ringbuf. If the viewer falls behind, events are dropped
+    and counted rather than making the program wait.
+    """
+    def __init__(self, debugger, path, slots=Mringbuf.DEFAULT_SLOTS):
+        Mprocessor.Processor.__init__(self, debugger)
+        self.ring = Mringbuf.RingWriter(path, slots)
+        self.repr = Repr()
+        self.repr.maxstring = self.repr.maxother = 60
+        return
+
+    def close(self):
+        self.ring.close()
+        return
+
+    def event_processor(self, frame, event, arg):
+        'An event processor that records events.'
+        filename = self.core.filename(self.core.canonic_filename(frame))
+        if arg is not None:
+            arg = self.repr.repr(arg)
+        else:
+            arg = ''
+            pass
+        self.ring.write(event, filename, frame.f_lineno,
+                        frame.f_code.co_name, arg, thread.get_ident())
+        return self.event_processor
+
+    pass
@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#   Copyright (C) 2014 Rocky Bernstein
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program; if not, write to the Free Software
+#    Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+#    02110-1301 USA.
+
+"""Show the trace events that a debugger session writes into a ring
+buffer file; see "set tracebuffer"."""
+
+import os, re, sys, time
+from optparse import OptionParser
+
+# Our local modules
+from import_relative import import_relative, get_srcdir
+Mringbuf = import_relative('ringbuf', '.lib', 'trepan')
+
+# VERSION.py sets variable VERSION.
+exec(compile(open(os.path.join(get_srcdir(), 'VERSION.py')).read(), os.path.join(get_srcdir(), 'VERSION.py'), 'exec'))
+__version__ = VERSION
+
+def process_options(pkg_version, sys_argv, option_list=None):
+    """Handle options. The options dictionary from opt_parser is
+    returned. sys_argv is also updated."""
+    usage_str="""%prog [options] PATH
+
+    Show trace events from the ring buffer file PATH as a trepan2
+    session writes them. See the debugger command "set tracebuffer"."""
+
+    optparser = OptionParser(usage=usage_str, option_list=option_list,
+                             version="%%prog version %s" % pkg_version)
+
+    optparser.add_option("-e", "--events", dest="events", default=None,
+                         action="store", type='string', metavar='LIST',
+                         help="Show only events in the comma-separated "
+                         "LIST, e.g. call,return.")
+    optparser.add_option("-f", "--file", dest="file", default=None,
+                         action="store", type='string', metavar='REGEXP',
+                         help="Show only events in files whose names "
+                         "match REGEXP.")
+    optparser.add_option("-F", "--function", dest="function", default=None,
+                         action="store", type='string', metavar='REGEXP',
+                         help="Show only events in functions whose names "
+                         "match REGEXP.")
+    optparser.add_option("-n", "--no-follow", dest="follow", default=True,
+                         action="store_false",
+                         help="Show the events in the buffer and exit, "
+                         "rather than wait for more.")
+    optparser.add_option("-t", "--time", dest="time", default=False,
+                         action="store_true",
+                         help="Show the time of each event.")
+    optparser.add_option("--interval", dest="interval", default=0.05,
+                         action="store", type='float', metavar='SECONDS',
+                         help="Look for new events every SECONDS seconds.")
+
+    optparser.disable_interspersed_args()
+
+    sys.argv = list(sys_argv)
+    (opts, sys.argv) = optparser.parse_args()
+
+    return opts, sys.argv
+
+def event_filter(opts):
+    """Return a function which says whether an event is to be shown."""
+    events = None
+    if opts.events: events = set(opts.events.split(','))
+    file_re = opts.file and re.compile(opts.file)
+    function_re = opts.function and re.compile(opts.function)
+    def wanted(event):
+        if events and event.event not in events: return False
+        if file_re and not file_re.search(event.filename): return False
+        if function_re and not function_re.search(event.fn_name):
+            return False
+        return True
+    return wanted
+
+def format_event(event, show_time=False):
+    if show_time:
+        return '%s.%06d %s' % (time.strftime('%H:%M:%S',
+                                             time.localtime(event.time)),
+                               int(event.time * 1000000) % 1000000, event)
+    return str(event)
+
+def view(path, opts, out=sys.stdout):
+    """Show events from the ring buffer *path*. If *opts.follow* is
+    set, wait for more until interrupted; a new buffer written to
+    *path* is picked up."""
+    wanted  = event_filter(opts)
+    reader  = Mringbuf.RingReader(path)
+    inode   = os.stat(path).st_ino
+    dropped = 0
+    try:
+        while True:
+            events = reader.read()
+            now_dropped = reader.dropped()
+            if now_dropped > dropped:
+                out.write('** %d events dropped\n' % (now_dropped - dropped))
+                dropped = now_dropped
+                pass
+            for event in events:
+                if wanted(event):
+                    out.write(format_event(event, opts.time) + '\n')
+                    pass
+                pass
+            out.flush()
+            if not opts.follow: break
+            if not events:
+                time.sleep(opts.interval)
+                try:
+                    if os.stat(path).st_ino != inode:
+                        reader.close()
+                        reader  = Mringbuf.RingReader(path)
+                        inode   = os.stat(path).st_ino
+                        dropped = 0
+                        out.write('** New trace buffer\n')
+                        pass
+                except (IOError, OSError):
+                    # Not there, or not written yet
+                    pass
+                pass
+            pass
+    finally:
+        reader.close()
+        pass
+    return
+
+def main(sys_argv=list(sys.argv)):
+    opts, sys_argv = process_options(__version__, sys_argv)
+    if len(sys_argv) != 1:
+        print('%s: expecting the name of a trace buffer file' %
+              os.path.basename(sys.argv[0] if sys.argv else 'trepan2-trace'))
+        sys.exit(1)
+        pass
+    try:
+        view(sys_argv[0], opts)
+    except (IOError, OSError), e:
+        print(e)
+        sys.exit(1)
+    except KeyboardInterrupt:
+        pass
+    return
+
+if __name__ == '__main__':
+    main()
+    pass
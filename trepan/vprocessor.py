@@ -15,7 +15,6 @@
 #   along with this program.  If not, see <http://www.gnu.org/licenses/>.
 NotImplementedMessage = "This method must be overriden in a subclass"
 
-from pygments.console import colorize
 from import_relative import import_relative
 
 Mformat = import_relative('lib.format',  '..trepan')
@@ -41,7 +40,7 @@ class Processor:
     def errmsg(self, message, opts={}):
         """ Convenience short-hand for self.intf[-1].errmsg """
         if 'plain' != self.debugger.settings['highlight']:
-            message = colorize('standout', message)
+            message = Mformat.colorize('standout', message)
             pass
         return(self.intf[-1].errmsg(message))
 
@@ -65,7 +64,7 @@ class Processor:
 
     def section(self, message, opts={}):
         if 'plain' != self.settings('highlight'):
-            message = colorize('bold', message)
+            message = Mformat.colorize('bold', message)
             pass
         return self.msg(message, opts)
 